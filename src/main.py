@@ -1,9 +1,13 @@
 import flet as ft
 from ui.components import DownloadSection,CurrentSelection,DownloadQueue
 from models.downloader import RobustDownloader
+from models.journal import DownloadJournal
+from models.ydl_pool import ydl_pool
+from models.output_index import OutputIndex
 
 import shutil
 import importlib.util
+import multiprocessing
 
 class StartupCheck:
     def __init__(self, page: ft.Page, on_complete):
@@ -104,10 +108,12 @@ def main(page: ft.Page):
     page.title = "Youtube Downlaoder"
     page.window.icon = "src/assets/icons/icon.png"
     page.padding = 20
+    page.window.prevent_close = True
     file_picker  = ft.FilePicker()
-    downloder = RobustDownloader(3)
-    down_queue = DownloadQueue(downloader=downloder,save_path="downloads",file_picker =file_picker)
-    down_section = DownloadSection(down_queue.add_video)
+    downloder = RobustDownloader(3, output_index=OutputIndex())
+    journal = DownloadJournal()
+    down_queue = DownloadQueue(downloader=downloder,save_path="downloads",file_picker =file_picker,journal=journal)
+    down_section = DownloadSection(down_queue.add_video,down_queue.add_playlist,down_queue.add_bulk)
     curr_selection = CurrentSelection()
     down_section.subscribe(curr_selection)
     # Main content layout
@@ -143,12 +149,29 @@ def main(page: ft.Page):
         page.overlay.append(file_picker)
         page.add(main_content)
         page.update()
+        page.run_task(down_queue.restore_from_journal)
     
 
+    async def on_window_event(e):
+        if e.data == "close":
+            # Yeni indirme başlatma, bitmek üzere olanları bekle, kalanları sonraki açılışa bırak
+            try:
+                await down_queue.shutdown()
+            except Exception as ex:
+                print(f"❌ Kapanış hatası: {ex}")
+            finally:
+                # prevent_close açık: kapanış ne olursa olsun pencere kapanabilmeli
+                ydl_pool.close_all()
+                page.window.destroy()
+
+    page.window.on_event = on_window_event
+
     startup = StartupCheck(page, load_main_content)
     page.add(startup.get_view())
     page.run_task(startup.run_checks)
 
 
 if __name__ == "__main__":
+    # Process backend'inin worker'ları paketlenmiş (frozen) uygulamada da başlayabilsin
+    multiprocessing.freeze_support()
     ft.app(target=main,assets_dir="src/assets",name="Youtube Downlaoder")
\ No newline at end of file
@@ -0,0 +1,14 @@
+import os
+
+APP_DIR_NAME = ".youtube-downloader"
+
+
+def app_data_path(*parts: str) -> str:
+    """Kullanıcı klasöründeki uygulama veri dizini altında bir yol döndürür
+
+    Son parça dosya adı kabul edilir; üst klasörler yoksa oluşturulur.
+    """
+    base = os.environ.get("YTD_DATA_DIR") or os.path.join(os.path.expanduser("~"), APP_DIR_NAME)
+    path = os.path.join(base, *parts)
+    os.makedirs(os.path.dirname(path) if parts else path, exist_ok=True)
+    return path
@@ -0,0 +1,91 @@
+import threading
+import time
+
+
+class _Share:
+    __slots__ = ('weight', 'tokens', 'last_refill', 'last_bytes')
+
+    def __init__(self, weight: float):
+        self.weight = weight
+        self.tokens = 0.0
+        self.last_refill = time.monotonic()
+        self.last_bytes = 0.0
+
+
+class BandwidthLimiter:
+    """Tüm aktif indirmelerin paylaştığı global bant genişliği bütçesi (token bucket)
+
+    Global hız, veri alan indirmeler arasında ağırlıklarına göre bölünür
+    (weighted fair sharing); her indirmenin kendi payı kadar dolan bir kovası
+    vardır. Payların toplamı global hıza eşit olduğu için toplam throughput
+    bütçeyi aşmaz. rate=0 sınırsız demektir. Metodlar thread-safe'tir;
+    consume() indirme thread'inden (yt-dlp progress hook'u) çağrılır.
+    """
+
+    def __init__(self, rate: float = 0, burst_seconds: float = 0.5):
+        self.rate = rate
+        self.burst_seconds = burst_seconds
+        self._shares = {}
+        self._total_weight = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def set_rate(self, rate: float):
+        """Global bütçeyi (bytes/sn) çalışma anında değiştir; 0 = sınırsız"""
+        with self._lock:
+            self.rate = max(0.0, rate)
+
+    def register(self, video_id: str, weight: float = 1.0):
+        with self._lock:
+            if video_id in self._shares:
+                return
+            self._shares[video_id] = _Share(weight)
+            self._total_weight += weight
+
+    def unregister(self, video_id: str):
+        with self._lock:
+            share = self._shares.pop(video_id, None)
+            if share:
+                self._total_weight -= share.weight
+
+    def set_weight(self, video_id: str, weight: float):
+        with self._lock:
+            share = self._shares.get(video_id)
+            if share:
+                self._total_weight += weight - share.weight
+                share.weight = weight
+
+    def share_rate(self, video_id: str) -> float:
+        """Bu indirmeye şu an düşen hız payı (bytes/sn); sınırsızsa 0"""
+        with self._lock:
+            share = self._shares.get(video_id)
+            if not share or not self.enabled or self._total_weight <= 0:
+                return 0.0
+            return self.rate * share.weight / self._total_weight
+
+    def consume(self, video_id: str, downloaded_bytes: float) -> float:
+        """İndirilen toplam byte'ı bildir; payı aşmamak için beklenmesi gereken süreyi döndür"""
+        with self._lock:
+            share = self._shares.get(video_id)
+            if share is None:
+                return 0.0
+
+            delta = downloaded_bytes - share.last_bytes
+            if delta < 0:
+                # Yeni stream başladı (ör. video bitti, ses başladı)
+                delta = downloaded_bytes
+            share.last_bytes = downloaded_bytes
+
+            if not self.enabled or self._total_weight <= 0:
+                return 0.0
+
+            now = time.monotonic()
+            rate = self.rate * share.weight / self._total_weight
+            share.tokens = min(share.tokens + (now - share.last_refill) * rate, rate * self.burst_seconds)
+            share.last_refill = now
+            share.tokens -= delta
+
+            return -share.tokens / rate if share.tokens < 0 else 0.0
@@ -0,0 +1,118 @@
+import asyncio
+import math
+from typing import Callable, Optional
+
+
+class ConcurrencyTuner:
+    """Ölçülen throughput'a göre max_concurrent'ı otomatik ayarlayan denetleyici (AIMD + hill climbing)
+
+    Her `interval` saniyede bir:
+    - Hata oranı eşiği aşıldıysa veya takılan (stall) indirme varsa limit
+      çarpımsal olarak düşürülür (multiplicative decrease).
+    - Bekleyen iş varken ve tüm slotlar doluyken limit 1 artırılır
+      (additive increase); bir önceki artış toplam hızı `min_gain` kadar
+      iyileştirmediyse artış geri alınır (hill climbing). Geri almadan sonra
+      `hold_steps` adım boyunca tekrar artırılmaz; yoksa limit her adımda
+      bir artıp bir geri alınarak salınır.
+
+    Limit değişiklikleri RobustDownloader.set_max_concurrent üzerinden,
+    yani DynamicSemaphore.set_value yolu ile uygulanır.
+    """
+
+    def __init__(self, downloader, min_limit: int = 1, max_limit: int = 20, interval: float = 10.0,
+                 stall_seconds: float = 30.0, error_threshold: float = 0.3, min_gain: float = 0.05,
+                 backoff: float = 0.7, hold_steps: int = 3, demand: Optional[Callable[[], int]] = None,
+                 on_change: Optional[Callable[[int], None]] = None):
+        self.downloader = downloader
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.interval = interval
+        self.stall_seconds = stall_seconds
+        self.error_threshold = error_threshold
+        self.min_gain = min_gain
+        self.backoff = backoff
+        self.hold_steps = hold_steps
+        self.demand = demand or downloader.get_waiting_count
+        self.on_change = on_change
+
+        self._task: Optional[asyncio.Task] = None
+        self._last_rate = 0.0
+        self._last_action = None
+        self._last_results = dict(downloader.stats.results)
+        self._seen_stalls = set()
+        self._hold = 0  # Geri almadan sonra artırılmayacak kalan adım sayısı
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if not self.is_running:
+            self._last_action = None
+            self._hold = 0
+            self._last_results = dict(self.downloader.stats.results)
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                try:
+                    await self.step()
+                except Exception as e:
+                    print(f"❌ Tuner hatası: {e}")
+        except asyncio.CancelledError:
+            pass
+
+    async def step(self):
+        """Tek bir ayar adımı; yeni limiti döndürür"""
+        stats = self.downloader.stats
+        limit = self.downloader.max_concurrent
+        rate = stats.window_rate()
+
+        # Son adımdan bu yana biten indirmelerin hata oranı
+        results = dict(stats.results)
+        errors = results['error'] - self._last_results['error']
+        finished = errors + results['success'] - self._last_results['success']
+        self._last_results = results
+        error_rate = errors / finished if finished else 0.0
+
+        # Aynı takılma için limiti her adımda tekrar düşürme
+        stalled = set(stats.stalled_downloads(self.stall_seconds))
+        new_stalls = stalled - self._seen_stalls
+        self._seen_stalls = stalled
+        saturated = self.downloader.get_active_downloads() >= limit and self.demand() > 0
+
+        new_limit = limit
+        if error_rate > self.error_threshold or new_stalls:
+            new_limit = max(self.min_limit, math.floor(limit * self.backoff))
+            action = "decrease"
+        elif self._last_action == "increase" and rate < self._last_rate * (1 + self.min_gain):
+            # Son artış işe yaramadı: geri al
+            new_limit = max(self.min_limit, limit - 1)
+            action = "revert"
+            self._hold = self.hold_steps
+        elif saturated and self._hold:
+            self._hold -= 1
+            action = None
+        elif saturated:
+            new_limit = min(self.max_limit, limit + 1)
+            action = "increase"
+        else:
+            action = None
+
+        self._last_rate = rate
+        self._last_action = action if new_limit != limit else None
+
+        if new_limit != limit:
+            print(f"🎛️ Auto concurrency ({action}): {limit} -> {new_limit} "
+                  f"[{rate / 1024 / 1024:.2f} MB/s, hata %{error_rate * 100:.0f}, stall {len(new_stalls)}]")
+            await self.downloader.set_max_concurrent(new_limit)
+            if self.on_change:
+                self.on_change(new_limit)
+        return new_limit
@@ -0,0 +1,264 @@
+import asyncio
+import heapq
+import itertools
+import os
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from .download_job import DownloadJob
+from .queue_runner import QueueRunner
+from .scheduler import DownloadScheduler, Priority
+from .staging import StagingJanitor
+from .validators import extract_video_id
+from .video_info import VideoInfo
+
+
+class DownloadEngine:
+    """İndirme kuyruğunun UI'sız çekirdeği
+
+    Görevler (`DownloadJob`) sıralı `order` listesinde ve `jobs` sözlüğünde
+    tutulur; tekilleştirme, journal'dan geri yükleme, otomatik başlatma
+    (QueueRunner) ve staging temizliği de buradadır. Kuyruk görünümü
+    `subscribe` ile bağlanır ve listeyi olaylara göre kendi tarafında yansıtır:
+    ("added", [job, ...]), ("removed", job), ("moved", job).
+
+    Runner'a verilecek sıradaki görev, downloader'daki semaphore ile aynı
+    DownloadScheduler anahtarıyla (öncelik, öne alma, kanal adaleti, politika)
+    sıralanan bir heap'ten seçilir; eski anahtarlı girdiler tembel silinir.
+    """
+
+    def __init__(self, downloader, journal=None, save_path: str = "downloads", lookahead: int = 1):
+        self.downloader = downloader
+        self.journal = journal
+        self.save_path = save_path
+        self.jobs: Dict[str, DownloadJob] = {}
+        self.order: List[DownloadJob] = []
+        self.job_counter = 0  # Sadece artar: kaldırılan görevin ID'si tekrar verilmez
+        self._listeners = []
+
+        # Henüz downloader'a verilmemiş bekleyen görevler: job -> heap girdisi [key, seq, job]
+        self.scheduler = DownloadScheduler(policy=downloader.scheduler.policy,
+                                           channel_fairness=downloader.scheduler.channel_fairness)
+        self._waiting = {}
+        self._waiting_heap = []
+        self._seq = itertools.count()
+
+        self.runner = QueueRunner(downloader, self.next_waiting, self._run_job, lookahead=lookahead)
+        self.janitor = StagingJanitor(self.staging_roots, lambda: set(self.jobs))
+
+    def subscribe(self, callback: Callable[[str, object], None]) -> Callable[[], None]:
+        """callback(event, payload) kaydet; dönen fonksiyon aboneliği kaldırır"""
+        self._listeners.append(callback)
+
+        def unsubscribe():
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+        return unsubscribe
+
+    def _emit(self, event: str, payload):
+        for callback in list(self._listeners):
+            callback(event, payload)
+
+    # ============== KUYRUK ==============
+
+    def find_duplicate(self, canonical_id: str, res: str, save_path: str) -> Optional[DownloadJob]:
+        """Kuyrukta aynı video + çözünürlük + klasör için bekleyen/inen/bitmiş görev"""
+        if not canonical_id:
+            return None
+        for job in self.order:
+            if (job.canonical_id == canonical_id and job.resolution == res and job.save_path == save_path
+                    and job.status in ("waiting", "downloading", "completed")):
+                return job
+        return None
+
+    async def add(self, info: VideoInfo, res: str, save_path: Optional[str] = None) -> DownloadJob:
+        """Videoyu kuyruğa ekle; aynısı zaten varsa mevcut görevi döndür"""
+        save_path = save_path or self.save_path
+        canonical_id = info.video_id or extract_video_id(info.url)
+        duplicate = self.find_duplicate(canonical_id, res, save_path)
+        if duplicate:
+            print(f"⚠️ Zaten kuyrukta: {info.title} ({res}p)")
+            return duplicate
+
+        self.job_counter += 1
+        video_id = f"video_{self.job_counter}_{int(datetime.now().timestamp())}"
+        job = DownloadJob(video_id, self.downloader, info, save_path, res, journal=self.journal)
+
+        # Daha önce bu klasöre indirildiyse tekrar indirme, doğrudan tamamlandı say
+        existing = await self.downloader.find_output(canonical_id, res)
+        already_done = existing and os.path.dirname(existing) == os.path.abspath(save_path)
+        if already_done:
+            print(f"♻️ Zaten indirilmiş: {existing}")
+            job.restore("completed")
+
+        self.jobs[video_id] = job
+        self.order.append(job)
+        self._track(job)
+        if self.journal:
+            self.journal.record_add(video_id, info, res, save_path)
+            if already_done:
+                self.journal.record_complete(video_id)
+        self._emit("added", [job])
+        self.runner.kick()
+        return job
+
+    @staticmethod
+    def _id_number(video_id: str) -> int:
+        """"video_<sayaç>_<zaman>" biçimindeki ID'nin sayacı (biçim dışıysa 0)"""
+        try:
+            return int(video_id.split("_")[1])
+        except (IndexError, ValueError):
+            return 0
+
+    async def restore(self) -> int:
+        """Uygulama açılışında kuyruğu journal'dan tek okumada geri yükle
+
+        Staging temizliği de burada başlar: sahipsiz klasör kararı ancak kuyruk
+        yüklendikten sonra verilebilir.
+        """
+        if not self.journal:
+            self.janitor.start()
+            return 0
+        entries = await asyncio.to_thread(self.journal.load)
+        restored = []
+        for entry in entries:
+            if entry.video_id in self.jobs:
+                continue
+            job = DownloadJob(entry.video_id, self.downloader, entry.info, entry.save_path, entry.resolution, journal=self.journal)
+            job.restore(entry.status, entry.downloaded, entry.total, entry.error)
+            job.resume_state = entry.resume
+            self.jobs[entry.video_id] = job
+            self._track(job)
+            restored.append(job)
+        self.order.extend(restored)
+        self.job_counter = max([self.job_counter, *(self._id_number(video_id) for video_id in self.jobs)])
+        if restored:
+            self._emit("added", restored)
+        if entries:
+            print(f"📂 Journal'dan {len(entries)} görev geri yüklendi")
+            self.runner.kick()
+        self.janitor.start()
+        return len(restored)
+
+    async def remove(self, video_id: str):
+        job = self.jobs.get(video_id)
+        if job is None:
+            return
+        await job.abort()
+        # İptal edilen indirmenin .part dosyaları devam için tutulur; kaldırılınca silinir
+        await self.downloader.discard_partial(video_id, job.save_path, job.resume_state)
+        if self.jobs.pop(video_id, None) is None:
+            return  # Beklerken başka bir çağrı kaldırdı
+        self.order.remove(job)
+        self._drop_waiting(job)
+        if self.journal:
+            self.journal.record_remove(video_id)
+        self._emit("removed", job)
+
+    async def remove_completed(self):
+        for video_id in [job.video_id for job in self.order if job.status == "completed"]:
+            await self.remove(video_id)
+
+    async def move_to_front(self, video_id: str):
+        """Görevi listenin en üstüne ve (bekliyorsa) indirme sırasının başına al"""
+        job = self.jobs.get(video_id)
+        if job is None:
+            return
+        await self.downloader.move_to_front(video_id)
+        if job in self._waiting:
+            self._push_waiting(job, self.scheduler.move_to_front(job))
+        self.order.remove(job)
+        self.order.insert(0, job)
+        self._emit("moved", job)
+
+    async def set_priority(self, video_id: str, priority: Priority):
+        job = self.jobs.get(video_id)
+        if job is None:
+            return
+        await job.set_priority(priority)
+        if job in self._waiting:
+            self._push_waiting(job, self.scheduler.set_priority(job, priority))
+
+    async def set_scheduling_policy(self, policy: str):
+        """'fifo' veya 'shortest'; hem downloader'da slot bekleyenler hem buradakiler yeniden sıralanır"""
+        await self.downloader.set_scheduling_policy(policy)
+        self.scheduler.policy = policy
+        for job, key in self.scheduler.rekey_all().items():
+            self._push_waiting(job, key)
+
+    # ============== BEKLEYEN HEAP'İ ==============
+
+    def _track(self, job: DownloadJob):
+        job.subscribe(self._on_job_event)
+        if job.status == "waiting":
+            info = job.video_info
+            key = self.scheduler.enqueue(job, job.priority, job.expected_bytes, info.duration, info.channel)
+            self._push_waiting(job, key)
+
+    def _push_waiting(self, job: DownloadJob, key):
+        entry = [key, next(self._seq), job]
+        self._waiting[job] = entry
+        heapq.heappush(self._waiting_heap, entry)
+        if len(self._waiting_heap) > 2 * len(self._waiting) + 32:
+            # Eski anahtarlı girdiler birikti: heap'i yeniden kur
+            self._waiting_heap = list(self._waiting.values())
+            heapq.heapify(self._waiting_heap)
+
+    def _drop_waiting(self, job: DownloadJob):
+        if self._waiting.pop(job, None) is not None:
+            self.scheduler.dequeue(job)
+
+    def _on_job_event(self, job: DownloadJob, event: str):
+        # Başlatılan / iptal edilen görev artık runner'ın sırasında değil
+        if event == "state" and job.status != "waiting":
+            self._drop_waiting(job)
+
+    # ============== RUNNER / TUNER / JANITOR ==============
+
+    def start(self):
+        self.runner.start()
+
+    def next_waiting(self, exclude: set) -> Optional[DownloadJob]:
+        """Runner için sıradaki bekleyen görev (scheduler anahtarına göre); verilen görev sıradan çıkar"""
+        while self._waiting_heap:
+            entry = heapq.heappop(self._waiting_heap)
+            job = entry[2]
+            if self._waiting.get(job) is not entry:
+                continue  # Eski anahtar veya sıradan çıkmış
+            self._drop_waiting(job)
+            # exclude'dakiler zaten runner'da başlatılıyor; sıraya geri dönmezler
+            if job.status == "waiting" and job not in exclude:
+                return job
+        return None
+
+    async def _run_job(self, job: DownloadJob):
+        await job.start()
+
+    def waiting_demand(self) -> int:
+        """Tuner için talep: semaphore'da bekleyenler + henüz başlatılmamış görevler"""
+        return self.downloader.get_waiting_count() + len(self._waiting)
+
+    def waiting_bytes(self) -> int:
+        return sum(job.expected_bytes for job in self.order if job.status == "waiting")
+
+    def staging_roots(self):
+        return {self.save_path, *(job.save_path for job in self.order)}
+
+    async def shutdown(self, timeout: float = 3.0):
+        """Uygulama kapanırken: yeni indirme başlatma, bitenleri bekle, kalanları durdur
+
+        Süresi içinde bitmeyen indirmeler journal'a iptal olarak yazılmaz; böylece
+        bir sonraki açılışta 'waiting' olarak geri yüklenip kaldığı yerden başlar.
+        """
+        self.janitor.stop()
+        remaining = await self.runner.shutdown(timeout)
+        for job in remaining:
+            job.abandon()
+        await asyncio.gather(*(self.downloader.cancel(job.video_id) for job in remaining))
+        for task in remaining.values():
+            task.cancel()
+        if remaining:
+            await asyncio.wait(list(remaining.values()), timeout=timeout)
+            print(f"⏸️ {len(remaining)} indirme bir sonraki açılışa bırakıldı")
+        if self.journal:
+            self.journal.close()
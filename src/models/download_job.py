@@ -0,0 +1,284 @@
+import asyncio
+from typing import Callable
+
+from .scheduler import Priority
+from .validators import get_video_info, get_extracted_info, extract_video_id
+from .video_info import VideoInfo
+
+
+class DownloadJob:
+    """Kuyruktaki tek bir indirmenin UI'sız modeli
+
+    Durum makinesi: waiting → downloading → completed / error, iptalde
+    downloading/waiting → cancelling → cancelled; error ve cancelled tekrar
+    başlatılabilir. Son progress (yüzde, hız, ETA) ve journal kayıtları da
+    burada tutulur. Görünüm (VideoTask) sadece görünürken `subscribe` ile
+    bağlanır; olaylar "state" (durum / başlık / ayar değişti) ve "progress".
+    Tüm metotlar event loop thread'inden çağrılır.
+    """
+
+    __slots__ = (
+        'video_id', 'downloader', 'journal', 'video_info', 'save_path', 'resolution',
+        'priority', 'resume_state', 'canonical_id', 'status', 'downloaded', 'total',
+        'percentage', 'speed', 'eta', 'error', 'interrupted',
+        '_is_cancelled', '_cancel_lock', '_listeners', '_task',
+    )
+
+    def __init__(self, video_id: str, downloader, video_info: VideoInfo, save_path: str, resolution: str, journal=None):
+        self.video_id = video_id
+        self.downloader = downloader
+        self.journal = journal
+        self.video_info = video_info
+        self.save_path = save_path
+        self.resolution = resolution
+        self.priority = Priority.NORMAL
+        self.resume_state = None
+        self.canonical_id = video_info.video_id or extract_video_id(video_info.url)
+
+        self.status = "waiting"
+        self.downloaded = 0
+        self.total = 0
+        self.percentage = 0.0
+        self.speed = 0.0
+        self.eta = 0
+        self.error = ""
+        self.interrupted = False    # İndirme sırasında kapanmış, .part'lardan devam edecek
+
+        # İptal kontrolü için lock ve flag
+        self._is_cancelled = False
+        self._cancel_lock = asyncio.Lock()
+        self._listeners = []
+        self._task = None  # start()'ı çalıştıran task (slot beklerken iptal için)
+
+    # ============== DİNLEYİCİLER ==============
+
+    def subscribe(self, callback: Callable[["DownloadJob", str], None]) -> Callable[[], None]:
+        """callback(job, event) kaydet; dönen fonksiyon aboneliği kaldırır"""
+        self._listeners.append(callback)
+
+        def unsubscribe():
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+        return unsubscribe
+
+    def _emit(self, event: str):
+        for callback in list(self._listeners):
+            try:
+                callback(self, event)
+            except Exception as e:
+                print(f"❌ Görev dinleyici hatası: {e}")
+
+    # ============== YAŞAM DÖNGÜSÜ ==============
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._is_cancelled
+
+    @property
+    def expected_bytes(self) -> int:
+        """Seçili kalitenin format tablosundaki boyutu; yoksa videonun yaklaşık boyutu"""
+        return self.video_info.quality_filesize(f"{self.resolution}p") or self.video_info.filesize_approx or 0
+
+    async def start(self):
+        """İndirmeyi başlat ve bitene kadar bekle (iptal edilmiş / hatalı görev için yeniden dener)"""
+        async with self._cancel_lock:
+            if self.status == "downloading":
+                return
+
+            print(f"🎬 Download başlatılıyor: {self.video_info.title}")
+
+            # Flag'i sıfırla - RESTART için kritik
+            self._is_cancelled = False
+            self.status = "downloading"
+            self.percentage = 0.0
+            self.speed = 0.0
+            self.eta = 0
+            self.error = ""
+            self.interrupted = False
+            self._emit("state")
+            if self.journal:
+                self.journal.record_start(self.video_id)
+            self._task = asyncio.current_task()
+
+        try:
+            result = await self.downloader.download(
+                video_id=self.video_id,
+                url=self.video_info.url,
+                save_path=self.save_path,
+                resolution=self.resolution,
+                progress_callback=self.on_progress,
+                on_admit=self._resolve_full_info if self.video_info.is_partial else None,
+                expected_bytes=self.expected_bytes,
+                priority=self.priority,
+                duration=self.video_info.duration,
+                channel=self.video_info.channel,
+                resume_state=self.resume_state,
+                on_resume_state=self._on_resume_state,
+                canonical_id=self.canonical_id,
+                select_format=lambda: self.video_info.formats.select(self.resolution),
+                load_info=lambda: get_extracted_info(self.video_info.url)
+            )
+
+            async with self._cancel_lock:
+                if self._is_cancelled:
+                    print(f"⚠️ Download tamamlandı ama iptal edilmişti: {self.video_info.title}")
+                    return
+
+            if result == "Success":
+                async with self._cancel_lock:
+                    self.status = "completed"
+                    self.percentage = 100.0
+                    self._emit("state")
+                    if self.journal:
+                        self.journal.record_complete(self.video_id)
+                print(f"✅ Download tamamlandı: {self.video_info.title}")
+
+            elif result == "Cancelled":
+                # Durum zaten cancel() tarafından güncellendi
+                print(f"⚠️ Downloader 'Cancelled' döndü: {self.video_info.title}")
+
+            else:
+                self._fail(result)
+                print(f"❌ Download hatası: {self.video_info.title}: {result}")
+
+        except Exception as ex:
+            async with self._cancel_lock:
+                if not self._is_cancelled:
+                    self._fail(str(ex))
+                    print(f"❌ Exception: {self.video_info.title}: {str(ex)}")
+
+        finally:
+            self._task = None
+
+    def _fail(self, message: str):
+        self.status = "error"
+        self.error = message
+        self._emit("state")
+        if self.journal:
+            self.journal.record_error(self.video_id, message)
+
+    async def cancel(self) -> bool:
+        """İndirmeyi (veya bekleyen görevi) iptal et; .part dosyaları devam için kalır"""
+        async with self._cancel_lock:
+            if self._is_cancelled:
+                print(f"⚠️ Zaten iptal ediliyor: {self.video_info.title}")
+                return False
+
+            if self.status not in ["downloading", "waiting"]:
+                print(f"⚠️ İptal edilemez durum: {self.status}")
+                return False
+
+            print(f"🛑 İptal başlatılıyor: {self.video_info.title}")
+
+            # Flag progress callback'lerini durdurur
+            self._is_cancelled = True
+            self.status = "cancelling"
+            self._emit("state")
+
+        self._cancel_pending()
+        # Downloader'ı iptal et (lock dışında, çünkü await var)
+        try:
+            await self.downloader.cancel(self.video_id)
+            print(f"✅ Downloader.cancel() tamamlandı: {self.video_info.title}")
+        except Exception as ex:
+            print(f"❌ Cancel error: {ex}")
+
+        # Callback'lerin durması için extra bekleme
+        await asyncio.sleep(0.8)
+
+        async with self._cancel_lock:
+            self.status = "cancelled"
+            self._emit("state")
+            if self.journal:
+                self.journal.record_cancel(self.video_id)
+        return True
+
+    async def abort(self):
+        """Kuyruktan kaldırılmadan önce: iniyorsa durdur, sonucu yok say"""
+        async with self._cancel_lock:
+            downloading = self.status == "downloading"
+            if downloading:
+                self._is_cancelled = True
+
+        if downloading:
+            self._cancel_pending()
+            try:
+                await self.downloader.cancel(self.video_id)
+                await asyncio.sleep(0.5)
+            except Exception as ex:
+                print(f"Remove cancel error: {ex}")
+
+    def _cancel_pending(self):
+        """Downloader'da slot bekliyorsa start() task'ını iptal et: indirme hiç başlamaz
+
+        Slot alınmışsa task'a dokunulmaz; iptal downloader'ın bayrağı/hook'ları ile olur.
+        """
+        if self._task is not None and self.downloader.is_waiting(self.video_id):
+            self._task.cancel()
+
+    def abandon(self):
+        """Uygulama kapanırken: sonucu yok say, journal'a iptal yazma (sonraki açılışta devam eder)"""
+        self._is_cancelled = True
+
+    def on_progress(self, data):
+        """Downloader'dan gelen ProgressRecord; iptal edildiyse yok sayılır"""
+        if self._is_cancelled or self.status != "downloading":
+            return
+        self.downloaded = data.downloaded
+        self.total = data.total
+        self.percentage = data.percentage
+        self.speed = data.speed
+        self.eta = data.eta
+        if self.journal:
+            self.journal.record_progress(self.video_id, data.downloaded, data.total)
+        self._emit("progress")
+
+    def _on_resume_state(self, state):
+        """Yarım dosyalar diske yazıldıkça devam bilgisini sakla (çökmeden sonra da geçerli)"""
+        self.resume_state = state
+        if self.journal:
+            self.journal.record_resume(self.video_id, state)
+
+    async def _resolve_full_info(self):
+        """Playlist'ten gelen eksik bilgiyi, indirme başlamadan hemen önce tamamla"""
+        self.video_info = await get_video_info(self.video_info.url)
+        if self.journal:
+            self.journal.record_info(self.video_id, self.video_info)
+        self._emit("state")
+
+    def restore(self, status: str, downloaded: int = 0, total: int = 0, error: str = ""):
+        """Journal'dan (veya diskte bulunan çıktıdan) gelen durumu uygula; journal'a yazmaz"""
+        self.downloaded = downloaded
+        self.total = total
+        self.percentage = min(downloaded / total, 1.0) * 100 if total else 0.0
+        self.error = error
+        if status == "completed":
+            self.status = "completed"
+            self.percentage = 100.0
+        elif status in ("error", "cancelled"):
+            self.status = status
+        else:
+            # İndirme sırasında kapanmış: tekrar başlatılmayı bekler
+            self.status = "waiting"
+            self.interrupted = bool(downloaded)
+        self._emit("state")
+
+    # ============== AYARLAR ==============
+
+    async def set_priority(self, priority: Priority):
+        self.priority = priority
+        await self.downloader.set_priority(self.video_id, priority)
+        self._emit("state")
+
+    def set_resolution(self, resolution: str):
+        self.resolution = resolution
+        self._record_settings()
+
+    def set_save_path(self, save_path: str):
+        self.save_path = save_path
+        self._record_settings()
+
+    def _record_settings(self):
+        if self.journal:
+            self.journal.record_settings(self.video_id, self.resolution, self.save_path)
+        self._emit("state")
@@ -1,78 +1,173 @@
 import asyncio
-import yt_dlp
 import psutil
 import os
 from concurrent.futures import ThreadPoolExecutor
-import glob
 import signal
+import shutil
 import sys
+import heapq
+import itertools
+
+from .ydl_pool import ydl_pool
+from .progress_bus import ProgressBus
+from .progress_table import ProgressTable, StreamProgress
+from .stats import ThroughputStats
+from .bandwidth import BandwidthLimiter
+from .scheduler import DownloadScheduler, Priority, PRIORITY_WEIGHTS
+from .resume import ResumeState
+from .staging import staging_dir, remove_staging
+from .output_index import OutputIndex
+from .process_backend import run_in_process
+from .parallel_streams import download_url, FANOUT_EXTRACTOR_ARGS
+import time
 
 
 class DynamicSemaphore:
-    """Dinamik olarak değer değiştirilebilen semaphore"""
+    """Dinamik olarak değer değiştirilebilen, öncelikli semaphore
+
+    Lock kullanmaz; tüm metodlar event loop thread'inde senkron çalışır.
+    Bekleyenler (key, sıra) ile sıralanan bir heap'te tutulur: boşalan slot
+    en küçük anahtarlı bekleyene O(log n)'de verilir. Anahtar verilmezse
+    davranış FIFO'dur. release() yeni task oluşturmadan doğrudan uyandırır.
+
+    Limit, dolu slot sayısının altına indirilirse aradaki fark borç (debt)
+    olarak tutulur: sonraki release()'ler önce borcu öder, böylece eşzamanlı
+    sahip sayısı yeni limite inene kadar kimse içeri alınmaz.
+    """
+    
+    # Heap girdisi: [key, seq, future, ticket, removed]
+    _KEY, _SEQ, _FUT, _TICKET, _REMOVED = range(5)
     
     def __init__(self, value=1):
+        if value < 0:
+            raise ValueError("Semaphore değeri negatif olamaz")
         self._value = value
+        self._held = 0
+        self._debt = 0
         self._waiters = []
-        self._lock = asyncio.Lock()
+        self._entries = {}
+        self._seq = itertools.count()
+        # İptal edilen / yeniden sıralanan girdiler heap'ten tembel (lazy)
+        # silinir, gerçek bekleyen sayısı ayrıca tutulur
+        self._waiting = 0
     
-    async def acquire(self):
-        """Semaphore'u kilitle"""
-        async with self._lock:
-            if self._value > 0:
-                self._value -= 1
-                return
-            
-            fut = asyncio.get_event_loop().create_future()
-            self._waiters.append(fut)
+    async def acquire(self, key=(), ticket=None):
+        """Semaphore'u kilitle
+
+        key: küçük olan önce alır (ör. (öncelik, boyut)); ticket: sonradan
+        reprioritize() ile sırayı değiştirebilmek için bekleyenin kimliği
+        """
+        if self._value > 0 and self._waiting == 0:
+            self._value -= 1
+            self._held += 1
+            return True
+        
+        fut = asyncio.get_running_loop().create_future()
+        entry = [key, next(self._seq), fut, ticket, False]
+        heapq.heappush(self._waiters, entry)
+        if ticket is not None:
+            self._entries[ticket] = entry
+        self._waiting += 1
         
         try:
             await fut
         except asyncio.CancelledError:
-            async with self._lock:
-                if not fut.done():
-                    self._waiters.remove(fut)
-                else:
-                    self._value += 1
+            if fut.cancelled():
+                # Hâlâ sıradaydı: sadece sayacı düş
+                self._waiting -= 1
+                self._compact_waiters()
+            else:
+                # Slot bize verilmişti ama kullanılamadı: sıradakine devret
+                self.release()
             raise
+        finally:
+            if ticket is not None:
+                current = self._entries.get(ticket)
+                if current is not None and current[self._FUT] is fut:
+                    del self._entries[ticket]
+        return True
     
-    def release(self):
-        """Semaphore'u serbest bırak"""
-        async def _release():
-            async with self._lock:
-                self._value += 1
-                while self._waiters and self._value > 0:
-                    fut = self._waiters.pop(0)
-                    if not fut.done():
-                        self._value -= 1
-                        fut.set_result(None)
-                        break
-        
-        asyncio.create_task(_release())
+    def reprioritize(self, ticket, key):
+        """Bekleyen bir girdinin anahtarını değiştir; bekleyen yoksa False döner"""
+        entry = self._entries.get(ticket)
+        if entry is None or entry[self._FUT].done():
+            return False
+        entry[self._REMOVED] = True
+        new_entry = [key, next(self._seq), entry[self._FUT], ticket, False]
+        heapq.heappush(self._waiters, new_entry)
+        self._entries[ticket] = new_entry
+        self._compact_waiters()
+        return True
+    
+    def is_waiting(self, ticket):
+        entry = self._entries.get(ticket)
+        return entry is not None and not entry[self._FUT].done()
+    
+    def try_acquire(self, count=1):
+        """Bekleyen yoksa en fazla count boş slotu beklemeden al; alınan sayıyı döndürür
+
+        Sıradakilerin önüne geçmemek için bekleyen varken hiç slot vermez.
+        """
+        if self._waiting or count <= 0:
+            return 0
+        taken = min(count, self._value)
+        self._value -= taken
+        self._held += taken
+        return taken
+    
+    def release(self, count=1):
+        """Semaphore'u serbest bırak; limit düşürüldüyse slot önce borca sayılır"""
+        self._held -= count
+        paid = min(self._debt, count)
+        self._debt -= paid
+        self._value += count - paid
+        self._wake_up_next()
     
     async def set_value(self, new_value):
-        """Dinamik olarak maksimum değeri değiştir"""
-        async with self._lock:
-            old_value = self._value
-            self._value = new_value
-            
-            if new_value > old_value:
-                wake_count = new_value - old_value
-                for _ in range(wake_count):
-                    if self._waiters and self._value > 0:
-                        fut = self._waiters.pop(0)
-                        if not fut.done():
-                            self._value -= 1
-                            fut.set_result(None)
+        """Dinamik olarak mevcut (boş) slot sayısını değiştir
+
+        Negatif değer, o kadar release()'in boş slota dönüşmeden yutulacağı borçtur.
+        """
+        self._value = max(0, new_value)
+        self._debt = max(0, -new_value)
+        self._wake_up_next()
+    
+    async def set_limit(self, limit):
+        """Toplam slot sayısını değiştir (dolu slotlar dahil)
+
+        Dolu slotlar yeni limiti aşıyorsa fazlası borç olur ve iş bittikçe geri alınır.
+        """
+        await self.set_value(limit - self._held)
     
     async def get_value(self):
         """Mevcut değeri döndür"""
-        async with self._lock:
-            return self._value
+        return self._value
     
     def get_waiting_count(self):
         """Bekleyen task sayısını döndür"""
-        return len(self._waiters)
+        return self._waiting
+    
+    def get_held_count(self):
+        """Şu an alınmış (dolu) slot sayısı"""
+        return self._held
+    
+    def _wake_up_next(self):
+        """Boş slot kaldıkça en öncelikli bekleyenleri uyandır"""
+        while self._value > 0 and self._waiters:
+            entry = heapq.heappop(self._waiters)
+            fut = entry[self._FUT]
+            if entry[self._REMOVED] or fut.done():
+                continue
+            self._value -= 1
+            self._held += 1
+            self._waiting -= 1
+            fut.set_result(True)
+    
+    def _compact_waiters(self):
+        """Geçersiz girdiler birikirse heap'i yeniden kur"""
+        if len(self._waiters) > 2 * self._waiting + 32:
+            self._waiters = [e for e in self._waiters if not e[self._REMOVED] and not e[self._FUT].done()]
+            heapq.heapify(self._waiters)
     
     async def __aenter__(self):
         await self.acquire()
@@ -83,18 +178,56 @@ class DynamicSemaphore:
 
 
 class RobustDownloader:
-    def __init__(self, max_concurrent=5):
+    BACKENDS = ("thread", "process")
+    
+    def __init__(self, max_concurrent=5, bandwidth_limit=0, output_index=None, backend="thread", memory_limit_mb=0,
+                 max_fragment_fanout=4):
+        """backend: "thread" (yt-dlp GUI sürecinde, thread havuzunda) veya "process"
+        (her indirme ayrı bir worker süreçte; iptal süreci öldürür)
+        memory_limit_mb: process backend'inde worker (+ ffmpeg) başına RSS sınırı, 0 = sınırsız
+        max_fragment_fanout: tek bir indirmenin boştaki slotları ödünç alarak açabileceği
+        en fazla paralel bağlantı (1 = kapalı)"""
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Bilinmeyen backend: {backend}")
+        self.backend = backend
+        self.memory_limit = int(memory_limit_mb * 1024 * 1024)
         self.max_concurrent = max_concurrent
+        self.max_fragment_fanout = max(1, max_fragment_fanout)
+        self._borrowed = 0
+        self._loans = {}  # video_id -> o indirmenin hâlâ tuttuğu ödünç slot sayısı
+        self._loan_returns = {}  # video_id -> bağlantılar kapandıkça slot iade eden (thread-safe) callback
         self.semaphore = DynamicSemaphore(max_concurrent)
         self.executor = ThreadPoolExecutor(max_workers=20)
         self.processes = {}
         self.is_cancelled = {}
-        self.latest_progress = {}
+        self.progress_table = ProgressTable()
         self.active_downloads = 0
         self._stats_lock = asyncio.Lock()
         
         # ✅ YENİ: Her video için ayrı cancel event
         self.cancel_events = {}
+        self._weights = {}
+        # video_id -> (ResumeState, değişince çağrılacak bildirim)
+        self._resume = {}
+        # video_id -> StreamProgress (video + ses progress'inin toplamı)
+        self._streams = {}
+        
+        # ✅ Tüm progress'ler tek akıştan (UI, journal, metrikler buna abone olur)
+        self.progress_bus = ProgressBus()
+        self.stats = ThroughputStats()
+        self.progress_bus.subscribe(self.stats.on_progress)
+        
+        # ✅ Global bant genişliği bütçesi (bytes/sn, 0 = sınırsız)
+        self.bandwidth = BandwidthLimiter(bandwidth_limit)
+        
+        # ✅ Bekleyenlerin sırası: öncelik, kanal adaleti, en kısa iş
+        self.scheduler = DownloadScheduler()
+        self._limit_listeners = []
+        
+        # ✅ Tekrar indirme önleme: tamamlanmış çıktılar (kalıcı) ve süren indirmeler
+        self.output_index = output_index
+        self._inflight = {}      # (kanonik id, seçim) -> (video_id, Future[(sonuç, dosya)])
+        self._final_paths = {}   # video_id -> MoveFiles sonrası son dosya yolu
 
     def progress_hook(self, d, video_id):
         # ✅ Daha güvenli cancel kontrolü
@@ -102,34 +235,97 @@ class RobustDownloader:
             raise Exception("DOWNLOAD_CANCELLED_BY_USER")
         
         if d['status'] == 'downloading':
-            try:
-                total = d.get('total_bytes') or d.get('total_bytes_estimate', 0)
-                downloaded = d.get('downloaded_bytes', 0)
-                speed = d.get('speed', 0)
-                eta = d.get('eta', 0)
-                
-                self.latest_progress[video_id] = {
-                    'status': 'downloading',
-                    'downloaded': downloaded,
-                    'total': total,
-                    'percentage': (downloaded / total * 100) if total > 0 else 0,
-                    'speed': speed,
-                    'eta': eta
-                }
-            except:
-                pass
+            downloaded = self._record_progress(d, video_id)
+            
+            # ✅ Bant genişliği payını aştıysa bu thread'i (yani bu stream'i) beklet
+            self.bandwidth.register(video_id, self._weights.get(video_id, 1.0))
+            delay = self.bandwidth.consume(video_id, downloaded)
+            if delay > 0:
+                self._throttle(video_id, delay)
+        
+        elif d['status'] == 'finished':
+            self._record_progress(d, video_id)
+            # Stream'lerin hepsi bittiyse (merge vb. sürerken) payını diğerlerine bırak
+            if not self._has_active_streams(video_id):
+                self.bandwidth.unregister(video_id)
+
+    def _record_progress(self, d, video_id):
+        """Progress'i tabloya yaz ve yayınla (thread ve process backend'leri ortak)
 
-    def _run_download(self, url, video_id, opts):
+        Video ve ses stream'leri tek kayıtta toplanır; toplam indirilen byte'ı döndürür.
+        """
+        resume = self._resume.get(video_id)
+        if resume and resume[0].observe(d):
+            resume[1](resume[0].copy())
+        
+        streams = self._streams.get(video_id)
+        if streams is None:
+            return d.get('downloaded_bytes') or 0
+        downloaded, total, speed, eta = streams.update(d)
+        
+        try:
+            # ✅ Yeni dict yok: video'nun kaydı tabloda yerinde güncellenir
+            record = self.progress_table.get(video_id)
+            if record is not None:
+                record.update(downloaded, total, speed, eta)
+                self.progress_bus.publish(video_id, record)
+        except:
+            pass
+        return downloaded
+    
+    def _on_formats(self, formats, video_id):
+        """Seçilen stream'ler belli oldu: toplam boyutu ve devam için format kombinasyonunu sabitle"""
+        streams = self._streams.get(video_id)
+        if streams is not None:
+            streams.set_formats(formats)
+        
+        # Stream'ler ayrı indiği için hook'lara tek formatın info'su gelir; "137+140" burada öğrenilir
+        resume = self._resume.get(video_id)
+        if resume and not resume[0].format_id:
+            resume[0].format_id = "+".join(str(f.get('format_id')) for f in formats)
+            resume[1](resume[0].copy())
+    
+    def _has_active_streams(self, video_id):
+        streams = self._streams.get(video_id)
+        return streams is not None and streams.active_count() > 0
+
+    def _throttle(self, video_id, delay):
+        """İptal edilebilir bekleme (hook thread'inde çalışır)"""
+        deadline = time.monotonic() + min(delay, 5.0)
+        while True:
+            if self.is_cancelled.get(video_id, False):
+                raise Exception("DOWNLOAD_CANCELLED_BY_USER")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, 0.25))
+
+    def _postprocessor_hook(self, d, video_id):
+        # Staging'den save_path'e taşıma bittiğinde son dosya yolu kesinleşir
+        # (hook'a taşımadan önceki info kopyası gelir; yolu MoveFiles gibi hesapla)
+        if d['status'] == 'finished' and d.get('postprocessor') == 'MoveFiles':
+            info = d.get('info_dict') or {}
+            filepath = info.get('filepath')
+            if filepath:
+                final_dir = info.get('__finaldir') or os.path.dirname(filepath)
+                self._final_paths[video_id] = os.path.join(final_dir, os.path.basename(filepath))
+
+    def _run_download(self, url, video_id, opts, info=None):
+        if self.backend == "process":
+            return self._run_download_process(url, video_id, opts, info)
         try:
-            opts_with_hook = opts.copy()
-            opts_with_hook['progress_hooks'] = [lambda d: self.progress_hook(d, video_id)]
+            hooks = [lambda d: self.progress_hook(d, video_id)]
+            pp_hooks = [lambda d: self._postprocessor_hook(d, video_id)]
             
             # ✅ Process'i kaydet
             current_process = psutil.Process(os.getpid())
             self.processes[video_id] = current_process
             
-            with yt_dlp.YoutubeDL(opts_with_hook) as ydl:
-                ydl.download([url])
+            # ✅ Thread'e bağlı, önceden kurulmuş YoutubeDL'i kullan
+            with ydl_pool.acquire(opts, progress_hooks=hooks, postprocessor_hooks=pp_hooks) as ydl:
+                # Video ve ses stream'leri paralel iner, merge ikisi bitince başlar
+                download_url(ydl, url, on_formats=lambda f: self._on_formats(f, video_id), info=info,
+                             on_connections_closed=self._loan_returns.get(video_id))
             
             return "Success"
             
@@ -146,33 +342,248 @@ class RobustDownloader:
             # ✅ Process'i temizle
             self.processes.pop(video_id, None)
 
-    async def download(self, video_id, url, save_path, resolution="1080", progress_callback=None):
-        # Semaphore'u bekle
-        await self.semaphore.acquire()
+    def _run_download_process(self, url, video_id, opts, info=None):
+        """İndirmeyi worker süreçte çalıştır; progress IPC ile gelir, iptal süreci öldürür"""
+        def on_progress(d):
+            if d['status'] == 'downloading':
+                downloaded = self._record_progress(d, video_id)
+                # Worker'ı bekletemeyiz: payı paylaşılan ratelimit değeri olarak gider
+                self.bandwidth.register(video_id, self._weights.get(video_id, 1.0))
+                self.bandwidth.consume(video_id, downloaded)
+            elif d['status'] == 'finished':
+                self._record_progress(d, video_id)
+                if not self._has_active_streams(video_id):
+                    self.bandwidth.unregister(video_id)
+        
+        def on_start(process):
+            self.processes[video_id] = process
+        
+        try:
+            return run_in_process(
+                url, opts,
+                on_progress=on_progress,
+                on_postprocess=lambda d: self._postprocessor_hook(d, video_id),
+                on_formats=lambda f: self._on_formats(f, video_id),
+                on_connections_closed=self._loan_returns.get(video_id),
+                info=info,
+                should_cancel=lambda: self.is_cancelled.get(video_id, False),
+                share_rate=lambda: self.bandwidth.share_rate(video_id),
+                memory_limit=self.memory_limit,
+                on_start=on_start,
+            )
+        except Exception as e:
+            return f"Error: {e}"
+        finally:
+            self.processes.pop(video_id, None)
+
+    async def download(self, video_id, url, save_path, resolution="1080", progress_callback=None, on_admit=None, expected_bytes=0, weight=None,
+                       priority=Priority.NORMAL, duration=0, channel="", resume_state=None, on_resume_state=None, canonical_id=None,
+                       select_format=None, load_info=None):
+        """Videoyu indir; canonical_id verilirse aynı video + format seçimi tekrar indirilmez
+
+        - Daha önce tamamlanmışsa (output_index) slot almadan sonuçlanır; farklı
+          klasöre istenmişse mevcut dosyaya hard link verilir.
+        - Aynısı şu an iniyorsa yeni indirme başlatılmaz: progress_callback
+          o indirmenin progress'ine abone olur ve sonucunu paylaşır.
+        Diğer parametreler için _download'a bakın.
+        """
+        # Önceki denemeden (veya hiç başlamadan iptal edilmiş görevden) kalan iptal bayrağını sıfırla;
+        # bundan sonraki cancel() slot beklerken de geçerli olur
+        self.is_cancelled.pop(video_id, None)
+        if not canonical_id:
+            return await self._download(video_id, url, save_path, resolution, progress_callback, on_admit, expected_bytes,
+                                        weight, priority, duration, channel, resume_state, on_resume_state,
+                                        select_format=select_format, load_info=load_info)
+        
+        key = (canonical_id, OutputIndex.selection_key(resolution))
+        primary = self._inflight.get(key)
+        if primary is not None:
+            result = await self._attach(primary, video_id, save_path, progress_callback)
+            if result is not None:
+                return result
+            # Asıl indirme iptal edildi: bu istek kendi indirmesini başlatır
+            return await self.download(video_id, url, save_path, resolution, progress_callback, on_admit, expected_bytes,
+                                       weight, priority, duration, channel, resume_state, on_resume_state, canonical_id,
+                                       select_format=select_format, load_info=load_info)
+        
+        # Index'e bakılırken gelen aynı istekler de buna bağlansın diye önce kaydol
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (video_id, future)
+        result, final_path = "Cancelled", None
+        try:
+            existing = await self.output_index.alookup(*key) if self.output_index else None
+            if existing:
+                print(f"♻️ Zaten indirilmiş: {existing}")
+                final_path = existing
+                result = await self._link_output(existing, save_path)
+                return result
+            
+            result = await self._download(video_id, url, save_path, resolution, progress_callback, on_admit, expected_bytes,
+                                          weight, priority, duration, channel, resume_state, on_resume_state,
+                                          select_format=select_format, load_info=load_info)
+            final_path = self._final_paths.get(video_id)
+            if result == "Success" and final_path and self.output_index:
+                try:
+                    await self.output_index.arecord(*key, final_path)
+                except OSError as e:
+                    print(f"⚠️ Çıktı index'e yazılamadı: {e}")
+            return result
+        finally:
+            self._inflight.pop(key, None)
+            self._final_paths.pop(video_id, None)
+            future.set_result((result, final_path))
+    
+    async def find_output(self, canonical_id, resolution):
+        """Bu video + çözünürlük daha önce tamamlandıysa çıktı dosyasının yolu"""
+        if not canonical_id or not self.output_index:
+            return None
+        return await self.output_index.alookup(canonical_id, OutputIndex.selection_key(resolution))
+    
+    async def _attach(self, primary, video_id, save_path, progress_callback):
+        """Süren aynı indirmeye bağlan; asıl indirme iptal edildiyse None döner"""
+        primary_id, future = primary
+        print(f"🔗 Aynı video zaten iniyor, ona bağlanılıyor: {primary_id}")
+        
+        unsubscribe = None
+        if progress_callback:
+            unsubscribe = self.progress_bus.subscribe(progress_callback, primary_id)
+        
+        cancel_event = self.cancel_events[video_id] = asyncio.Event()
+        cancel_wait = asyncio.ensure_future(cancel_event.wait())
+        try:
+            await asyncio.wait({future, cancel_wait}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            cancel_wait.cancel()
+            if unsubscribe:
+                unsubscribe()
+            self.cancel_events.pop(video_id, None)
+            cancelled = self.is_cancelled.pop(video_id, False)
+        
+        if cancelled or not future.done():
+            return "Cancelled"
+        result, final_path = future.result()
+        if result == "Success" and final_path:
+            return await self._link_output(final_path, save_path)
+        return None if result == "Cancelled" else result
+    
+    async def _link_output(self, existing, save_path):
+        """Mevcut çıktıyı save_path'e hard link ile koy (aynı klasördeyse dokunma)"""
+        target = os.path.join(save_path, os.path.basename(existing))
+        
+        def link():
+            if os.path.exists(target) and os.path.samefile(existing, target):
+                return
+            os.makedirs(save_path, exist_ok=True)
+            try:
+                os.link(existing, target)
+            except OSError:
+                # Farklı dosya sistemi / link desteklenmiyor
+                shutil.copy2(existing, target)
+        
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, link)
+            return "Success"
+        except OSError as e:
+            return f"Error: {e}"
+
+    async def _download(self, video_id, url, save_path, resolution="1080", progress_callback=None, on_admit=None, expected_bytes=0, weight=None,
+                        priority=Priority.NORMAL, duration=0, channel="", resume_state=None, on_resume_state=None,
+                        select_format=None, load_info=None):
+        """on_admit: slot alındıktan hemen sonra, indirme başlamadan önce await edilir
+        (ör. playlist girdilerinin tam metadata'sını tembel olarak çekmek için)
+        expected_bytes: beklerken kuyruk ETA'sına katılan tahmini boyut
+        weight: bant genişliği sınırı varken adil paydaki ağırlık (varsayılan: önceliğe göre)
+        priority / duration / channel: bekleme sırasını belirleyen scheduler bilgileri
+        resume_state: önceki denemeden kalan ResumeState; doğrulanırsa aynı format
+        sabitlenip .part dosyalarından devam edilir
+        on_resume_state: devam bilgisi değişince event loop'ta çağrılır (ResumeState
+        veya indirme tamamlandıysa None); kalıcı saklamak çağıranın işidir
+        select_format: on_admit'ten sonra çağrılır; önceden seçilmiş FormatChoice
+        (veya None) döndürür. Format ID'leri sabitlenir, boyutu toplam olarak kullanılır
+        load_info: on_admit'ten sonra thread'de çağrılır; önceden çıkarılmış ham
+        yt-dlp info'sunu (veya None) döndürür. Verilirse sayfa tekrar çıkarılmaz"""
+        result = "Cancelled"
+        self.stats.on_waiting(video_id, expected_bytes)
+        if weight is None:
+            weight = PRIORITY_WEIGHTS[Priority(priority)]
+        
+        # Semaphore'u scheduler'ın verdiği sırayla bekle
+        key = self.scheduler.enqueue(video_id, priority, expected_bytes, duration, channel)
+        try:
+            await self.semaphore.acquire(key, ticket=video_id)
+        except asyncio.CancelledError:
+            # Slot beklerken iptal edildi (DownloadJob.cancel task'ı iptal eder)
+            self.is_cancelled.pop(video_id, None)
+            self.stats.on_finish(video_id, result)
+            raise
+        finally:
+            self.scheduler.dequeue(video_id)
         
         try:
             async with self._stats_lock:
                 self.active_downloads += 1
+            self.stats.on_start(video_id)
+            
+            if on_admit and not self.is_cancelled.get(video_id, False):
+                await on_admit()
+            choice = select_format() if select_format else None
+            info = await asyncio.get_running_loop().run_in_executor(None, load_info) if load_info else None
+            
+            # Slot beklerken (veya bilgi tamamlanırken) iptal edildiyse indirmeye hiç başlama
+            if self.is_cancelled.pop(video_id, False):
+                print(f"⏹️ Başlamadan iptal edildi: {video_id}")
+                return result
             
-            # ✅ Cancel state'i başlat
-            self.is_cancelled[video_id] = False
             self.cancel_events[video_id] = asyncio.Event()
-            self.latest_progress[video_id] = {}
+            self.progress_table.open(video_id)
+            self._streams[video_id] = StreamProgress(choice.filesize if choice and choice.filesize else expected_bytes)
+            self._weights[video_id] = weight
+            
+            loop = asyncio.get_running_loop()
+            self.progress_bus.bind(loop)
+            unsubscribe = None
+            
+            # Ara dosyalar sadece bu indirmeye ait klasörde; bitince son dosya save_path'e taşınır
+            staging = staging_dir(save_path, video_id)
+            state = await self._prepare_resume(resume_state, resolution, save_path)
+            
+            def notify_resume(snapshot):
+                if on_resume_state:
+                    loop.call_soon_threadsafe(on_resume_state, snapshot)
+            self._resume[video_id] = (state, notify_resume)
+            
+            # Boşta slot varsa bu indirme onları ek bağlantı olarak ödünç alır (bütçe aşılmaz)
+            borrowed = await self._borrow_slots(video_id, state)
+            if borrowed:
+                def connections_closed(count):
+                    loop.call_soon_threadsafe(self._return_loan, video_id, count)
+                self._loan_returns[video_id] = connections_closed
+            
+            format_spec = f"bestvideo[height<={resolution}][ext=mp4]+bestaudio[ext=m4a]/best[height<={resolution}][ext=mp4]/best"
+            if state.format_id:
+                # Aynı stream'ler seçilsin ki .part dosyaları eşleşsin; format artık yoksa normal seçime düş
+                format_spec = f"{state.format_id}/{format_spec}"
+            elif choice:
+                # Format tablosundan önceden seçildi; yt-dlp'nin kendi seçimi sadece yedek
+                format_spec = f"{choice.format_id}/{format_spec}"
             
             ydl_opts = {
-                'format': f"bestvideo[height<={resolution}][ext=mp4]+bestaudio[ext=m4a]/best[height<={resolution}][ext=mp4]/best",
-                'outtmpl': f'{save_path}/%(title)s_{resolution}p.%(ext)s',
+                'format': format_spec,
+                'outtmpl': f'%(title)s_{resolution}p.%(ext)s',
+                'paths': {'home': save_path, 'temp': staging},
                 'quiet': True,
                 'merge_output_format': 'mp4',
+                'continuedl': True,
+                **self._buffer_opts(),
+                **self._fanout_opts(1 + borrowed),
             }
             
-            loop = asyncio.get_running_loop()
-            monitor_task = None
-            
             if progress_callback:
-                monitor_task = asyncio.create_task(
-                    self._monitor_progress(video_id, progress_callback)
-                )
+                def on_progress(data):
+                    # ✅ İptal edildiyse UI'a iletme
+                    if not self.is_cancelled.get(video_id, False):
+                        progress_callback(data)
+                unsubscribe = self.progress_bus.subscribe(on_progress, video_id)
             
             try:
                 # ✅ Download işlemini başlat
@@ -181,52 +592,46 @@ class RobustDownloader:
                     self._run_download, 
                     url, 
                     video_id, 
-                    ydl_opts
+                    ydl_opts,
+                    info
                 )
                 
+                if result == "Success":
+                    # Format değiştiyse eski denemeden kalan yarım dosyalar artık işe yaramaz
+                    await loop.run_in_executor(None, state.discard)
+                    await loop.run_in_executor(None, remove_staging, save_path, video_id)
+                    if on_resume_state:
+                        on_resume_state(None)
+                
                 return result
                 
             finally:
-                # ✅ Monitor'u durdur
-                if monitor_task:
-                    monitor_task.cancel()
-                    try:
-                        await monitor_task
-                    except asyncio.CancelledError:
-                        pass
+                # ✅ Aboneliği bitir
+                if unsubscribe:
+                    unsubscribe()
                 
                 # ✅ Cleanup
                 self.is_cancelled.pop(video_id, None)
                 self.cancel_events.pop(video_id, None)
-                self.latest_progress.pop(video_id, None)
+                self.progress_table.close(video_id)
+                self._streams.pop(video_id, None)
+                self.bandwidth.unregister(video_id)
+                self._weights.pop(video_id, None)
+                self._resume.pop(video_id, None)
+                # Stream'ler bitirken iade edilmemiş ödünç slotları geri ver
+                self._loan_returns.pop(video_id, None)
+                self._return_loan(video_id, self._loans.get(video_id, 0))
                 
+        except Exception as ex:
+            result = f"Error: {ex}"
+            raise
         finally:
+            self.stats.on_finish(video_id, result)
             async with self._stats_lock:
                 self.active_downloads -= 1
             
             self.semaphore.release()
 
-    async def _monitor_progress(self, video_id, callback):
-        """Progress monitoring loop"""
-        try:
-            while True:
-                await asyncio.sleep(0.4)
-                
-                # ✅ İptal edildiyse dur
-                if self.is_cancelled.get(video_id, False):
-                    break
-                
-                if video_id in self.latest_progress:
-                    data = self.latest_progress[video_id]
-                    if data:
-                        try:
-                            callback(data)
-                        except:
-                            pass
-                            
-        except asyncio.CancelledError:
-            pass
-
     async def cancel(self, video_id):
         """✅ Geliştirilmiş iptal mekanizması"""
         print(f"🛑 Downloader.cancel() çağrıldı: {video_id}")
@@ -250,6 +655,99 @@ class RobustDownloader:
         
         print(f"✅ Downloader.cancel() tamamlandı: {video_id}")
 
+    async def _prepare_resume(self, resume_state, resolution, save_path):
+        """Önceki denemenin kaydını doğrula; tutarsızsa yarım dosyaları silip sıfırdan başla"""
+        if resume_state is None:
+            return ResumeState(resolution, save_path)
+        
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, resume_state.verify, resolution, save_path):
+            resumed = await loop.run_in_executor(None, resume_state.partial_bytes)
+            if resumed:
+                print(f"⏯️ Kaldığı yerden devam: {resumed / 1024 / 1024:.1f} MB ({resume_state.format_id})")
+            return resume_state.copy()
+        
+        print(f"♻️ Devam kaydı geçersiz, baştan indirilecek ({resume_state.format_id or '?'})")
+        await loop.run_in_executor(None, resume_state.discard)
+        return ResumeState(resolution, save_path)
+    
+    async def _borrow_slots(self, video_id, state):
+        """Fragment fan-out için boştaki slotlardan en fazla max_fragment_fanout - 1 tanesini al
+
+        Yarım dosyadan devam eden indirmeye uygulanmaz: .part tek bağlantıyla
+        yazılmıştır ve HTTP Range ile kaldığı yerden sürdürülür. İndirmenin tüm
+        stream'lerindeki bağlantılar tuttuğu slot sayısını aşmaz (bkz.
+        parallel_streams.split_connections); bir stream bitip bağlantıları
+        kapandıkça o kadar ödünç slot _return_loan ile hemen iade edilir.
+        """
+        if self.max_fragment_fanout <= 1:
+            return 0
+        if await asyncio.get_running_loop().run_in_executor(None, state.partial_bytes):
+            return 0
+        borrowed = self.semaphore.try_acquire(self.max_fragment_fanout - 1)
+        if borrowed:
+            self._borrowed += borrowed
+            self._loans[video_id] = borrowed
+            print(f"⚡ {1 + borrowed} paralel bağlantı")
+        return borrowed
+    
+    def _return_loan(self, video_id, count):
+        """Bağlantıları kapanan `count` slotu semaphore'a geri ver (event loop'ta)
+
+        İndirmenin kendi slotu ödünç sayılmaz; o indirme bitince bırakılır.
+        """
+        loaned = self._loans.get(video_id, 0)
+        count = min(count, loaned)
+        if count <= 0:
+            return
+        if loaned > count:
+            self._loans[video_id] = loaned - count
+        else:
+            del self._loans[video_id]
+        self._borrowed -= count
+        self.semaphore.release(count)
+    
+    def _buffer_opts(self):
+        """Bant genişliği sınırı varken buffer'ı küçük ve sabit tut
+
+        Sınır hook başına uygulanır; yt-dlp'nin buffer'ı büyüdükçe hook'lar
+        seyrekleşir ve hız dalgalanır. Sınır yokken yt-dlp'nin uyarlanabilir
+        buffer'ına dokunulmaz (indirme sırasında açılan sınır yine uygulanır,
+        sadece daha iri adımlarla).
+        """
+        if not self.bandwidth.enabled:
+            return {}
+        return {'noresizebuffer': True, 'buffersize': 256 * 1024}
+    
+    @staticmethod
+    def _fanout_opts(connections):
+        """connections > 1 ise stream'leri paralel parçalar halinde indirten yt-dlp seçenekleri
+
+        YouTube'un HTTPS formatları 'dashy' ile aynı format ID'leriyle range'li
+        DASH parçalarına çevrilir (get_video_info'nun ham info'su da öyle çıkarılır,
+        tekrar extraction gerekmez); HLS/DASH parçaları zaten parçalıdır.
+        connections indirmenin toplam bağlantı bütçesidir; paralel inen
+        stream'ler onu aralarında böler (download_url).
+        """
+        if connections <= 1:
+            return {}
+        return {
+            'concurrent_fragment_downloads': connections,
+            'extractor_args': FANOUT_EXTRACTOR_ARGS,
+        }
+    
+    async def set_fragment_fanout(self, fanout):
+        """Yeni başlayacak indirmeler için en fazla paralel bağlantı (1 = kapalı)"""
+        self.max_fragment_fanout = max(1, int(fanout))
+        print(f"✅ Fragment fan-out: {self.max_fragment_fanout}")
+    
+    async def discard_partial(self, video_id, save_path, resume_state=None):
+        """Kuyruktan kaldırılan görevin yarım dosyalarını (staging klasörü dahil) sil"""
+        loop = asyncio.get_running_loop()
+        if resume_state is not None:
+            await loop.run_in_executor(None, resume_state.discard)
+        await loop.run_in_executor(None, remove_staging, save_path, video_id)
+
     def _force_kill_recursive(self, process):
         """✅ Geliştirilmiş process kill - Windows/Linux uyumlu"""
         try:
@@ -284,16 +782,6 @@ class RobustDownloader:
         except Exception as e:
             print(f"❌ Kill error: {e}")
 
-    def _cleanup_temp_files(self):
-        """Geçici dosyaları temizle"""
-        patterns = ['*.part', '*.ytdl', '*.temp', '*.f*-*.m4a', '*.f*-*.mp4']
-        for p in patterns:
-            for f in glob.glob(p):
-                try: 
-                    os.remove(f)
-                except: 
-                    pass
-    
     # ============== DİNAMİK YÖNETİM FONKSİYONLARI ==============
     
     async def set_max_concurrent(self, new_limit):
@@ -303,26 +791,83 @@ class RobustDownloader:
             self.max_concurrent = new_limit
             
             current_available = await self.semaphore.get_value()
-            new_available = max(0, new_limit - self.active_downloads)
-            
-            await self.semaphore.set_value(new_available)
+            # Dolu slotlar (fan-out için ödünç verilenler dahil) semaphore'da sayılır;
+            # limit altına inilirse fazlası indirmeler bittikçe geri alınır
+            await self.semaphore.set_limit(new_limit)
+            new_available = await self.semaphore.get_value()
             
             print(f"✅ Max concurrent: {old_limit} -> {new_limit}")
             print(f"   Aktif indirmeler: {self.active_downloads}")
             print(f"   Mevcut slotlar: {current_available} -> {new_available}")
             print(f"   Bekleyen indirmeler: {self.semaphore.get_waiting_count()}")
+        
+        for listener in self._limit_listeners:
+            listener(new_limit)
+    
+    def add_limit_listener(self, callback):
+        """Max concurrent her değiştiğinde callback(new_limit) çağrılır"""
+        self._limit_listeners.append(callback)
     
-    async def get_stats(self):
-        """Downloader istatistiklerini döndürür"""
+    # ============== SIRALAMA ==============
+    
+    def is_waiting(self, video_id):
+        """İndirme slot bekliyor mu?"""
+        return self.semaphore.is_waiting(video_id)
+    
+    async def move_to_front(self, video_id):
+        """Bekleyen indirmeyi bir sonraki boş slotu alacak şekilde öne al"""
+        key = self.scheduler.move_to_front(video_id)
+        return key is not None and self.semaphore.reprioritize(video_id, key)
+    
+    async def set_priority(self, video_id, priority):
+        """Önceliği değiştir: bekliyorsa sırası, iniyorsa bant genişliği payı güncellenir"""
+        key = self.scheduler.set_priority(video_id, priority)
+        if key is not None:
+            self.semaphore.reprioritize(video_id, key)
+        await self.set_download_weight(video_id, PRIORITY_WEIGHTS[Priority(priority)])
+    
+    async def set_scheduling_policy(self, policy):
+        """'fifo' veya 'shortest' (en kısa iş önce); bekleyenler yeniden sıralanır"""
+        if policy not in DownloadScheduler.POLICIES:
+            raise ValueError(f"Bilinmeyen politika: {policy}")
+        self.scheduler.policy = policy
+        for video_id, key in self.scheduler.rekey_all().items():
+            self.semaphore.reprioritize(video_id, key)
+        print(f"✅ Scheduling policy: {policy}")
+    
+    async def set_bandwidth_limit(self, bytes_per_sec):
+        """Global bant genişliği bütçesini dinamik olarak değiştirir (0 = sınırsız)"""
+        old_limit = self.bandwidth.rate
+        self.bandwidth.set_rate(bytes_per_sec)
+        print(f"✅ Bandwidth limit: {old_limit / 1024 / 1024:.2f} -> {bytes_per_sec / 1024 / 1024:.2f} MB/s")
+    
+    async def set_download_weight(self, video_id, weight):
+        """Aktif bir indirmenin adil paydaki ağırlığını değiştirir"""
+        if video_id in self._weights:
+            self._weights[video_id] = weight
+        self.bandwidth.set_weight(video_id, weight)
+    
+    async def get_stats(self, extra_waiting_bytes=0):
+        """Downloader istatistiklerini döndürür
+
+        extra_waiting_bytes: henüz download() çağrılmamış (UI'da bekleyen) videoların
+        tahmini toplam boyutu; kuyruk ETA'sına eklenir.
+        """
         async with self._stats_lock:
             current_value = await self.semaphore.get_value()
-            return {
+            stats = {
                 'max_concurrent': self.max_concurrent,
                 'active_downloads': self.active_downloads,
                 'waiting_downloads': self.semaphore.get_waiting_count(),
                 'available_slots': current_value,
                 'total_tracked': len(self.processes),
+                'total_speed': self.progress_table.total_speed(),
+                'overall_eta': self.progress_table.overall_eta(),
+                'bandwidth_limit': self.bandwidth.rate,
+                'borrowed_slots': self._borrowed,
             }
+            stats.update(self.stats.snapshot(self.progress_table.remaining_bytes(), extra_waiting_bytes))
+            return stats
     
     async def increase_limit(self, amount=1):
         """Limiti belirli miktarda artırır"""
@@ -0,0 +1,103 @@
+from dataclasses import dataclass, field, asdict, fields
+from typing import List, NamedTuple, Optional
+
+
+class FormatChoice(NamedTuple):
+    """Bir çözünürlük için önceden seçilmiş format(lar)"""
+    format_id: str      # yt-dlp format seçimi, ör. "137+140" veya "22"
+    filesize: int       # Seçilen stream'lerin toplam boyutu (0 = bilinmiyor)
+    height: int
+
+
+@dataclass
+class FormatTable:
+    """Extraction'dan gelen format listesinin sütunlu (struct-of-arrays) özeti
+
+    info_dict['formats'] içindeki her format için tek satır; sütunlar paralel
+    listelerdir. yt-dlp formatları kötüden iyiye sıraladığı için satır sırası
+    korunur ve "en iyi" seçimler sondan yapılır. Tamamı JSON'a yazılabilir,
+    böylece metadata cache ve journal ile birlikte saklanır.
+    """
+    format_ids: List[str] = field(default_factory=list)
+    heights: List[int] = field(default_factory=list)
+    exts: List[str] = field(default_factory=list)
+    vcodecs: List[str] = field(default_factory=list)
+    acodecs: List[str] = field(default_factory=list)
+    tbrs: List[float] = field(default_factory=list)          # Toplam bitrate (kbit/s)
+    filesizes: List[int] = field(default_factory=list)       # Kesin ya da yaklaşık boyut (0 = bilinmiyor)
+
+    @classmethod
+    def from_formats(cls, formats) -> "FormatTable":
+        table = cls()
+        for f in formats or ():
+            # "none" = stream yok; bilinmeyen codec ("") yt-dlp'deki gibi var sayılır
+            vcodec = f.get('vcodec') or ''
+            acodec = f.get('acodec') or ''
+            if vcodec == 'none' and acodec == 'none':
+                continue  # storyboard / görsel formatlar
+            table.format_ids.append(str(f.get('format_id')))
+            table.heights.append(int(f.get('height') or 0))
+            table.exts.append(f.get('ext') or '')
+            table.vcodecs.append(vcodec)
+            table.acodecs.append(acodec)
+            table.tbrs.append(float(f.get('tbr') or 0))
+            table.filesizes.append(int(f.get('filesize') or f.get('filesize_approx') or 0))
+        return table
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> "FormatTable":
+        if not data:
+            return cls()
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: list(v) for k, v in data.items() if k in known})
+
+    def __len__(self) -> int:
+        return len(self.format_ids)
+
+    def heights_available(self) -> set:
+        return {h for h in self.heights if h}
+
+    def _best(self, predicate) -> Optional[int]:
+        for i in range(len(self.format_ids) - 1, -1, -1):
+            if predicate(i):
+                return i
+        return None
+
+    def select(self, resolution) -> Optional[FormatChoice]:
+        """Downloader'ın format seçimini tablo üzerinde önceden yap
+
+        `bestvideo[height<=R][ext=mp4]+bestaudio[ext=m4a]/best[height<=R][ext=mp4]/best`
+        ile aynı sırayla dener; tablo boşsa None döner.
+        """
+        if not self.format_ids:
+            return None
+        limit = int(resolution)
+        video_only = lambda i: self.acodecs[i] == 'none' and self.vcodecs[i] != 'none'
+        audio_only = lambda i: self.vcodecs[i] == 'none' and self.acodecs[i] != 'none'
+        muxed = lambda i: self.vcodecs[i] != 'none' and self.acodecs[i] != 'none'
+
+        video = self._best(lambda i: video_only(i) and 0 < self.heights[i] <= limit and self.exts[i] == 'mp4')
+        audio = self._best(lambda i: audio_only(i) and self.exts[i] == 'm4a')
+        if video is not None and audio is not None:
+            picked = [video, audio]
+        else:
+            single = self._best(lambda i: muxed(i) and 0 < self.heights[i] <= limit and self.exts[i] == 'mp4')
+            if single is None:
+                single = self._best(muxed)
+            if single is None:
+                return None
+            picked = [single]
+
+        sizes = [self.filesizes[i] for i in picked]
+        return FormatChoice(
+            format_id="+".join(self.format_ids[i] for i in picked),
+            filesize=sum(sizes) if all(sizes) else 0,
+            height=self.heights[picked[0]],
+        )
+
+    def filesize_for(self, resolution) -> int:
+        choice = self.select(resolution)
+        return choice.filesize if choice else 0
@@ -0,0 +1,224 @@
+import atexit
+import json
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .app_paths import app_data_path
+from .video_info import VideoInfo
+from .resume import ResumeState
+
+
+@dataclass
+class JournalEntry:
+    """Journal'dan okunan tek bir kuyruk kaydı"""
+    video_id: str
+    info: VideoInfo
+    resolution: str
+    save_path: str
+    status: str
+    downloaded: int = 0
+    total: int = 0
+    error: str = ""
+    resume: Optional[ResumeState] = None
+
+
+class DownloadJournal:
+    """İndirme kuyruğu için kalıcı, çökme-güvenli günlük (SQLite WAL)
+
+    Olaylar (add/start/progress/resume/complete/cancel/error/remove) event loop'u
+    bloklamadan bir kuyruğa atılır; arka plandaki yazıcı thread bunları
+    toplu transaction'lar halinde diske yazar. Aynı video için birikmiş
+    progress olaylarından sadece sonuncusu yazılır.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            video_id   TEXT PRIMARY KEY,
+            seq        INTEGER NOT NULL,
+            info       TEXT NOT NULL,
+            resolution TEXT NOT NULL,
+            save_path  TEXT NOT NULL,
+            status     TEXT NOT NULL,
+            downloaded INTEGER NOT NULL DEFAULT 0,
+            total      INTEGER NOT NULL DEFAULT 0,
+            error      TEXT NOT NULL DEFAULT '',
+            resume     TEXT NOT NULL DEFAULT '',
+            updated_at REAL NOT NULL
+        )
+    """
+
+    def __init__(self, path: Optional[str] = None, flush_interval: float = 0.5):
+        self.path = path or app_data_path("queue_journal.db")
+        self.flush_interval = flush_interval
+        self._events = queue.SimpleQueue()
+        self._closed = False
+
+        # Tabloyu senkron oluştur ki load() hemen çağrılabilsin
+        # `with conn` sadece commit eder; bağlantıyı closing() kapatır
+        with closing(self._connect()) as conn, conn:
+            conn.execute(self.SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}
+            if "resume" not in columns:
+                conn.execute("ALTER TABLE tasks ADD COLUMN resume TEXT NOT NULL DEFAULT ''")
+
+        self._thread = threading.Thread(target=self._writer_loop, name="journal-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # ============== OLAYLAR (event loop'tan çağrılır, bloklamaz) ==============
+
+    def record_add(self, video_id: str, info: VideoInfo, resolution: str, save_path: str):
+        self._events.put(("add", video_id, (json.dumps(info.to_dict()), resolution, save_path)))
+
+    def record_info(self, video_id: str, info: VideoInfo):
+        self._events.put(("info", video_id, json.dumps(info.to_dict())))
+
+    def record_settings(self, video_id: str, resolution: str, save_path: str):
+        self._events.put(("settings", video_id, (resolution, save_path)))
+
+    def record_start(self, video_id: str):
+        self._events.put(("status", video_id, ("downloading", "")))
+
+    def record_progress(self, video_id: str, downloaded: int, total: int):
+        self._events.put(("progress", video_id, (int(downloaded or 0), int(total or 0))))
+
+    def record_complete(self, video_id: str):
+        self._events.put(("status", video_id, ("completed", "")))
+
+    def record_cancel(self, video_id: str):
+        self._events.put(("status", video_id, ("cancelled", "")))
+
+    def record_error(self, video_id: str, message: str):
+        self._events.put(("status", video_id, ("error", message)))
+
+    def record_resume(self, video_id: str, state: Optional[ResumeState]):
+        """Yarım indirmenin devam bilgisi (None = temizle)"""
+        self._events.put(("resume", video_id, json.dumps(state.to_dict()) if state else ""))
+
+    def record_remove(self, video_id: str):
+        self._events.put(("remove", video_id, None))
+
+    # ============== OKUMA ==============
+
+    def load(self) -> List[JournalEntry]:
+        """Tüm kuyruğu tek sorguda, eklenme sırasına göre oku"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT video_id, info, resolution, save_path, status, downloaded, total, error, resume "
+                "FROM tasks ORDER BY seq"
+            ).fetchall()
+
+        entries = []
+        for video_id, info, resolution, save_path, status, downloaded, total, error, resume in rows:
+            try:
+                video_info = VideoInfo.from_dict(json.loads(info))
+                resume_state = ResumeState.from_dict(json.loads(resume)) if resume else None
+            except (ValueError, TypeError):
+                continue
+            entries.append(JournalEntry(video_id, video_info, resolution, save_path, status, downloaded, total, error, resume_state))
+        return entries
+
+    # ============== YAZICI THREAD ==============
+
+    def _writer_loop(self):
+        conn = self._connect()
+        try:
+            while True:
+                try:
+                    first = self._events.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    if self._closed:
+                        break
+                    continue
+
+                if first is None:
+                    self._write_batch(conn, self._drain([]))
+                    break
+
+                # Kısa bir süre bekleyip gelen olayları aynı batch'e topla
+                time.sleep(self.flush_interval)
+                batch = self._drain([first])
+                stop = batch and batch[-1] is None
+                self._write_batch(conn, [e for e in batch if e is not None])
+                if stop:
+                    break
+        finally:
+            conn.close()
+
+    def _drain(self, batch):
+        while True:
+            try:
+                batch.append(self._events.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _write_batch(self, conn, batch):
+        if not batch:
+            return
+
+        # Her video için sadece son progress değerini tut
+        last_progress = {}
+        for i, (kind, video_id, _) in enumerate(batch):
+            if kind == "progress":
+                last_progress[video_id] = i
+
+        now = time.time()
+        try:
+            with conn:
+                for i, (kind, video_id, data) in enumerate(batch):
+                    if kind == "add":
+                        info, resolution, save_path = data
+                        conn.execute(
+                            "INSERT OR REPLACE INTO tasks "
+                            "(video_id, seq, info, resolution, save_path, status, updated_at) "
+                            "VALUES (?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM tasks), ?, ?, ?, 'waiting', ?)",
+                            (video_id, info, resolution, save_path, now),
+                        )
+                    elif kind == "info":
+                        conn.execute(
+                            "UPDATE tasks SET info = ?, updated_at = ? WHERE video_id = ?",
+                            (data, now, video_id),
+                        )
+                    elif kind == "settings":
+                        conn.execute(
+                            "UPDATE tasks SET resolution = ?, save_path = ?, updated_at = ? WHERE video_id = ?",
+                            (*data, now, video_id),
+                        )
+                    elif kind == "status":
+                        conn.execute(
+                            "UPDATE tasks SET status = ?, error = ?, updated_at = ? WHERE video_id = ?",
+                            (*data, now, video_id),
+                        )
+                    elif kind == "resume":
+                        conn.execute(
+                            "UPDATE tasks SET resume = ?, updated_at = ? WHERE video_id = ?",
+                            (data, now, video_id),
+                        )
+                    elif kind == "progress" and last_progress.get(video_id) == i:
+                        conn.execute(
+                            "UPDATE tasks SET downloaded = ?, total = ?, updated_at = ? WHERE video_id = ?",
+                            (*data, now, video_id),
+                        )
+                    elif kind == "remove":
+                        conn.execute("DELETE FROM tasks WHERE video_id = ?", (video_id,))
+        except sqlite3.Error as e:
+            print(f"❌ Journal yazma hatası: {e}")
+
+    def close(self):
+        """Bekleyen olayları yaz ve yazıcı thread'i durdur"""
+        if self._closed:
+            return
+        self._closed = True
+        self._events.put(None)
+        self._thread.join(timeout=5)
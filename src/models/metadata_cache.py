@@ -0,0 +1,190 @@
+import asyncio
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from .video_info import VideoInfo
+
+
+class MetadataCache:
+    """get_video_info önünde iki katmanlı cache
+
+    1. katman: süreç içi LRU (OrderedDict), anahtar kanonik video ID
+    2. katman: opsiyonel SQLite disk deposu (disk_path verilirse)
+
+    Her kaydın bir TTL'i vardır; süresi dolan kayıt miss sayılır ve silinir.
+
+    Ayrıca indirmenin tekrar extraction yapmaması için yt-dlp'nin ham info'su
+    JSON olarak (sadece bellekte, en fazla max_raw_entries adet) tutulur; imzalı
+    stream URL'leri saatler içinde geçersizleştiği için diske yazılmaz.
+    """
+
+    def __init__(self, ttl: float = 6 * 3600, max_entries: int = 512,
+                 disk_path: Optional[str] = None, disk_max_entries: int = 5000,
+                 max_raw_entries: int = 32):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        self.max_raw_entries = max_raw_entries
+
+        self._memory: "OrderedDict[str, tuple[float, VideoInfo]]" = OrderedDict()
+        self._raw: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._raw_lock = threading.Lock()  # extraction / indirme thread'lerinden erişilir
+        self._disk_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None  # Disk deposunun tek bağlantısı (_disk_lock altında)
+
+        # İstatistikler
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.disk_path:
+            with self._disk_lock, self._connection() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS metadata ("
+                    "video_id TEXT PRIMARY KEY, fetched_at REAL NOT NULL, info TEXT NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS metadata_fetched_at ON metadata(fetched_at)")
+            atexit.register(self.close)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Disk deposunun bağlantısı; ilk kullanımda açılır, thread'ler _disk_lock ile paylaşır
+
+        `with conn:` bloğu sadece commit/rollback yapar, bağlantıyı kapatmaz;
+        bu yüzden her işlemde yeni bağlantı açılmaz, close() ile bir kez kapatılır.
+        """
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.disk_path, timeout=10, check_same_thread=False)  # type: ignore
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        return self._conn
+
+    def close(self):
+        with self._disk_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ============== BELLEK KATMANI (senkron) ==============
+
+    def get(self, video_id: str) -> Optional[VideoInfo]:
+        """Sadece bellekten oku; disk'e gitmez"""
+        item = self._memory.get(video_id)
+        if item is None:
+            return None
+        fetched_at, info = item
+        if time.time() - fetched_at > self.ttl:
+            del self._memory[video_id]
+            return None
+        self._memory.move_to_end(video_id)
+        return info
+
+    def _put_memory(self, video_id: str, info: VideoInfo, fetched_at: float):
+        self._memory[video_id] = (fetched_at, info)
+        self._memory.move_to_end(video_id)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # ============== HAM INFO (senkron, sadece bellek) ==============
+
+    def put_raw(self, video_id: str, info: dict):
+        """yt-dlp'nin (sanitize edilmiş) info'sunu serileştirip sakla"""
+        try:
+            data = json.dumps(info)
+        except (TypeError, ValueError):
+            return
+        with self._raw_lock:
+            self._raw[video_id] = (time.time(), data)
+            self._raw.move_to_end(video_id)
+            while len(self._raw) > self.max_raw_entries:
+                self._raw.popitem(last=False)
+
+    def get_raw(self, video_id: str) -> Optional[dict]:
+        """Saklanan ham info'nun yeni bir kopyası (yt-dlp üzerinde değişiklik yapar)"""
+        with self._raw_lock:
+            item = self._raw.get(video_id)
+            if item is not None and time.time() - item[0] > self.ttl:
+                del self._raw[video_id]
+                item = None
+        return json.loads(item[1]) if item is not None else None
+
+    # ============== İKİ KATMAN (async) ==============
+
+    async def aget(self, video_id: str) -> Optional[VideoInfo]:
+        """Önce bellek, sonra disk; hit/miss sayaçlarını günceller"""
+        info = self.get(video_id)
+        if info is not None:
+            self.hits += 1
+            return info
+
+        if self.disk_path:
+            item = await asyncio.to_thread(self._disk_get, video_id)
+            if item is not None:
+                fetched_at, info = item
+                self._put_memory(video_id, info, fetched_at)
+                self.disk_hits += 1
+                return info
+
+        self.misses += 1
+        return None
+
+    async def aput(self, video_id: str, info: VideoInfo):
+        fetched_at = time.time()
+        self._put_memory(video_id, info, fetched_at)
+        if self.disk_path:
+            await asyncio.to_thread(self._disk_put, video_id, info, fetched_at)
+
+    def invalidate(self, video_id: str):
+        self._memory.pop(video_id, None)
+        with self._raw_lock:
+            self._raw.pop(video_id, None)
+        if self.disk_path:
+            with self._disk_lock, self._connection() as conn:
+                conn.execute("DELETE FROM metadata WHERE video_id = ?", (video_id,))
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_ratio': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            'memory_entries': len(self._memory),
+            'raw_entries': len(self._raw),
+        }
+
+    # ============== DİSK KATMANI (thread'de çalışır) ==============
+
+    def _disk_get(self, video_id: str):
+        with self._disk_lock, self._connection() as conn:
+            row = conn.execute(
+                "SELECT fetched_at, info FROM metadata WHERE video_id = ?", (video_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            fetched_at, info = row
+            if time.time() - fetched_at > self.ttl:
+                conn.execute("DELETE FROM metadata WHERE video_id = ?", (video_id,))
+                return None
+        try:
+            return fetched_at, VideoInfo.from_dict(json.loads(info))
+        except (ValueError, TypeError):
+            return None
+
+    def _disk_put(self, video_id: str, info: VideoInfo, fetched_at: float):
+        with self._disk_lock, self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO metadata (video_id, fetched_at, info) VALUES (?, ?, ?)",
+                (video_id, fetched_at, json.dumps(info.to_dict())),
+            )
+            # Süresi dolanları ve boyut sınırını aşan en eski kayıtları sil
+            conn.execute("DELETE FROM metadata WHERE fetched_at < ?", (time.time() - self.ttl,))
+            conn.execute(
+                "DELETE FROM metadata WHERE video_id IN ("
+                "SELECT video_id FROM metadata ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)",
+                (self.disk_max_entries,),
+            )
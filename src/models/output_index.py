@@ -0,0 +1,93 @@
+import asyncio
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from .app_paths import app_data_path
+
+
+class OutputIndex:
+    """Tamamlanmış indirmelerin kalıcı dizini: (kanonik video ID, format seçimi) -> çıktı dosyası
+
+    Aynı video farklı URL biçimleriyle (youtu.be, shorts, embed...) tekrar
+    eklense bile kanonik ID üzerinden bulunur. Kayıt ancak dosya hâlâ diskte ve
+    boyutu değişmemişse geçerlidir; aksi halde okunurken silinir.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or app_data_path("output_index.db")
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None  # Tek bağlantı (_lock altında)
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS outputs ("
+                "video_id TEXT NOT NULL, selection TEXT NOT NULL, filepath TEXT NOT NULL, "
+                "size INTEGER NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (video_id, selection))"
+            )
+        atexit.register(self.close)
+
+    def _connection(self) -> sqlite3.Connection:
+        """İlk kullanımda açılan, thread'lerin _lock ile paylaştığı bağlantı
+
+        `with conn:` sadece commit/rollback yapar; bağlantı close() ile bir kez kapatılır.
+        """
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def selection_key(resolution: str) -> str:
+        """Format seçiminin anahtarı (downloader'ın çözünürlüğe göre kurduğu mp4 seçimi)"""
+        return f"{resolution}p.mp4"
+
+    # ============== SENKRON (thread'de çalışır) ==============
+
+    def lookup(self, video_id: str, selection: str) -> Optional[str]:
+        with self._lock, self._connection() as conn:
+            row = conn.execute(
+                "SELECT filepath, size FROM outputs WHERE video_id = ? AND selection = ?",
+                (video_id, selection),
+            ).fetchone()
+            if row is None:
+                return None
+            filepath, size = row
+            try:
+                if os.path.getsize(filepath) == size:
+                    return filepath
+            except OSError:
+                pass
+            # Dosya silinmiş / değişmiş: kayıt artık geçersiz
+            conn.execute("DELETE FROM outputs WHERE video_id = ? AND selection = ?", (video_id, selection))
+            return None
+
+    def record(self, video_id: str, selection: str, filepath: str):
+        filepath = os.path.abspath(filepath)
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO outputs (video_id, selection, filepath, size, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (video_id, selection, filepath, os.path.getsize(filepath), time.time()),
+            )
+
+    def forget(self, video_id: str, selection: str):
+        with self._lock, self._connection() as conn:
+            conn.execute("DELETE FROM outputs WHERE video_id = ? AND selection = ?", (video_id, selection))
+
+    # ============== ASYNC ==============
+
+    async def alookup(self, video_id: str, selection: str) -> Optional[str]:
+        return await asyncio.to_thread(self.lookup, video_id, selection)
+
+    async def arecord(self, video_id: str, selection: str, filepath: str):
+        await asyncio.to_thread(self.record, video_id, selection, filepath)
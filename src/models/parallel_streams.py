@@ -0,0 +1,176 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from yt_dlp.downloader import get_suitable_downloader
+from yt_dlp.postprocessor import FFmpegMergerPP
+from yt_dlp.utils import prepend_extension
+
+# YouTube'un HTTPS formatlarını aynı format ID'leriyle range'li DASH parçalarına çevirir;
+# get_video_info da bununla çıkarır ki cache'lenen ham info fan-out'a hazır olsun
+FANOUT_EXTRACTOR_ARGS = {'youtube': {'formats': ['dashy']}}
+
+
+def stream_jobs(ydl, info: dict) -> List[Tuple[str, dict]]:
+    """Merge edilecek stream'lerin (dosya adı, stream info) listesi
+
+    Dosya adları yt-dlp'nin process_info'da kurduklarıyla aynıdır
+    ("<ad>.f137.mp4", "<ad>.f140.m4a"); böylece önceden inen stream'ler yt-dlp
+    tarafından "zaten indirilmiş" sayılır ve .part'lardan devam da aynı dosyalarla
+    çalışır. Ön indirme gerekmiyorsa (tek dosya, yt-dlp zaten birlikte indiriyor,
+    çıktı hazır veya merge yapılamayacak) boş liste döner.
+    """
+    requested = info.get('requested_formats') or []
+    if len(requested) < 2 or info.get('_type', 'video') != 'video':
+        return []
+    # yt-dlp'nin kendi downloader'ı stream'leri birlikte indirebiliyorsa (ffmpeg, dash generator) ona bırak
+    if get_suitable_downloader(info, ydl.params) is not None:
+        return []
+    if not FFmpegMergerPP(ydl).available and not ydl.params.get('ignoreerrors'):
+        return []
+
+    ext = info['ext']
+    paths = []
+    for filename in (ydl.prepare_filename(info), ydl.prepare_filename(info, 'temp')):
+        if filename == '-':
+            return []
+        base, real_ext = os.path.splitext(filename)
+        paths.append(base if real_ext[1:] == ext else filename)
+    if any(os.path.exists(f"{base}.{ext}") for base in paths):
+        return []
+
+    jobs = []
+    for f in requested:
+        stream_info = dict(info)
+        del stream_info['requested_formats']
+        stream_info.update(f)
+        stream_ext = stream_info['ext']
+        filename = prepend_extension(f"{paths[1]}.{stream_ext}", f"f{f['format_id']}", stream_ext)
+        jobs.append((filename, stream_info))
+    return jobs
+
+
+_EXPIRE_PATTERN = re.compile(r"[?&/]expire[=/](\d+)")
+
+
+def stream_urls_expire_at(info: dict) -> Optional[float]:
+    """İmzalı stream URL'lerinin en erken son geçerlilik zamanı (YouTube'un "expire=" parametresi)
+
+    URL'lerde böyle bir parametre yoksa None döner (süresiz sayılır).
+    """
+    expires = []
+    for f in info.get('formats') or ():
+        for url in (f.get('url'), f.get('manifest_url'), f.get('fragment_base_url')):
+            match = _EXPIRE_PATTERN.search(url or "")
+            if match:
+                expires.append(int(match.group(1)))
+    return min(expires) if expires else None
+
+
+def is_info_fresh(info: dict, margin: float = 30 * 60) -> bool:
+    """Önceden çıkarılmış info ile indirmeye başlamak güvenli mi?
+
+    margin: URL'lerin en az bu kadar süre daha geçerli olması gerekir (uzun indirmeler için pay).
+    """
+    expire_at = stream_urls_expire_at(info)
+    return expire_at is None or expire_at - time.time() > margin
+
+
+def _is_forbidden(error: BaseException) -> bool:
+    # Süresi dolmuş / başka IP'ye imzalanmış URL'ler 403 döner
+    return "HTTP Error 403" in str(error)
+
+
+def split_connections(budget: int, streams: int) -> Tuple[int, int]:
+    """İndirmenin bağlantı bütçesini stream'lere böl: (aynı anda inen stream, stream başına bağlantı)
+
+    Toplam hiçbir zaman bütçeyi aşmaz: tek bağlantılık bütçede stream'ler yt-dlp'deki
+    gibi sırayla iner. Bölünemeyen artan bağlantılar kullanılmaz.
+    """
+    parallel = max(1, min(streams, budget))
+    return parallel, max(1, budget // parallel)
+
+
+def download_url(ydl, url: str, on_formats: Optional[Callable[[list], None]] = None, info: Optional[dict] = None,
+                 on_connections_closed: Optional[Callable[[int], None]] = None):
+    """ydl.download([url]) gibi, ama video ve ses stream'lerini aynı anda indirir
+
+    yt-dlp ayrı DASH stream'lerini (ör. 137+140) sırayla indirir. Burada bilgi
+    bir kez çıkarılır, stream'ler kendi thread'lerinde paralel indirilir ve
+    ardından yt-dlp'nin normal akışı çalıştırılır: stream'leri diskte hazır
+    bulduğu için indirmeyi atlar, merge'e ve staging'den taşımaya geçer.
+
+    info: daha önce (get_video_info'da) çıkarılmış ham info. Verilirse sayfa
+    tekrar çıkarılmaz, sadece format seçimi yapılır; URL'lerin süresi dolmak
+    üzereyse veya indirme 403 alırsa bir kez baştan çıkarılarak tekrar denenir
+    (.part dosyalarından devam edilir).
+    on_formats(requested_formats): seçilen stream'ler belli olunca, indirme başlamadan çağrılır.
+    on_connections_closed(count): stream thread'lerinden çağrılır; bağlantı bütçesinin
+    (params['concurrent_fragment_downloads']) `count` kadarı artık kullanılmıyor.
+    """
+    if info is not None and not is_info_fresh(info):
+        print("⌛ Önceden çıkarılmış bilginin URL'lerinin süresi dolmak üzere, yeniden çıkarılıyor")
+        info = None
+
+    if info is None:
+        _download_info(ydl, url, ydl.extract_info(url, download=False), on_formats, on_connections_closed)
+        return
+
+    try:
+        _download_info(ydl, url, ydl.process_ie_result(info, download=False), on_formats, on_connections_closed)
+    except Exception as e:
+        if not _is_forbidden(e):
+            raise
+        print("⌛ Stream URL'leri reddedildi (403), yeniden çıkarılıyor")
+        _download_info(ydl, url, ydl.extract_info(url, download=False), on_formats, on_connections_closed)
+
+
+def _download_info(ydl, url: str, info: dict, on_formats, on_connections_closed=None):
+    if info.get('_type', 'video') != 'video':
+        ydl.download([url])
+        return
+
+    jobs = stream_jobs(ydl, info)
+    if jobs:
+        if on_formats:
+            on_formats(info['requested_formats'])
+        for filename, _ in jobs:
+            os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+
+        # Bütçe bütün stream'ler için: her stream'in fragment bağlantısı payı kadar
+        budget = ydl.params.get('concurrent_fragment_downloads') or 1
+        parallel, per_stream = split_connections(budget, len(jobs))
+        if on_connections_closed and budget > parallel * per_stream:
+            on_connections_closed(budget - parallel * per_stream)
+
+        started = [0]
+        lock = threading.Lock()
+
+        def download_stream(filename, stream_info):
+            with lock:
+                started[0] += 1
+            try:
+                ydl.dl(filename, stream_info)
+            finally:
+                # Sırada başlamamış stream kalmadıysa bu thread'in bağlantıları bir daha açılmaz
+                with lock:
+                    idle = started[0] >= len(jobs)
+                if idle and on_connections_closed:
+                    on_connections_closed(per_stream)
+
+        ydl.params['concurrent_fragment_downloads'] = per_stream
+        try:
+            with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="stream") as pool:
+                futures = [pool.submit(download_stream, filename, stream_info) for filename, stream_info in jobs]
+                # İptal bütün stream'lerin hook'larında birlikte tetiklenir; hata diğer stream'ler bitince yükselir
+                for future in futures:
+                    future.result()
+        finally:
+            ydl.params['concurrent_fragment_downloads'] = budget
+    elif on_formats and info.get('requested_formats'):
+        on_formats(info['requested_formats'])
+
+    ydl.process_ie_result(info, download=True)
@@ -0,0 +1,62 @@
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+from .validators import is_youtube_link_checker, extract_video_id, get_video_info
+
+
+class MetadataPrefetcher:
+    """Toplu yapıştırılan URL listeleri için sınırlı eşzamanlı metadata çözücü
+
+    Extraction'lar kendi ThreadPoolExecutor'ında çalışır; böylece
+    RobustDownloader.executor'daki indirme slotlarıyla yarışmaz.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="metadata")
+
+    @staticmethod
+    def parse_urls(text: str) -> Tuple[List[str], List[str]]:
+        """Metni URL'lere ayır, doğrula ve video ID'ye göre tekilleştir
+
+        Returns:
+            (geçerli URL'ler - ilk görülme sırasıyla, geçersiz satırlar)
+        """
+        valid, invalid = [], []
+        seen = set()
+        for token in re.split(r"[\s,;]+", text or ""):
+            if not token:
+                continue
+            if not is_youtube_link_checker(token):
+                invalid.append(token)
+                continue
+            video_id = extract_video_id(token) or token
+            if video_id in seen:
+                continue
+            seen.add(video_id)
+            valid.append(token)
+        return valid, invalid
+
+    async def resolve(self, urls: List[str]):
+        """URL'leri paralel çöz; her sonuç hazır olduğu anda (url, info, hata) üret"""
+        limiter = asyncio.Semaphore(self.max_workers)
+
+        async def resolve_one(url):
+            async with limiter:
+                try:
+                    return url, await get_video_info(url, executor=self.executor), None
+                except Exception as e:
+                    return url, None, e
+
+        tasks = [asyncio.create_task(resolve_one(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
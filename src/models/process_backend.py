@@ -0,0 +1,191 @@
+import multiprocessing
+import queue
+import time
+from typing import Callable, Optional
+
+import psutil
+
+# Worker'lar fork yerine spawn ile başlar: GUI süreci thread'li olduğu için fork güvenli değil
+_ctx = multiprocessing.get_context("spawn")
+
+
+def _slim_progress(d: dict) -> dict:
+    """Progress hook verisinin IPC'ye gereken kısmı (info_dict'in tamamı pickle edilmez)"""
+    info = d.get('info_dict') or {}
+    slim_info = {'format_id': info.get('format_id')}
+    if info.get('requested_formats'):
+        slim_info['requested_formats'] = _slim_formats(info['requested_formats'])
+    return {
+        'status': d.get('status'),
+        'downloaded_bytes': d.get('downloaded_bytes'),
+        'total_bytes': d.get('total_bytes'),
+        'total_bytes_estimate': d.get('total_bytes_estimate'),
+        'speed': d.get('speed'),
+        'eta': d.get('eta'),
+        'filename': d.get('filename'),
+        'info_dict': slim_info,
+    }
+
+
+def _slim_formats(formats) -> list:
+    return [
+        {'format_id': f.get('format_id'), 'filesize': f.get('filesize'), 'filesize_approx': f.get('filesize_approx')}
+        for f in formats or ()
+    ]
+
+
+def _slim_postprocessor(d: dict) -> dict:
+    info = d.get('info_dict') or {}
+    return {
+        'status': d.get('status'),
+        'postprocessor': d.get('postprocessor'),
+        'info_dict': {'filepath': info.get('filepath'), '__finaldir': info.get('__finaldir')},
+    }
+
+
+def worker_main(url: str, opts: dict, messages, rate, min_interval: float = 0.1, info: Optional[dict] = None):
+    """Worker süreçte çalışır: indirir, progress'i kuyruğa yazar, sonucu ('done', ...) ile bildirir
+
+    rate: paylaşılan hız sınırı (bytes/sn, 0 = sınırsız); yt-dlp her blokta
+    params['ratelimit']'i okuduğu için değişiklik indirme sürerken uygulanır.
+    info: önceden çıkarılmış ham info (verilirse sayfa worker'da tekrar çıkarılmaz).
+    """
+    import yt_dlp
+    from .parallel_streams import download_url
+
+    last = {'rate': None}
+    last_sent = {}
+    active = set()
+
+    def on_progress(d):
+        # ratelimit her stream'e ayrı uygulanır: paralel inen stream'ler payı bölüşür
+        filename = d.get('filename')
+        if d.get('status') == 'downloading':
+            active.add(filename)
+        else:
+            active.discard(filename)
+        limit = rate.value / max(1, len(active)) if rate.value else None
+        if limit != last['rate']:
+            ydl.params['ratelimit'] = limit
+            last['rate'] = limit
+
+        # Blok başına değil, her stream için en fazla min_interval'da bir (durum değişimi hariç)
+        now = time.monotonic()
+        if d.get('status') == 'downloading' and now - last_sent.get(filename, 0.0) < min_interval:
+            return
+        last_sent[filename] = now
+        messages.put(("progress", _slim_progress(d)))
+
+    def on_postprocess(d):
+        messages.put(("postprocess", _slim_postprocessor(d)))
+
+    try:
+        with yt_dlp.YoutubeDL(opts) as ydl:  # type: ignore
+            ydl.add_progress_hook(on_progress)
+            ydl.add_postprocessor_hook(on_postprocess)
+            download_url(ydl, url, on_formats=lambda formats: messages.put(("formats", _slim_formats(formats))), info=info,
+                         on_connections_closed=lambda count: messages.put(("connections", count)))
+        messages.put(("done", "Success"))
+    except BaseException as e:
+        messages.put(("done", f"Error: {e}"))
+
+
+def _tree_rss(proc: psutil.Process) -> int:
+    """Worker ve çocuklarının (ffmpeg) toplam RSS'i"""
+    total = 0
+    for p in [proc, *proc.children(recursive=True)]:
+        try:
+            total += p.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return total
+
+
+def kill_tree(proc: psutil.Process):
+    """Worker'ı çocuklarıyla birlikte öldür (thread'li backend'in aksine gerçekten durur)"""
+    try:
+        procs = [*proc.children(recursive=True), proc]
+    except psutil.NoSuchProcess:
+        return
+    for p in procs:
+        try:
+            p.kill()
+        except psutil.NoSuchProcess:
+            pass
+    psutil.wait_procs(procs, timeout=3)
+
+
+def run_in_process(url: str, opts: dict,
+                   on_progress: Callable[[dict], None],
+                   on_postprocess: Callable[[dict], None],
+                   should_cancel: Callable[[], bool],
+                   share_rate: Callable[[], float],
+                   memory_limit: int = 0,
+                   on_start: Optional[Callable[[psutil.Process], None]] = None,
+                   on_formats: Optional[Callable[[list], None]] = None,
+                   on_connections_closed: Optional[Callable[[int], None]] = None,
+                   info: Optional[dict] = None,
+                   poll_interval: float = 0.2) -> str:
+    """İndirmeyi ayrı bir süreçte çalıştır ve bitene kadar IPC progress'ini pompala
+
+    Çağıran thread'de bloklar (downloader executor'ında çalıştırılır).
+    memory_limit: worker ağacının RSS sınırı (byte, 0 = sınırsız); aşılırsa öldürülür.
+    Dönüş değeri thread backend'iyle aynıdır: "Success", "Cancelled" veya "Error: ...".
+    """
+    messages = _ctx.Queue()
+    rate = _ctx.Value('d', 0.0, lock=False)
+    worker = _ctx.Process(target=worker_main, args=(url, opts, messages, rate), kwargs={'info': info}, daemon=True)
+    worker.start()
+    proc = psutil.Process(worker.pid)
+    if on_start:
+        on_start(proc)
+
+    result = None
+    next_memory_check = 0.0
+    try:
+        while result is None:
+            if should_cancel():
+                kill_tree(proc)
+                return "Cancelled"
+
+            try:
+                kind, payload = messages.get(timeout=poll_interval)
+            except queue.Empty:
+                if not worker.is_alive():
+                    # Çıkmadan önce yazdıkları kuyruğa ulaşmış olmalı; son bir kez bak
+                    try:
+                        kind, payload = messages.get(timeout=0.5)
+                    except queue.Empty:
+                        return f"Error: worker exited with code {worker.exitcode}"
+                else:
+                    kind = None
+
+            if kind == "progress":
+                on_progress(payload)
+                rate.value = share_rate()
+            elif kind == "postprocess":
+                on_postprocess(payload)
+            elif kind == "formats":
+                if on_formats:
+                    on_formats(payload)
+            elif kind == "connections":
+                if on_connections_closed:
+                    on_connections_closed(payload)
+            elif kind == "done":
+                result = payload
+
+            now = time.monotonic()
+            if memory_limit and now >= next_memory_check:
+                next_memory_check = now + 1.0
+                rss = _tree_rss(proc)
+                if rss > memory_limit:
+                    kill_tree(proc)
+                    return f"Error: memory limit exceeded ({rss / 1024 / 1024:.0f} MB)"
+        return result
+    finally:
+        if worker.is_alive():
+            worker.join(timeout=2)
+            if worker.is_alive():
+                kill_tree(proc)
+        messages.close()
+        messages.cancel_join_thread()
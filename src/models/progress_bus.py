@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+
+class ProgressBus:
+    """İndirme thread'lerinden gelen progress kayıtlarını event loop'a taşıyan tek akış
+
+    publish() herhangi bir thread'den çağrılabilir: kayıt bir ring buffer'a
+    eklenir ve (zaten planlanmamışsa) call_soon_threadsafe ile tek bir drain
+    planlanır. Drain sırasında aynı video için birikmiş kayıtlardan sadece
+    sonuncusu abonelere iletilir; böylece N adet polling task'ına gerek kalmaz.
+    """
+
+    def __init__(self, capacity: int = 4096, min_interval: float = 0.1):
+        self.min_interval = min_interval
+        self._ring = deque(maxlen=capacity)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._scheduled = False
+        self._schedule_lock = threading.Lock()
+        self._last_drain = 0.0
+
+        self._subscribers = []
+        self._video_subscribers = {}
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """Kayıtların teslim edileceği event loop'u ayarla"""
+        self._loop = loop
+
+    # ============== YAYINLAMA (thread-safe) ==============
+
+    def publish(self, video_id: str, record):
+        self._ring.append((video_id, record))
+
+        with self._schedule_lock:
+            if self._scheduled or self._loop is None:
+                return
+            self._scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(self._schedule_drain)
+        except RuntimeError:
+            # Loop kapanmış
+            with self._schedule_lock:
+                self._scheduled = False
+
+    def _schedule_drain(self):
+        wait = self._last_drain + self.min_interval - time.monotonic()
+        if wait > 0:
+            self._loop.call_later(wait, self._drain)  # type: ignore
+        else:
+            self._drain()
+
+    def _drain(self):
+        with self._schedule_lock:
+            self._scheduled = False
+        self._last_drain = time.monotonic()
+
+        latest = {}
+        while self._ring:
+            try:
+                video_id, record = self._ring.popleft()
+            except IndexError:
+                break
+            latest[video_id] = record
+
+        for video_id, record in latest.items():
+            for callback in self._video_subscribers.get(video_id, ()):
+                self._dispatch(callback, record)
+            for callback in self._subscribers:
+                self._dispatch(callback, video_id, record)
+
+    @staticmethod
+    def _dispatch(callback, *args):
+        try:
+            callback(*args)
+        except Exception as e:
+            print(f"❌ Progress aboneliği hatası: {e}")
+
+    # ============== ABONELİK (event loop thread'inden) ==============
+
+    def subscribe(self, callback: Callable, video_id: Optional[str] = None) -> Callable[[], None]:
+        """Abone ol; aboneliği bitiren fonksiyonu döndürür
+
+        video_id verilirse callback(record), verilmezse tüm videolar için
+        callback(video_id, record) şeklinde çağrılır.
+        """
+        if video_id is None:
+            subscribers = self._subscribers
+        else:
+            subscribers = self._video_subscribers.setdefault(video_id, [])
+        subscribers.append(callback)
+
+        def unsubscribe():
+            try:
+                subscribers.remove(callback)
+            except ValueError:
+                pass
+            if video_id is not None and not subscribers:
+                self._video_subscribers.pop(video_id, None)
+
+        return unsubscribe
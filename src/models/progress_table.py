@@ -0,0 +1,184 @@
+import threading
+from array import array
+from typing import Optional
+
+
+class ProgressRecord:
+    """Tek bir indirmenin progress'i: ProgressTable satırına bakan, yeniden kullanılan görünüm
+
+    yt-dlp hook'u her çağrıldığında yeni dict oluşturmak yerine aynı kayıt
+    yerinde güncellenir; kayıt kendi verisini tutmaz, tablodaki dizilere bakar.
+    """
+
+    __slots__ = ('video_id', '_table', '_index')
+
+    status = 'downloading'
+
+    def __init__(self, video_id: str, table: "ProgressTable", index: int):
+        self.video_id = video_id
+        self._table = table
+        self._index = index
+
+    def update(self, downloaded, total, speed, eta):
+        t, i = self._table, self._index
+        t.downloaded[i] = downloaded or 0
+        t.total[i] = total or 0
+        t.speed[i] = speed or 0
+        t.eta[i] = eta or 0
+
+    @property
+    def downloaded(self) -> float:
+        return self._table.downloaded[self._index]
+
+    @property
+    def total(self) -> float:
+        return self._table.total[self._index]
+
+    @property
+    def speed(self) -> float:
+        return self._table.speed[self._index]
+
+    @property
+    def eta(self) -> float:
+        return self._table.eta[self._index]
+
+    @property
+    def percentage(self) -> float:
+        total = self.total
+        return (self.downloaded / total * 100) if total > 0 else 0
+
+    def get(self, key, default=None):
+        """Eski dict tabanlı tüketiciler için uyumluluk (record.get('speed'))"""
+        return getattr(self, key, default)
+
+    def as_dict(self) -> dict:
+        return {
+            'status': self.status,
+            'downloaded': self.downloaded,
+            'total': self.total,
+            'percentage': self.percentage,
+            'speed': self.speed,
+            'eta': self.eta,
+        }
+
+
+class StreamProgress:
+    """Bir indirmenin bileşen stream'lerinin (video + ses) progress'ini tek değere toplar
+
+    Stream'ler aynı anda ya da arka arkaya inse de yüzde geriye gitmez: toplam,
+    seçilen formatların boyutlarından (yoksa verilen tahminden) önceden
+    doldurulur; stream'lerin değişken toplam tahminleri sadece bu bilinmiyorsa
+    kullanılır. Hook'lar birden fazla indirme thread'inden gelebildiği için
+    güncelleme kilitlidir.
+    """
+
+    __slots__ = ('_streams', 'expected_total', '_exact', '_lock')
+
+    def __init__(self, expected_total: float = 0):
+        self._streams = {}
+        self.expected_total = expected_total or 0
+        self._exact = False
+        self._lock = threading.Lock()
+
+    def set_formats(self, formats):
+        """Seçilen formatların boyutları biliniyorsa toplamı onlarla sabitle"""
+        sizes = [f.get('filesize') or f.get('filesize_approx') or 0 for f in formats or ()]
+        if sizes and all(sizes):
+            self.expected_total = sum(sizes)
+            self._exact = True
+
+    def update(self, d: dict):
+        """yt-dlp progress verisini ekle; (indirilen, toplam, hız, eta) döndürür"""
+        if not self._exact:
+            self.set_formats((d.get('info_dict') or {}).get('requested_formats'))
+
+        done = d.get('status') == 'finished'
+        speed = 0.0 if done else (d.get('speed') or 0)
+        total = d.get('total_bytes') or d.get('total_bytes_estimate') or 0
+        # 0 byte da geçerli bir değer; byte sayısı gelmeyen 'finished' ise stream'in tamamı demek
+        downloaded = d.get('downloaded_bytes')
+        if downloaded is None:
+            downloaded = total if done else 0
+        with self._lock:
+            self._streams[d.get('filename')] = (downloaded, total, speed, done)
+            downloaded = sum(s[0] for s in self._streams.values())
+            known_total = sum(s[1] for s in self._streams.values())
+            speed = sum(s[2] for s in self._streams.values())
+
+        total = max(self.expected_total or known_total, downloaded)
+        eta = (total - downloaded) / speed if speed else d.get('eta')
+        return downloaded, total, speed, eta
+
+    def active_count(self) -> int:
+        """Başlamış ama henüz bitmemiş stream sayısı"""
+        with self._lock:
+            return sum(1 for s in self._streams.values() if not s[3])
+
+
+class ProgressTable:
+    """Aktif indirmelerin progress'i için struct-of-arrays tablo
+
+    Her sütun ayrı bir array('d'); satırlar video_id'ye göre slot olarak
+    dağıtılır ve boşalan slotlar yeniden kullanılır. Toplam hız / toplam ETA
+    gibi özetler dict'ler gezilmeden doğrudan sütunlar üzerinden hesaplanır.
+    Değer yazımı (hook thread'i) kilitsizdir; sadece slot açma/kapama kilitlidir.
+    """
+
+    def __init__(self, capacity: int = 32):
+        self.downloaded = array('d', bytes(8 * capacity))
+        self.total = array('d', bytes(8 * capacity))
+        self.speed = array('d', bytes(8 * capacity))
+        self.eta = array('d', bytes(8 * capacity))
+        self._free = list(range(capacity - 1, -1, -1))
+        self._records = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._records)
+
+    def open(self, video_id: str) -> ProgressRecord:
+        """video_id için slot ayır (varsa mevcut kaydı döndür)"""
+        with self._lock:
+            record = self._records.get(video_id)
+            if record is not None:
+                return record
+            if not self._free:
+                self._grow()
+            index = self._free.pop()
+            record = ProgressRecord(video_id, self, index)
+            record.update(0, 0, 0, 0)
+            self._records[video_id] = record
+            return record
+
+    def get(self, video_id: str) -> Optional[ProgressRecord]:
+        return self._records.get(video_id)
+
+    def close(self, video_id: str):
+        """Slotu serbest bırak; sıfırlanır ki özetlere katılmasın"""
+        with self._lock:
+            record = self._records.pop(video_id, None)
+            if record is None:
+                return
+            record.update(0, 0, 0, 0)
+            self._free.append(record._index)
+
+    def _grow(self):
+        old = len(self.downloaded)
+        zeros = bytes(8 * old)
+        for column in (self.downloaded, self.total, self.speed, self.eta):
+            column.frombytes(zeros)
+        self._free.extend(range(2 * old - 1, old - 1, -1))
+
+    # ============== ÖZETLER ==============
+
+    def total_speed(self) -> float:
+        """Tüm aktif indirmelerin toplam hızı (bytes/sn)"""
+        return sum(self.speed)
+
+    def remaining_bytes(self) -> float:
+        return sum(t - d for t, d in zip(self.total, self.downloaded) if t > 0)
+
+    def overall_eta(self) -> float:
+        """Aktif indirmelerin tamamı için tahmini kalan süre (sn); bilinmiyorsa 0"""
+        speed = self.total_speed()
+        return self.remaining_bytes() / speed if speed > 0 else 0
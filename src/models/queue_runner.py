@@ -0,0 +1,98 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+
+class QueueRunner:
+    """Bekleyen görevleri, slot boşaldıkça kendiliğinden başlatan kuyruk çalıştırıcı
+
+    Aynı anda en fazla `max_concurrent + lookahead` görev başlatılmış
+    (inen veya semaphore'da bekleyen) olur; lookahead kadar görevin önceden
+    sırada olması, biten indirmenin slotunun beklemeden devredilmesini sağlar.
+    Limit dinamik olarak değişince ve her görev bittiğinde runner uyanır.
+    """
+
+    def __init__(self, downloader, next_task: Callable[[set], Optional[Any]],
+                 start_task: Callable[[Any], Awaitable], lookahead: int = 1):
+        """
+        next_task(exclude): başlatılacak sıradaki görev (exclude'dakiler hariç) veya None
+        start_task(task): görevi indirip bitene kadar bekleyen coroutine
+        """
+        self.downloader = downloader
+        self.next_task = next_task
+        self.start_task = start_task
+        self.lookahead = lookahead
+
+        self._wakeup = asyncio.Event()
+        self._loop_task: Optional[asyncio.Task] = None
+        self._paused = False
+        self._inflight = {}
+
+        downloader.add_limit_listener(self.kick)
+
+    @property
+    def is_running(self) -> bool:
+        return self._loop_task is not None and not self._loop_task.done()
+
+    @property
+    def is_paused(self) -> bool:
+        return self._paused
+
+    @property
+    def inflight_count(self) -> int:
+        return len(self._inflight)
+
+    def start(self):
+        if not self.is_running:
+            self._loop_task = asyncio.create_task(self._run())
+        self.kick()
+
+    def pause(self):
+        """Yeni görev başlatmayı durdur (inenler devam eder)"""
+        self._paused = True
+
+    def resume(self):
+        self._paused = False
+        self.kick()
+
+    def kick(self, *args):
+        """Runner'ı uyandır (yeni görev eklendi, slot boşaldı, limit değişti...)"""
+        self._wakeup.set()
+
+    def _has_capacity(self) -> bool:
+        return len(self._inflight) < self.downloader.max_concurrent + self.lookahead
+
+    async def _run(self):
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+
+                while not self._paused and self._has_capacity():
+                    task = self.next_task(set(self._inflight))
+                    if task is None:
+                        break
+                    job = asyncio.create_task(self.start_task(task))
+                    self._inflight[task] = job
+                    job.add_done_callback(lambda _, t=task: self._on_done(t))
+        except asyncio.CancelledError:
+            pass
+
+    def _on_done(self, task):
+        self._inflight.pop(task, None)
+        self.kick()
+
+    async def shutdown(self, timeout: float = 5.0):
+        """Yeni görev almayı bırak, başlatılmış olanların bitmesini en fazla `timeout` sn bekle
+
+        Süre dolunca hâlâ bitmemiş {görev: asyncio.Task} eşlemesini döndürür;
+        bunları iptal etmek çağıranın işidir.
+        """
+        self._paused = True
+        if self._loop_task:
+            self._loop_task.cancel()
+            self._loop_task = None
+
+        pending = list(self._inflight.values())
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+        return {task: job for task, job in self._inflight.items() if not job.done()}
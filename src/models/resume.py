@@ -0,0 +1,99 @@
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+@dataclass
+class ResumeState:
+    """Yarım kalan bir indirmenin devam ettirilebilmesi için gereken bilgiler
+
+    format_id: yt-dlp'nin ilk denemede seçtiği format(lar) (ör. "137+140");
+    tekrar başlatılınca aynı stream'lerin (dolayısıyla aynı .part dosyalarının)
+    seçilmesi için sabitlenir.
+    streams: stream dosya adı -> beklenen toplam boyut (0 = bilinmiyor);
+    yt-dlp bunların "<ad>.part" / "<ad>.ytdl" dosyalarından kaldığı yerden devam eder.
+    """
+    resolution: str
+    save_path: str
+    format_id: str = ""
+    streams: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            'resolution': self.resolution,
+            'save_path': self.save_path,
+            'format_id': self.format_id,
+            'streams': dict(self.streams),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Optional["ResumeState"]:
+        try:
+            return cls(
+                resolution=str(data['resolution']),
+                save_path=str(data['save_path']),
+                format_id=str(data.get('format_id') or ""),
+                streams={str(k): int(v or 0) for k, v in (data.get('streams') or {}).items()},
+            )
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+
+    def copy(self) -> "ResumeState":
+        return ResumeState.from_dict(self.to_dict())
+
+    def observe(self, d: dict) -> bool:
+        """yt-dlp progress hook verisinden formatı ve stream dosyalarını öğren
+
+        Hook thread'inde her progress'te çağrılır; sadece yeni bilgi geldiğinde True döner.
+        """
+        changed = False
+        if not self.format_id:
+            info = d.get('info_dict') or {}
+            requested = info.get('requested_formats')
+            if requested:
+                format_id = "+".join(str(f.get('format_id')) for f in requested)
+            else:
+                format_id = info.get('format_id')
+            if format_id:
+                self.format_id = str(format_id)
+                changed = True
+
+        filename = d.get('filename')
+        if filename and filename not in self.streams:
+            self.streams[filename] = int(d.get('total_bytes') or 0)
+            changed = True
+        return changed
+
+    def partial_files(self):
+        """Diskte duran yarım dosyalar (.part ve fragment ilerlemesini tutan .ytdl)"""
+        for filename in self.streams:
+            for path in (f"{filename}.part", f"{filename}.ytdl"):
+                if os.path.exists(path):
+                    yield path
+
+    def partial_bytes(self) -> int:
+        return sum(os.path.getsize(p) for p in self.partial_files() if p.endswith(".part"))
+
+    def verify(self, resolution: str, save_path: str) -> bool:
+        """Kayıt bu indirme ayarlarıyla ve diskteki dosyalarla hâlâ tutarlı mı?"""
+        if not self.format_id or resolution != self.resolution:
+            return False
+        if os.path.abspath(save_path) != os.path.abspath(self.save_path):
+            return False
+
+        for filename, expected in self.streams.items():
+            part = f"{filename}.part"
+            if not os.path.exists(part):
+                continue
+            # Beklenenden büyük .part bozuktur; üzerine devam etmek dosyayı bozar
+            if expected and os.path.getsize(part) > expected:
+                return False
+        return True
+
+    def discard(self):
+        """Yarım dosyaları sil (görev kuyruktan kaldırıldı / kayıt geçersiz)"""
+        for path in list(self.partial_files()):
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"⚠️ Yarım dosya silinemedi: {path}: {e}")
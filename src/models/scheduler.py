@@ -0,0 +1,90 @@
+import itertools
+from collections import defaultdict
+from enum import IntEnum
+
+
+class Priority(IntEnum):
+    """Öncelik sınıfları (küçük olan önce indirilir)"""
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+# Bant genişliği limiti varken öncelik sınıflarının adil paydaki ağırlıkları
+PRIORITY_WEIGHTS = {Priority.HIGH: 3.0, Priority.NORMAL: 1.0, Priority.LOW: 0.5}
+
+
+class DownloadScheduler:
+    """Bekleyen indirmelerin semaphore'daki sırasını belirleyen anahtarları üretir
+
+    Anahtar: (öncelik, öne alma sırası, kanal sırası, iş boyutu, geliş sırası)
+    - öncelik: Priority sınıfı; move_to_front edilenler hepsinden önce gelir
+    - kanal sırası: aynı kanaldan sırada bekleyen kaçıncı video olduğu;
+      böylece tek kanaldan 100 video eklenince diğer kanallar aç kalmaz
+    - iş boyutu: "shortest" politikasında tahmini boyut (yoksa süre), "fifo"da 0
+    """
+
+    POLICIES = ("fifo", "shortest")
+    FRONT = -1
+
+    def __init__(self, policy: str = "fifo", channel_fairness: bool = True):
+        self.policy = policy
+        self.channel_fairness = channel_fairness
+        self._arrival = itertools.count()
+        self._front = itertools.count()
+        self._jobs = {}
+        self._channel_waiting = defaultdict(int)
+
+    def enqueue(self, ticket, priority=Priority.NORMAL, size=0, duration=0, channel=""):
+        """Yeni bekleyen iş için anahtar üret"""
+        job = {
+            'priority': Priority(priority),
+            'size': size or 0,
+            'duration': duration or 0,
+            'channel': channel or "",
+            'arrival': next(self._arrival),
+            'channel_rank': self._channel_waiting[channel or ""],
+            'front': None,
+        }
+        self._channel_waiting[job['channel']] += 1
+        self._jobs[ticket] = job
+        return self._key(job)
+
+    def dequeue(self, ticket):
+        """İş slot aldı veya kuyruktan çıktı"""
+        job = self._jobs.pop(ticket, None)
+        if job is not None:
+            self._channel_waiting[job['channel']] -= 1
+            if self._channel_waiting[job['channel']] <= 0:
+                del self._channel_waiting[job['channel']]
+
+    def set_priority(self, ticket, priority):
+        job = self._jobs.get(ticket)
+        if job is None:
+            return None
+        job['priority'] = Priority(priority)
+        job['front'] = None
+        return self._key(job)
+
+    def move_to_front(self, ticket):
+        job = self._jobs.get(ticket)
+        if job is None:
+            return None
+        # En son öne alınan en önde
+        job['front'] = -next(self._front)
+        return self._key(job)
+
+    def rekey_all(self):
+        """Politika değişince tüm bekleyenlerin yeni anahtarları"""
+        return {ticket: self._key(job) for ticket, job in self._jobs.items()}
+
+    def _key(self, job):
+        if job['front'] is not None:
+            return (self.FRONT, job['front'], 0, 0, job['arrival'])
+        channel_rank = job['channel_rank'] if self.channel_fairness else 0
+        if self.policy == "shortest":
+            # Boyut bilinmiyorsa süreyi kaba bir boyut tahmini olarak kullan (~1 MB/dk)
+            job_size = job['size'] or job['duration'] * 1024 * 1024 / 60 or float('inf')
+        else:
+            job_size = 0
+        return (int(job['priority']), 0, channel_rank, job_size, job['arrival'])
@@ -0,0 +1,120 @@
+import asyncio
+import os
+import shutil
+import time
+from typing import Callable, Iterable, Optional, Set
+
+STAGING_DIRNAME = ".staging"
+
+
+def staging_dir(save_path: str, video_id: str) -> str:
+    """İndirmenin ara dosyalarının (.part, .ytdl, merge öncesi stream'ler) yazıldığı klasör
+
+    save_path altında olduğu için bitince son dosyanın save_path'e taşınması
+    aynı dosya sisteminde atomik bir rename'dir.
+    """
+    return os.path.join(save_path, STAGING_DIRNAME, video_id)
+
+
+def remove_staging(save_path: str, video_id: str):
+    """Sadece bu indirmenin staging klasörünü sil (diğer indirmelere dokunmaz)"""
+    path = staging_dir(save_path, video_id)
+    shutil.rmtree(path, ignore_errors=True)
+    try:
+        os.rmdir(os.path.dirname(path))
+    except OSError:
+        pass
+
+
+def _dir_usage(path: str):
+    """(toplam boyut, en son değişiklik zamanı) - klasör içini özyinelemeli gezer"""
+    size, latest = 0, os.path.getmtime(path)
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                st = os.stat(os.path.join(root, name))
+            except OSError:
+                continue
+            size += st.st_size
+            latest = max(latest, st.st_mtime)
+    return size, latest
+
+
+class StagingJanitor:
+    """Sahipsiz kalmış staging klasörlerini arka planda temizleyen görev
+
+    Kuyrukta karşılığı olmayan (ör. çökmeden kalan veya journal'dan silinmiş)
+    klasörlerden `max_age` saniyedir dokunulmamış olanlar silinir; sahipsizlerin
+    toplam boyutu `max_bytes`'ı aşarsa en eskiden başlanarak ayrıca silinir.
+    Kuyruktaki görevlerin klasörleri (devam edilebilir .part'lar) korunur.
+    """
+
+    def __init__(self, roots: Callable[[], Iterable[str]], owned: Callable[[], Set[str]],
+                 max_age: float = 24 * 3600, max_bytes: int = 2 * 1024 ** 3, interval: float = 600.0):
+        """
+        roots(): staging klasörü taranacak save_path'ler
+        owned(): hâlâ kuyrukta olan video_id'ler
+        """
+        self.roots = roots
+        self.owned = owned
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        try:
+            while True:
+                try:
+                    await self.sweep()
+                except Exception as e:
+                    print(f"❌ Staging temizleme hatası: {e}")
+                await asyncio.sleep(self.interval)
+        except asyncio.CancelledError:
+            pass
+
+    async def sweep(self) -> int:
+        """Tek tarama; silinen klasör sayısını döndürür"""
+        roots = {os.path.abspath(r) for r in self.roots() if r}
+        owned = set(self.owned())
+        return await asyncio.get_running_loop().run_in_executor(None, self._sweep, roots, owned)
+
+    def _sweep(self, roots, owned) -> int:
+        orphans = []
+        for root in roots:
+            staging_root = os.path.join(root, STAGING_DIRNAME)
+            try:
+                entries = list(os.scandir(staging_root))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name in owned or not entry.is_dir(follow_symlinks=False):
+                    continue
+                try:
+                    size, latest = _dir_usage(entry.path)
+                except OSError:
+                    continue
+                orphans.append((latest, size, entry.path))
+
+        now = time.time()
+        orphans.sort()
+        total = sum(size for _, size, _ in orphans)
+        removed = 0
+        for latest, size, path in orphans:
+            if now - latest < self.max_age and total <= self.max_bytes:
+                # Eskiden yeniye sıralı: kalanlar hem daha yeni hem de bütçe içinde
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+            print(f"🧹 Sahipsiz staging klasörü silindi: {path} ({size / 1024 / 1024:.1f} MB)")
+        return removed
@@ -0,0 +1,154 @@
+import math
+import time
+from collections import deque
+
+
+class _DownloadStats:
+    __slots__ = ('last_bytes', 'last_time', 'ewma', 'last_progress_time')
+
+    def __init__(self, now: float):
+        self.last_bytes = 0.0
+        self.last_time = now
+        self.ewma = 0.0
+        self.last_progress_time = now
+
+
+class ThroughputStats:
+    """İndirme ve kuyruk seviyesinde kayan (rolling) istatistikler
+
+    - Her indirme için üstel ağırlıklı (EWMA) hız
+    - Kuyruk geneli için hem EWMA hem de son `window` saniyelik pencere hızı
+    - Bekleyen videoların tahmini boyutunu da hesaba katan kuyruk ETA'sı
+    - Tamamlanan videolar için p50/p95 tamamlanma süresi
+    - Sonuç sayaçları (başarılı / hata / iptal) ve takılma (stall) tespiti
+    """
+
+    def __init__(self, tau: float = 5.0, window: float = 10.0, history: int = 200):
+        self.tau = tau
+        self.window = window
+
+        self._downloads = {}
+        self._started_at = {}
+        self._waiting_sizes = {}
+
+        self._samples = deque()   # (zaman, byte) - pencere hızı için
+        self._window_bytes = 0.0
+        self.queue_ewma = 0.0
+        self._queue_last_time = time.monotonic()
+
+        self._completion_times = deque(maxlen=history)
+        self.results = {'success': 0, 'error': 0, 'cancelled': 0}
+
+    # ============== YAŞAM DÖNGÜSÜ ==============
+
+    def on_waiting(self, video_id: str, expected_bytes: int = 0):
+        self._waiting_sizes[video_id] = expected_bytes or 0
+
+    def on_start(self, video_id: str):
+        now = time.monotonic()
+        self._waiting_sizes.pop(video_id, None)
+        self._started_at[video_id] = now
+        self._downloads[video_id] = _DownloadStats(now)
+
+    def on_finish(self, video_id: str, result: str):
+        self._waiting_sizes.pop(video_id, None)
+        self._downloads.pop(video_id, None)
+        started = self._started_at.pop(video_id, None)
+
+        if result == "Success":
+            self.results['success'] += 1
+            if started is not None:
+                self._completion_times.append(time.monotonic() - started)
+        elif result == "Cancelled":
+            self.results['cancelled'] += 1
+        else:
+            self.results['error'] += 1
+
+    # ============== PROGRESS (ProgressBus global abonesi) ==============
+
+    def on_progress(self, video_id: str, record):
+        stats = self._downloads.get(video_id)
+        if stats is None:
+            return
+
+        now = time.monotonic()
+        downloaded = record.downloaded
+        delta = downloaded - stats.last_bytes
+        if delta < 0:
+            # Yeni stream (ör. video bitti, ses başladı): sayaç sıfırdan başlar
+            delta = downloaded
+        dt = max(now - stats.last_time, 1e-3)
+
+        stats.ewma = self._ewma(stats.ewma, delta / dt, dt)
+        stats.last_bytes = downloaded
+        stats.last_time = now
+        if delta > 0:
+            stats.last_progress_time = now
+
+        self._add_queue_bytes(delta, now)
+
+    def _ewma(self, current: float, sample: float, dt: float) -> float:
+        # Düzensiz aralıklar için zaman sabitli EWMA
+        alpha = 1 - math.exp(-dt / self.tau)
+        return current + alpha * (sample - current)
+
+    def _add_queue_bytes(self, delta: float, now: float):
+        self._samples.append((now, delta))
+        self._window_bytes += delta
+        self._expire_samples(now)
+
+        dt = max(now - self._queue_last_time, 1e-3)
+        self.queue_ewma = self._ewma(self.queue_ewma, delta / dt, dt)
+        self._queue_last_time = now
+
+    def _expire_samples(self, now: float):
+        limit = now - self.window
+        while self._samples and self._samples[0][0] < limit:
+            self._window_bytes -= self._samples.popleft()[1]
+
+    # ============== SORGULAR ==============
+
+    def window_rate(self) -> float:
+        """Son `window` saniyede kuyruk geneli ortalama hız (bytes/sn)"""
+        self._expire_samples(time.monotonic())
+        return max(self._window_bytes, 0.0) / self.window
+
+    def download_rate(self, video_id: str) -> float:
+        stats = self._downloads.get(video_id)
+        return stats.ewma if stats else 0.0
+
+    def stalled_downloads(self, stall_seconds: float = 20.0) -> list:
+        """stall_seconds boyunca hiç byte almamış aktif indirmeler"""
+        now = time.monotonic()
+        return [vid for vid, s in self._downloads.items() if now - s.last_progress_time > stall_seconds]
+
+    def completion_percentile(self, p: float) -> float:
+        if not self._completion_times:
+            return 0.0
+        ordered = sorted(self._completion_times)
+        rank = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+        return ordered[rank]
+
+    def queue_eta(self, remaining_active_bytes: float, extra_waiting_bytes: float = 0) -> float:
+        """Tüm kuyruk için tahmini kalan süre (sn); hız bilinmiyorsa 0"""
+        rate = self.window_rate() or self.queue_ewma
+        if rate <= 0:
+            return 0.0
+        waiting = sum(self._waiting_sizes.values()) + extra_waiting_bytes
+        return (remaining_active_bytes + waiting) / rate
+
+    def error_rate(self) -> float:
+        finished = self.results['success'] + self.results['error']
+        return self.results['error'] / finished if finished else 0.0
+
+    def snapshot(self, remaining_active_bytes: float = 0, extra_waiting_bytes: float = 0) -> dict:
+        return {
+            'queue_rate': self.window_rate(),
+            'queue_rate_ewma': self.queue_ewma,
+            'queue_eta': self.queue_eta(remaining_active_bytes, extra_waiting_bytes),
+            'completion_p50': self.completion_percentile(50),
+            'completion_p95': self.completion_percentile(95),
+            'completed': self.results['success'],
+            'errors': self.results['error'],
+            'cancelled': self.results['cancelled'],
+        }
@@ -0,0 +1,211 @@
+import asyncio
+import base64
+import hashlib
+import os
+import re
+import threading
+import urllib.request
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from .app_paths import app_data_path
+
+# Boyut adı -> ytimg'nin hazır küçük varyantı. Sunucu tarafında zaten ekrandaki boyuta
+# yakın ölçekli olduklarından yeniden boyutlandırma gerekmez; satır başına birkaç KB iner.
+SIZES: Dict[str, str] = {
+    'row': "default.jpg",        # Kuyruk satırı: 40x40 (kaynak 120x90)
+    'preview': "mqdefault.jpg",  # Current selection: 320x180 (kaynak 320x180)
+}
+
+# Görsel gelene kadar gösterilen 1x1 saydam PNG
+PLACEHOLDER_BASE64 = (
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+)
+
+_VIDEO_ID = re.compile(r"^[A-Za-z0-9_-]{11}$")
+
+
+class ThumbnailCache:
+    """Thumbnail'ları bir kez indirip küçük varyantlarını saklayan servis
+
+    - Kaynak: video ID biliniyorsa ytimg'nin hazır küçük varyantı, yoksa
+      verilen URL olduğu gibi (max_source_bytes'tan büyükse alınmaz)
+    - Disk: boyut sınırlı LRU klasör (dosya adı "<video_id>_<boyut>.jpg"),
+      erişilen dosyanın mtime'ı güncellenir, sınır aşılınca en eskiler silinir
+    - Bellek: UI'a doğrudan verilen base64 metinlerinin küçük LRU'su
+    Aynı görsel için eşzamanlı istekler tek indirmede birleştirilir.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 64 * 1024 ** 2,
+                 memory_entries: int = 512, max_parallel: int = 4, max_source_bytes: int = 2 * 1024 ** 2,
+                 base_url: str = "https://i.ytimg.com", timeout: float = 10.0):
+        self.directory = directory or os.path.dirname(app_data_path("thumbnails", "_"))
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.max_source_bytes = max_source_bytes
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # dosya adı -> boyut (eskiden yeniye)
+        self._index_total = 0
+        self._index_loaded = False
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._fetch_slots = asyncio.Semaphore(max_parallel)
+
+        # İstatistikler
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.fetches = 0
+        self.fetched_bytes = 0
+
+    # ============== ASYNC ==============
+
+    async def get(self, video_id: str, url: str = "", size: str = 'row') -> Optional[str]:
+        """Thumbnail'ın base64 metni (ft.Image.src_base64 için); alınamazsa None"""
+        key = self._key(video_id, url, size)
+        if key is None:
+            return None
+
+        cached = self._memory.get(key)
+        if cached is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        result = None
+        try:
+            data = await asyncio.to_thread(self._read_disk, key)
+            if data is not None:
+                self.disk_hits += 1
+            else:
+                async with self._fetch_slots:
+                    data = await asyncio.to_thread(self._fetch_and_store, key, video_id, url, size)
+            if data is not None:
+                result = base64.b64encode(data).decode("ascii")
+                self._remember(key, result)
+            return result
+        except Exception as e:
+            print(f"⚠️ Thumbnail alınamadı ({video_id or url}): {e}")
+            return None
+        finally:
+            self._inflight.pop(key, None)
+            future.set_result(result)
+
+    def get_stats(self) -> dict:
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'fetches': self.fetches,
+            'fetched_bytes': self.fetched_bytes,
+            'disk_bytes': self._index_total,
+            'disk_entries': len(self._index),
+        }
+
+    # ============== YARDIMCILAR ==============
+
+    @staticmethod
+    def _key(video_id: str, url: str, size: str) -> Optional[str]:
+        if size not in SIZES:
+            raise ValueError(f"Bilinmeyen thumbnail boyutu: {size}")
+        if video_id and _VIDEO_ID.match(video_id):
+            return f"{video_id}_{size}.jpg"
+        if url:
+            return f"{hashlib.sha1(url.encode()).hexdigest()[:16]}_{size}.jpg"
+        return None
+
+    def _remember(self, key: str, value: str):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _source_url(self, video_id: str, url: str, size: str) -> str:
+        if video_id and _VIDEO_ID.match(video_id) and (not url or "ytimg.com" in url):
+            return f"{self.base_url}/vi/{video_id}/{SIZES[size]}"
+        return url
+
+    # ============== DİSK LRU (thread'de çalışır) ==============
+
+    def _load_index(self):
+        if self._index_loaded:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".jpg"):
+                st = entry.stat()
+                entries.append((st.st_mtime, entry.name, st.st_size))
+        for _, name, size in sorted(entries):
+            self._index[name] = size
+            self._index_total += size
+        self._index_loaded = True
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            self._load_index()
+            if key not in self._index:
+                return None
+            path = os.path.join(self.directory, key)
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                os.utime(path)
+            except OSError:
+                self._index_total -= self._index.pop(key)
+                return None
+            self._index.move_to_end(key)
+            return data
+
+    def _write_disk(self, key: str, data: bytes):
+        with self._lock:
+            self._load_index()
+            path = os.path.join(self.directory, key)
+            tmp = f"{path}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self._index_total -= self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._index_total += len(data)
+
+            while self._index_total > self.max_bytes and len(self._index) > 1:
+                name, size = self._index.popitem(last=False)
+                self._index_total -= size
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def _fetch_and_store(self, key: str, video_id: str, url: str, size: str) -> Optional[bytes]:
+        source = self._source_url(video_id, url, size)
+        if not source:
+            return None
+        request = urllib.request.Request(source, headers={'User-Agent': 'Mozilla/5.0'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            data = response.read(self.max_source_bytes + 1)
+        self.fetches += 1
+        self.fetched_bytes += len(data)
+        if len(data) > self.max_source_bytes:
+            return None  # Küçük varyantı olmayan dev görsel: UI uzak URL'e düşer
+
+        self._write_disk(key, data)
+        return data
+
+
+_thumbnail_cache: Optional[ThumbnailCache] = None
+
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    """Uygulama genelinde paylaşılan thumbnail servisi (ilk çağrıda, event loop içinde oluşturulur)"""
+    global _thumbnail_cache
+    if _thumbnail_cache is None:
+        _thumbnail_cache = ThumbnailCache()
+    return _thumbnail_cache
@@ -20,37 +20,210 @@ def is_youtube_link_checker(url: str) -> bool:
     return bool(pattern.match(url.strip()))
 
 
+def is_youtube_playlist_link(url: str) -> bool:
+    """Playlist veya kanal URL'i mi? (tek video linkleri False döner)"""
+    import re
+    if not isinstance(url, str) or not url.strip():
+        return False
+
+    pattern = re.compile(
+        r"^(?:https?://)?(?:www\.|m\.)?youtube\.com/"
+        r"(?:"
+            r"playlist\?(?:[^\s]*&)?list=[A-Za-z0-9_-]+"
+            r"|@[A-Za-z0-9_.-]+"
+            r"|channel/UC[A-Za-z0-9_-]{22}"
+            r"|c/[A-Za-z0-9_.-]+"
+            r"|user/[A-Za-z0-9_.-]+"
+        r")"
+        r"(?:/(?:videos|shorts|streams))?/?"
+        r"(?:[?&][^\s]*)?$",
+        re.IGNORECASE
+    )
+
+    return bool(pattern.match(url.strip()))
+
+
+def _normalize_channel_url(url: str) -> str:
+    """Kanal ana sayfası yerine doğrudan 'videos' sekmesini listele"""
+    import re
+    url = url.strip()
+    if "playlist?" in url or re.search(r"/(?:videos|shorts|streams)/?(?:[?#].*)?$", url):
+        return url
+    base, sep, query = url.partition("?")
+    return base.rstrip("/") + "/videos" + (sep + query if sep else "")
+
+
+_VIDEO_ID_PATTERN = None
+
+def extract_video_id(url: str) -> str:
+    """URL'in hangi biçimde olduğundan bağımsız kanonik 11 karakterlik video ID'si
+
+    watch?v=, youtu.be/, shorts/, embed/ ve v/ biçimlerini tanır; bulamazsa "" döner.
+    """
+    import re
+    global _VIDEO_ID_PATTERN
+    if _VIDEO_ID_PATTERN is None:
+        _VIDEO_ID_PATTERN = re.compile(
+            r"(?:youtube\.com/(?:watch\?(?:.*&)?v=|shorts/|embed/|v/)?|youtu\.be/)"
+            r"([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])",
+            re.IGNORECASE
+        )
+    if not isinstance(url, str):
+        return ""
+    match = _VIDEO_ID_PATTERN.search(url.strip())
+    return match.group(1) if match else ""
+
+
+from typing import Optional
 from .video_info import VideoInfo
-async def get_video_info(url:str) -> VideoInfo:
-    import yt_dlp
+from .format_table import FormatTable
+from .metadata_cache import MetadataCache
+from .app_paths import app_data_path
+
+_metadata_cache = None
+
+def get_metadata_cache() -> MetadataCache:
+    """Uygulama genelinde paylaşılan metadata cache'i (ilk çağrıda oluşturulur)"""
+    global _metadata_cache
+    if _metadata_cache is None:
+        _metadata_cache = MetadataCache(disk_path=app_data_path("metadata_cache.db"))
+    return _metadata_cache
+
+
+async def get_video_info(url:str, use_cache: bool = True, executor=None) -> VideoInfo:
+    """executor verilirse extraction o havuzda çalışır (varsayılan: asyncio'nun default executor'ı)"""
     import asyncio
+    import dataclasses
     from models.video_info import VideoInfo
+    from models.ydl_pool import ydl_pool
+    from models.parallel_streams import FANOUT_EXTRACTOR_ARGS
+    
+    video_id = extract_video_id(url)
+    cache = get_metadata_cache() if use_cache and video_id else None
+    
+    # ✅ Daha önce çözülmüş video: extract_info'ya hiç gitme
+    if cache:
+        cached = await cache.aget(video_id)
+        if cached is not None:
+            return dataclasses.replace(cached, url=url)
     
     ydl_opts = {
         'quiet': True,
         'no_warnings': True,
         'extract_flat': False,  # Tüm bilgileri çek
+        # Ham info indirmede tekrar kullanılır; fan-out'lu indirme de yeniden çıkarmasın
+        'extractor_args': FANOUT_EXTRACTOR_ARGS,
         }
     
     def extract_info():
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl: # type: ignore
-            return ydl.extract_info(url, download=False)
+        with ydl_pool.acquire(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+            # İndirme tekrar extraction yapmasın diye ham info da saklanır
+            if cache and info:
+                cache.put_raw(video_id, ydl.sanitize_info(info))
+            return info
     
-    info_dict = await asyncio.to_thread(extract_info)
+    info_dict = await asyncio.get_running_loop().run_in_executor(executor, extract_info)
+    formats = FormatTable.from_formats(info_dict.get('formats'))  # type: ignore
     
     video_info = VideoInfo(
     url=url,
     title=info_dict.get('title', 'Bilinmeyen'), # type: ignore
+    video_id=info_dict.get('id') or video_id, # type: ignore
     duration=info_dict.get('duration', 0), # type: ignore
     thumbnail_url=info_dict.get('thumbnail', ''), # type: ignore
     channel=info_dict.get('uploader', ''), # type: ignore
-    available_qualities=_get_available_qualities(info_dict), # type: ignore
-    filesize_approx=info_dict.get('filesize', 0),
-    #available_formats= info_dict.get('formats', [])# type: ignore
+    available_qualities=_get_available_qualities(formats),
+    filesize_approx=info_dict.get('filesize') or info_dict.get('filesize_approx') or 0, # type: ignore
+    formats=formats,
     )
+    
+    if cache:
+        await cache.aput(video_id, video_info)
     return video_info
 
 
+def get_extracted_info(url: str) -> Optional[dict]:
+    """get_video_info'nun bu video için çıkardığı ham yt-dlp info'su (yoksa None)
+
+    Downloader'a verilir; stream URL'lerinin geçerliliğini indirme anında o kontrol eder.
+    """
+    video_id = extract_video_id(url)
+    return get_metadata_cache().get_raw(video_id) if video_id else None
+
+
+async def iter_playlist_entries(url: str):
+    """Playlist/kanal girdilerini flat extraction ile async generator olarak üret
+
+    yt-dlp sayfaları bir thread'de tembel (lazy) olarak gezer; her girdi
+    bulunduğu anda event loop'a aktarılır, böylece tüketici ilk videoyu
+    listenin tamamı çekilmeden işlemeye başlayabilir. Üretilen VideoInfo'lar
+    is_partial=True'dur; tam bilgi get_video_info ile sonradan çekilmelidir.
+    """
+    import asyncio
+    from models.ydl_pool import ydl_pool
+
+    ydl_opts = {
+        'quiet': True,
+        'no_warnings': True,
+        'extract_flat': 'in_playlist',  # Sadece liste, video sayfalarına girme
+        'lazy_playlist': True,
+    }
+
+    loop = asyncio.get_running_loop()
+    entries_q: asyncio.Queue = asyncio.Queue(maxsize=0)
+    done = object()
+    stop = False
+
+    def enumerate_entries():
+        try:
+            with ydl_pool.acquire(ydl_opts) as ydl:
+                result = ydl.extract_info(_normalize_channel_url(url), download=False, process=False)
+                for entry in (result or {}).get('entries') or []:
+                    if stop:
+                        break
+                    if entry:
+                        loop.call_soon_threadsafe(entries_q.put_nowait, entry)
+        except Exception as e:
+            loop.call_soon_threadsafe(entries_q.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(entries_q.put_nowait, done)
+
+    producer = loop.run_in_executor(None, enumerate_entries)
+    try:
+        while True:
+            entry = await entries_q.get()
+            if entry is done:
+                break
+            if isinstance(entry, Exception):
+                raise entry
+            info = _flat_entry_to_video_info(entry)
+            if info is not None:
+                yield info
+    finally:
+        stop = True
+        await asyncio.shield(producer)
+
+
+def _flat_entry_to_video_info(entry: dict):
+    video_id = entry.get('id') or ''
+    if not video_id or entry.get('ie_key') not in (None, 'Youtube'):
+        return None  # Alt playlist/sekme girdilerini atla
+
+    thumbnails = entry.get('thumbnails') or []
+    thumbnail_url = thumbnails[-1].get('url', '') if thumbnails else f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"
+
+    return VideoInfo(
+        url=entry.get('url') or f"https://www.youtube.com/watch?v={video_id}",
+        title=entry.get('title') or video_id,
+        video_id=video_id,
+        duration=int(entry.get('duration') or 0),
+        thumbnail_url=thumbnail_url,
+        channel=entry.get('channel') or entry.get('uploader') or '',
+        is_partial=True,
+    )
+
+
 from typing import List
 # Standart YouTube kalite çözünürlükleri (büyükten küçüğe)
 STANDARD_RESOLUTIONS = {
@@ -63,21 +236,15 @@ STANDARD_RESOLUTIONS = {
     240: "240p",
     144: "144p",
 }
-def _get_available_qualities(info_dict: dict) -> List[str]:
+def _get_available_qualities(formats: FormatTable) -> List[str]:
     """
     Videoda mevcut olan tüm standart çözünürlükleri al
     
     Returns:
         List[str]: ["4K", "1080p", "720p", ...] gibi büyükten küçüğe
     """
-    formats = info_dict.get('formats', [])
-    available_heights = set()
-    
-    # Tüm formatlardan height bilgisini topla
-    for fmt in formats:
-        height = fmt.get('height')
-        if height and height in STANDARD_RESOLUTIONS:
-            available_heights.add(height)
+    # Format tablosunun height sütunundan
+    available_heights = formats.heights_available() & STANDARD_RESOLUTIONS.keys()
     
     # Büyükten küçüğe sırala ve isimlere çevir
     result = []
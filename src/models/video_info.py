@@ -1,14 +1,16 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict, fields
 from typing import List
 
+from .format_table import FormatTable
+
 @dataclass
 class VideoInfo:
     """YouTube video bilgileri"""
     
     # Temel bilgiler
     url: str                          # Video URL'i
-    #video_id: str                     # Video ID (örn: "dQw4w9WgXcQ")
     title: str                        # Video başlığı
+    video_id: str = ""                # Video ID (örn: "dQw4w9WgXcQ")
     
     # Detay bilgiler
     duration: int = 0                 # Süre (saniye)
@@ -26,9 +28,23 @@ class VideoInfo:
     # upload_date: str = ""             # Yüklenme tarihi (YYYYMMDD)
     
     # Format bilgileri
-    #available_formats: List[Dict] = field(default_factory=list)  # Mevcut formatlar
+    formats: FormatTable = field(default_factory=FormatTable)    # Mevcut formatlar (sütunlu)
     available_qualities: List[str] = field(default_factory=list) # Mevcut kaliteler
     filesize_approx: int = 0          # Yaklaşık dosya boyutu (bytes)
+    is_partial: bool = False          # Flat extraction'dan geldi, tam bilgi henüz çekilmedi
+    
+    # Serileştirme (journal / cache için)
+    def to_dict(self) -> dict:
+        """JSON'a yazılabilir sözlük"""
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "VideoInfo":
+        """to_dict() çıktısından nesneyi yeniden oluştur (bilinmeyen alanlar atlanır)"""
+        known = {f.name for f in fields(cls)}
+        values = {k: v for k, v in data.items() if k in known}
+        values['formats'] = FormatTable.from_dict(values.get('formats'))
+        return cls(**values)
     
     # Computed properties (hesaplanan)
     @property
@@ -58,6 +74,18 @@ class VideoInfo:
             return f"{gb:.2f} GB"
         return f"{mb:.2f} MB"
     
+    def quality_filesize(self, quality: str) -> int:
+        """Kalite etiketi ("1080p") için seçilecek formatların boyutu (0 = bilinmiyor)"""
+        return self.formats.filesize_for(quality.rstrip("p"))
+    
+    def quality_label(self, quality: str) -> str:
+        """Dropdown metni: boyut biliniyorsa ör. "1080p · 245 MB" """
+        size = self.quality_filesize(quality)
+        if not size:
+            return quality
+        mb = size / (1024 * 1024)
+        return f"{quality} · {mb / 1024:.2f} GB" if mb >= 1024 else f"{quality} · {mb:.0f} MB"
+    
     @property
     def short_title(self, max_length: int = 50) -> str:
         """Kısa başlık (uzunsa kes)"""
@@ -0,0 +1,108 @@
+import atexit
+import json
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import yt_dlp
+
+
+class YoutubeDLPool:
+    """Executor thread'lerine bağlı, önceden oluşturulmuş YoutubeDL havuzu
+
+    Her thread kendi instance'larını seçenek parmak izine (fingerprint) göre
+    tutar; böylece extractor'lar, HTTP opener ve cookie jar her indirmede
+    yeniden kurulmaz. Bir instance aynı anda tek thread tarafından
+    kullanıldığı için indirme başına hook'ları değiştirmek güvenlidir.
+    """
+
+    # Parmak izine dahil edilmeyen (indirme başına değişen) seçenekler
+    HOOK_KEYS = ('progress_hooks', 'postprocessor_hooks')
+    # Instance'a acquire sırasında yazılan, indirme başına değişen seçenekler: staging
+    # klasörünü içeren 'paths' ve video başına sabitlenen format ID'lerini içeren 'format'
+    # (YoutubeDL onu __init__'te derlediği için seçici acquire'da yeniden kurulur)
+    PER_CALL_KEYS = ('paths', 'format')
+
+    def __init__(self, max_per_thread: int = 4):
+        self.max_per_thread = max_per_thread
+        self._local = threading.local()
+        self._all = set()
+        self._all_lock = threading.Lock()
+
+    @classmethod
+    def fingerprint(cls, opts: dict) -> str:
+        clean = {k: v for k, v in opts.items() if k not in cls.HOOK_KEYS and k not in cls.PER_CALL_KEYS}
+        return json.dumps(clean, sort_keys=True, default=repr)
+
+    def _thread_instances(self) -> OrderedDict:
+        instances = getattr(self._local, 'instances', None)
+        if instances is None:
+            instances = self._local.instances = OrderedDict()
+        return instances
+
+    @contextmanager
+    def acquire(self, opts: dict, progress_hooks=(), postprocessor_hooks=()):
+        """Bu thread için uygun YoutubeDL'i ver; hook'ları indirme süresince tak"""
+        instances = self._thread_instances()
+        key = self.fingerprint(opts)
+
+        ydl = instances.pop(key, None)
+        if ydl is None:
+            ydl = yt_dlp.YoutubeDL({k: v for k, v in opts.items() if k not in self.HOOK_KEYS})  # type: ignore
+            with self._all_lock:
+                self._all.add(ydl)
+
+        # yt-dlp hook'ları dl()/PostProcessor oluşturulurken bu listelerden kopyalar
+        ydl._progress_hooks = list(progress_hooks)
+        ydl._postprocessor_hooks = list(postprocessor_hooks)
+
+        healthy = False
+        try:
+            self._apply_per_call(ydl, opts)
+            yield ydl
+            healthy = True
+        finally:
+            ydl._progress_hooks = []
+            ydl._postprocessor_hooks = []
+            if healthy:
+                instances[key] = ydl
+                while len(instances) > self.max_per_thread:
+                    _, old = instances.popitem(last=False)
+                    self._close(old)
+            else:
+                # Hata/iptal sonrası iç durumu belirsiz: havuza geri koyma
+                self._close(ydl)
+
+    def _apply_per_call(self, ydl, opts: dict):
+        previous_format = ydl.params.get('format')
+        for k in self.PER_CALL_KEYS:
+            if k in opts:
+                ydl.params[k] = opts[k]
+            else:
+                ydl.params.pop(k, None)
+        fmt = ydl.params.get('format')
+        if fmt != previous_format:
+            # YoutubeDL.__init__ ile aynı kural: None/'-' ve callable olduğu gibi kullanılır
+            ydl.format_selector = fmt if fmt in (None, '-') or callable(fmt) else ydl.build_format_selector(fmt)
+
+    def _close(self, ydl):
+        with self._all_lock:
+            self._all.discard(ydl)
+        try:
+            ydl.close()
+        except Exception:
+            pass
+
+    def close_all(self):
+        """Uygulama kapanırken tüm instance'ları kapat (cookie'ler kaydedilir)"""
+        with self._all_lock:
+            instances, self._all = list(self._all), set()
+        for ydl in instances:
+            try:
+                ydl.close()
+            except Exception:
+                pass
+
+
+ydl_pool = YoutubeDLPool()
+atexit.register(ydl_pool.close_all)
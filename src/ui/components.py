@@ -1,11 +1,20 @@
-from datetime import datetime
 import flet as ft
 from .style import AppColors
-from models.validators import is_youtube_link_checker, get_video_info
+from models.validators import is_youtube_link_checker, is_youtube_playlist_link, get_video_info, iter_playlist_entries, STANDARD_RESOLUTIONS
 from models.video_info import VideoInfo
 from abc import ABC, abstractmethod
 from models.downloader import RobustDownloader
-from typing import Callable
+from models.journal import DownloadJournal
+from models.download_engine import DownloadEngine
+from models.download_job import DownloadJob
+from models.prefetcher import MetadataPrefetcher
+from .progress_renderer import ProgressRenderer
+from .queue_view import QueueView
+from models.concurrency_tuner import ConcurrencyTuner
+from models.scheduler import Priority
+from models.thumbnails import get_thumbnail_cache, PLACEHOLDER_BASE64
+from typing import Callable, Optional
+from functools import partial
 import asyncio
 
 class VideoQuearySelection(ABC):
@@ -14,12 +23,15 @@ class VideoQuearySelection(ABC):
         pass
 
 class DownloadSection(ft.Container):
-    def __init__(self,add_task:Callable):
+    def __init__(self,add_task:Callable,add_playlist:Optional[Callable] = None,add_bulk:Optional[Callable] = None):
         super().__init__(bgcolor=AppColors.SURFACE_DARK,border_radius=16,border=ft.border.all(1, "white10"),padding=32)
         self._observers: list[VideoQuearySelection] = []
         self.current_video_info: VideoInfo
         self.download_btn_is_active = False
         self.add_task = add_task
+        self.add_playlist = add_playlist
+        self.add_bulk = add_bulk
+        self.playlist_url: Optional[str] = None
         self.old_url:str = ""
 
         self.url_input = ft.TextField(
@@ -74,6 +86,66 @@ class DownloadSection(ft.Container):
                 padding=ft.padding.symmetric(horizontal=16, vertical=8)),
                 on_click=self.paste_from_clipboard)
 
+        self.bulk_btn = ft.TextButton(
+            "BULK",
+            visible=add_bulk is not None,
+            style=ft.ButtonStyle(
+                color="white60",
+                bgcolor="white10",
+                padding=ft.padding.symmetric(horizontal=16, vertical=8)),
+                on_click=self._open_bulk_dialog)
+
+        # Toplu giriş diyaloğu
+        self.bulk_input = ft.TextField(
+            hint_text="One YouTube link per line...",
+            multiline=True,
+            min_lines=8,
+            max_lines=12,
+            text_style=ft.TextStyle(color="white", size=13),
+            border_color="white10",
+            focused_border_color=AppColors.PRIMARY,
+            width=560
+        )
+        self.bulk_resolution = ft.Dropdown(
+            width=140,
+            bgcolor=AppColors.SURFACE_ACCENT,
+            border_color="white10",
+            focused_border_color=AppColors.PRIMARY,
+            text_style=ft.TextStyle(color="white", size=13, weight=ft.FontWeight.BOLD),
+            options=[ft.dropdown.Option(x) for x in STANDARD_RESOLUTIONS.values()],
+            value=STANDARD_RESOLUTIONS[1080],
+            border_radius=12
+        )
+        self.bulk_file_picker = ft.FilePicker(on_result=self._bulk_file_picked)
+        self.bulk_dialog = ft.AlertDialog(
+            modal=True,
+            bgcolor=AppColors.SURFACE_DARK,
+            title=ft.Text("Bulk add", size=18, weight=ft.FontWeight.BOLD, color="white"),
+            content=ft.Column(
+                controls=[
+                    self.bulk_input,
+                    ft.Row(
+                        controls=[
+                            self.bulk_resolution,
+                            ft.TextButton(
+                                "OPEN .TXT",
+                                icon=ft.Icons.FOLDER_OPEN,
+                                style=ft.ButtonStyle(color="white60"),
+                                on_click=lambda e: self.bulk_file_picker.pick_files(allowed_extensions=["txt"])
+                            )
+                        ],
+                        spacing=12
+                    )
+                ],
+                tight=True,
+                spacing=12
+            ),
+            actions=[
+                ft.TextButton("CANCEL", style=ft.ButtonStyle(color="white60"), on_click=self._close_bulk_dialog),
+                ft.TextButton("ADD ALL", style=ft.ButtonStyle(color=AppColors.PRIMARY), on_click=self._submit_bulk),
+            ]
+        )
+
         self.content = ft.Column(
                 controls=[
                     ft.Text(
@@ -95,7 +167,8 @@ class DownloadSection(ft.Container):
                                     controls=[
                                         ft.Icon(ft.Icons.LINK, color=AppColors.PRIMARY, size=20),
                                         self.url_input,
-                                        self.paste_btn
+                                        self.paste_btn,
+                                        self.bulk_btn
                                     ],
                                     spacing=12
                                 )
@@ -118,6 +191,11 @@ class DownloadSection(ft.Container):
     async def _validate_and_fetch_video_info(self,e):
         self.url_input.read_only = True
         url = e.value.strip()
+        self.playlist_url = None
+
+        if self.add_playlist and is_youtube_playlist_link(url):
+            self._playlist_state(url)
+            return
 
         if not is_youtube_link_checker(url=url):
             e.error_text = "❌ Invalid YouTube URL"
@@ -175,6 +253,25 @@ class DownloadSection(ft.Container):
         self.download_btn_is_active = True
         self.update()
     
+    def _playlist_state(self, url: str):
+        """Playlist/kanal linki: tüm standart çözünürlükler seçilebilir"""
+        self.playlist_url = url
+        self.url_input.error_text = None
+        self.url_input.read_only = False
+        self.format_dropdown.options = [ft.dropdown.Option(x) for x in STANDARD_RESOLUTIONS.values()]
+        self.format_dropdown.value = STANDARD_RESOLUTIONS[1080]
+        self.download_btn.bgcolor = AppColors.PRIMARY
+        self.download_btn.content = ft.Row(
+            controls=[
+                ft.Icon(ft.Icons.PLAYLIST_ADD, color="black", size=20),
+                ft.Text("Download All", size=15, weight=ft.FontWeight.BOLD, color="black")
+            ],
+            spacing=8,
+            alignment=ft.MainAxisAlignment.CENTER
+        )
+        self.download_btn_is_active = True
+        self.update()
+
     def _error_state(self, error_message: str):
         """Hata durumu"""
         self.url_input.error_text = f"❌ {error_message}"
@@ -192,7 +289,11 @@ class DownloadSection(ft.Container):
         self.update()
     
     def _update_format_dropdown(self):
-        self.format_dropdown.options = [ft.dropdown.Option(x) for x in self.current_video_info.available_qualities]
+        # Anahtar kalite etiketi ("1080p"), metin format tablosundan gelen kesin boyutu da gösterir
+        self.format_dropdown.options = [
+            ft.dropdown.Option(key=x, text=self.current_video_info.quality_label(x))
+            for x in self.current_video_info.available_qualities
+        ]
         self.format_dropdown.value= self.current_video_info.available_qualities[0]
         self.update()
 
@@ -203,7 +304,13 @@ class DownloadSection(ft.Container):
             obs.on_video_info(info)
     
     def _on_button_click(self,e):
-        if self.page:
+        if self.page and self.playlist_url and self.add_playlist:
+            self.page.run_task(self.add_playlist,self.playlist_url,self.format_dropdown.value[:-1]) # type: ignore
+            self.playlist_url = None
+            self.download_btn_is_active = False
+            self.url_input.value = None
+            self.update()
+        elif self.page:
             self.page.run_task(self.add_task,self.current_video_info,self.format_dropdown.value[:-1]) # type: ignore
             self.url_input.value = None
             self.url_input.read_only = False
@@ -218,6 +325,39 @@ class DownloadSection(ft.Container):
                     await self._validate_and_fetch_video_info(self.url_input)
         self.update()
 
+    def did_mount(self):
+        if self.page and self.bulk_file_picker not in self.page.overlay:
+            self.page.overlay.append(self.bulk_file_picker)
+            self.page.update()
+
+    def _open_bulk_dialog(self,e):
+        if self.page:
+            self.page.open(self.bulk_dialog)
+
+    def _close_bulk_dialog(self,e):
+        if self.page:
+            self.page.close(self.bulk_dialog)
+
+    def _bulk_file_picked(self,e):
+        if not e.files or not e.files[0].path:
+            return
+        try:
+            with open(e.files[0].path, encoding="utf-8", errors="ignore") as f:
+                text = f.read()
+        except OSError as ex:
+            print(f"❌ Dosya okunamadı: {ex}")
+            return
+        current = self.bulk_input.value or ""
+        self.bulk_input.value = (current + "\n" + text).strip()
+        self.bulk_input.update()
+
+    def _submit_bulk(self,e):
+        text = self.bulk_input.value or ""
+        if self.page and self.add_bulk and text.strip():
+            self.page.run_task(self.add_bulk,text,self.bulk_resolution.value[:-1]) # type: ignore
+            self.bulk_input.value = None
+        self._close_bulk_dialog(e)
+
     def _check_url_changed(self,new_url:str):
         if new_url == "" or new_url == None:
             return False
@@ -357,23 +497,32 @@ class CurrentSelection(ft.Container,VideoQuearySelection):
         self.channel_name.value = info.channel
         self.video_title.value = info.short_title
         self.video_times.value = info.duration_formatted
-        self.video_thumbnail_url.src = info.thumbnail_url
         self.max_quality.value = info.available_qualities[0]
         self.update()
+        if self.page:
+            self.page.run_task(self._load_thumbnail, info)
+    
+    async def _load_thumbnail(self, info: VideoInfo):
+        data = await get_thumbnail_cache().get(info.video_id, info.thumbnail_url, 'preview')
+        if self.video_title.value != info.short_title:
+            return  # Bu arada başka bir video seçildi
+        if data:
+            self.video_thumbnail_url.src, self.video_thumbnail_url.src_base64 = None, data
+        else:
+            self.video_thumbnail_url.src, self.video_thumbnail_url.src_base64 = info.thumbnail_url, None
+        self.update()
 
 class DownloadQueue(ft.Container):
-    def __init__(self,downloader: RobustDownloader,file_picker:ft.FilePicker,save_path:str = "downloads"):
+    def __init__(self,downloader: RobustDownloader,file_picker:ft.FilePicker,save_path:str = "downloads",journal:Optional[DownloadJournal] = None):
        super().__init__(expand=5)
        self.downloader = downloader
+       self.journal = journal
        self.save_path = save_path
        self.file_picker =file_picker
-       self.file_picker
-       self.queue_column = ft.Column(
-           expand=True,
-           spacing=10,
-           scroll=ft.ScrollMode.ALWAYS,
-           controls=[]
-       )
+       # Kuyruk durumu UI'sız engine'de; satır (VideoTask) sadece görünür penceredeki görevler için oluşturulur
+       self.engine = DownloadEngine(downloader, journal=journal, save_path=save_path)
+       self.engine.subscribe(self._on_engine_event)
+       self.queue_view = QueueView(page_size=50, make_row=self._make_row)
        self.max_concurrent = ft.TextField(
                 hint_text="3/20",
                 hint_style=ft.TextStyle(color="white20", size=11),
@@ -385,8 +534,48 @@ class DownloadQueue(ft.Container):
                 on_blur=self.set_Max_concurrent,
                 expand=2
             )
-       self.tasks = {}
-       self.task_counter = 0
+       self.bandwidth_limit = ft.TextField(
+                hint_text="∞ MB/s",
+                hint_style=ft.TextStyle(color="white20", size=11),
+                text_style=ft.TextStyle(color="white40", size=11, weight=ft.FontWeight.BOLD),
+                border_color="transparent",
+                focused_border_color="transparent",
+                bgcolor="transparent",
+                content_padding=0,
+                tooltip="Total bandwidth limit in MB/s (0 = unlimited)",
+                on_blur=self.set_bandwidth_limit,
+                expand=2
+            )
+       self.policy_dropdown = ft.Dropdown(
+                width=110,
+                dense=True,
+                bgcolor=AppColors.SURFACE_ACCENT,
+                border_color="transparent",
+                text_style=ft.TextStyle(color="white40", size=10, weight=ft.FontWeight.BOLD),
+                options=[ft.dropdown.Option(key="fifo", text="FIFO"), ft.dropdown.Option(key="shortest", text="SHORTEST")],
+                value="fifo",
+                tooltip="Order of waiting downloads",
+                on_change=self._set_policy
+            )
+       self.prefetcher = MetadataPrefetcher(max_workers=4)
+       self.renderer = ProgressRenderer(max_fps=5)
+       self._stats_running = False
+       self.tuner = ConcurrencyTuner(downloader, demand=self.engine.waiting_demand, on_change=self._on_tuner_change)
+       self.autostart_button = ft.IconButton(
+                icon=ft.Icons.PAUSE_CIRCLE_OUTLINE,
+                icon_color="white40",
+                icon_size=18,
+                tooltip="Pause auto-start",
+                on_click=self._toggle_autostart
+            )
+       self.auto_concurrent = ft.Checkbox(
+                label="AUTO",
+                value=False,
+                label_style=ft.TextStyle(color="white40", size=10, weight=ft.FontWeight.BOLD),
+                tooltip="Tune max concurrent downloads from measured throughput",
+                on_change=self._toggle_auto_concurrent
+            )
+       self.stats_text = ft.Text("", size=10, weight=ft.FontWeight.BOLD, color="white40")
        self.defult_vid_path = ft.TextField(
                 hint_text=self.save_path,
                 hint_style=ft.TextStyle(color="white20", size=11),
@@ -406,43 +595,153 @@ class DownloadQueue(ft.Container):
                 ft.Row(
                     controls=[
                         ft.Text("DOWNLOAD QUEUE", size=10, weight=ft.FontWeight.BOLD, color="white40"),
+                        self.autostart_button,
                         self.max_concurrent,
+                        self.auto_concurrent,
+                        self.bandwidth_limit,
+                        self.policy_dropdown,
                         self.defult_vid_path,
                         ft.Container(expand=True),
                         ft.TextButton("CLEAR COMPLATED", style=ft.ButtonStyle(color=AppColors.PRIMARY, padding=0),on_click=self.remove_completed_tasks),
                     ]
                 ),
-                ft.Container(height=16),
+                self.stats_text,
+                ft.Container(height=8),
                 ft.Container(
                     expand=True,
-                    content=self.queue_column
+                    content=self.queue_view
                 )
             ]
         )
        
     
+    def did_mount(self):
+        self._stats_running = True
+        if self.page:
+            self.page.run_task(self._stats_loop)
+            self.page.run_task(self._start_runner)
+
+    def will_unmount(self):
+        self._stats_running = False
+        self.tuner.stop()
+        self.engine.janitor.stop()
+
+    async def _start_runner(self):
+        self.engine.start()
+
+    def _make_row(self, job:DownloadJob):
+        return VideoTask(job, queue_ref=self, file_picker=self.file_picker)
+
+    def _on_engine_event(self, event:str, payload):
+        """Engine'deki sıralı listeyi görünüme yansıt"""
+        if event == "added":
+            self.queue_view.extend(payload)
+        elif event == "removed":
+            self.renderer.discard(payload)
+            self.queue_view.remove(payload)
+        elif event == "moved":
+            self.queue_view.move_to_front(payload)
+
+    def _toggle_autostart(self,e):
+        if self.engine.runner.is_paused:
+            self.engine.runner.resume()
+            self.autostart_button.icon = ft.Icons.PAUSE_CIRCLE_OUTLINE
+            self.autostart_button.tooltip = "Pause auto-start"
+        else:
+            self.engine.runner.pause()
+            self.autostart_button.icon = ft.Icons.PLAY_CIRCLE_OUTLINE
+            self.autostart_button.tooltip = "Resume auto-start"
+        self.autostart_button.update()
+
+    async def shutdown(self, timeout:float = 3.0):
+        """Uygulama kapanırken: yeni indirme başlatma, bitenleri bekle, kalanları durdur
+
+        Süresi içinde bitmeyen indirmeler journal'a iptal olarak yazılmaz; böylece
+        bir sonraki açılışta 'waiting' olarak geri yüklenip kaldığı yerden başlar.
+        """
+        self._stats_running = False
+        self.tuner.stop()
+        await self.engine.shutdown(timeout)
+        self.prefetcher.shutdown()
+
+    async def _stats_loop(self):
+        """Kuyruk başlığındaki hız / ETA / tamamlanma süresi özetini saniyede bir yenile"""
+        while self._stats_running:
+            await asyncio.sleep(1)
+            try:
+                stats = await self.downloader.get_stats(extra_waiting_bytes=self.engine.waiting_bytes())
+                text = self._format_stats(stats)
+                if text != self.stats_text.value:
+                    self.stats_text.value = text
+                    self.stats_text.update()
+            except Exception as e:
+                print(f"❌ İstatistik hatası: {e}")
+
+    @staticmethod
+    def _format_stats(stats:dict) -> str:
+        def fmt_time(seconds):
+            if not seconds:
+                return "--"
+            minutes, seconds = divmod(int(seconds), 60)
+            hours, minutes = divmod(minutes, 60)
+            if hours:
+                return f"{hours}h {minutes}m"
+            return f"{minutes}m {seconds}s" if minutes else f"{seconds}s"
+
+        if not stats['active_downloads'] and not stats['completed']:
+            return ""
+        return (
+            f"{stats['queue_rate'] / 1024 / 1024:.2f} MB/s  ·  "
+            f"{stats['active_downloads']} active, {stats['waiting_downloads']} waiting  ·  "
+            f"ETA {fmt_time(stats['queue_eta'])}  ·  "
+            f"p50 {fmt_time(stats['completion_p50'])} / p95 {fmt_time(stats['completion_p95'])}"
+        )
+
     async def add_video(self,info:VideoInfo,res:str):
-        self.task_counter += 1
-        video_ids = f"video_{self.task_counter}_{int(datetime.now().timestamp())}"
+        return await self.engine.add(info, res, self.save_path)
 
-        task = VideoTask(video_id=video_ids,downloader=self.downloader,video_info=info,save_path=self.save_path,resolution=res,queue_ref=self,file_picker=self.file_picker) 
+    async def add_playlist(self,url:str,res:str):
+        """Playlist/kanal girdilerini geldikçe kuyruğa ekle ve başlat
 
-        self.tasks[video_ids] = task
-        self.queue_column.controls.insert(0,task)
-        self.update()
+        Tam metadata her görev downloader'dan slot aldığında çekilir, bu yüzden
+        ilk video liste bitmeden inmeye başlar.
+        """
+        count = 0
+        try:
+            async for info in iter_playlist_entries(url):
+                job = await self.add_video(info,res)
+                if self.page and not self.engine.runner.is_running:
+                    self.page.run_task(job.start)
+                count += 1
+        except Exception as ex:
+            print(f"❌ Playlist okunamadı: {ex}")
+        print(f"📃 Playlist'ten {count} video kuyruğa eklendi")
+
+    async def restore_from_journal(self):
+        """Uygulama açılışında kuyruğu journal'dan geri yükle (staging temizliği de başlar)"""
+        await self.engine.restore()
+
+    async def add_bulk(self,text:str,res:str):
+        """Toplu URL listesini doğrula, tekilleştir ve çözüldükçe kuyruğa ekle"""
+        urls, invalid = self.prefetcher.parse_urls(text)
+        if invalid:
+            print(f"⚠️ {len(invalid)} geçersiz satır atlandı")
+        print(f"🔍 {len(urls)} video için metadata çekiliyor")
+
+        added = 0
+        async for url, info, error in self.prefetcher.resolve(urls):
+            if error is not None:
+                print(f"❌ {url}: {error}")
+                continue
+            await self.add_video(info,res)
+            added += 1
+        print(f"✅ Toplu ekleme tamamlandı: {added}/{len(urls)}")
 
     async def remove_task(self, video_id):
-        if video_id in self.tasks:
-            task = self.tasks[video_id]
-            self.queue_column.controls.remove(task)
-            del self.tasks[video_id]
-            self.task_counter -= 1
-            self.update()
+        await self.engine.remove(video_id)
     
     async def remove_completed_tasks(self,e):
-        tasks = {id: task for id, task in self.tasks.items() if task.status =="completed"}
-        for i in tasks:
-            await self.remove_task(i)
+        await self.engine.remove_completed()
 
     async def set_Max_concurrent(self,e):
         value = e.control.value
@@ -453,15 +752,56 @@ class DownloadQueue(ft.Container):
             
         self.update() 
     
+    async def move_to_front(self, video_id):
+        await self.engine.move_to_front(video_id)
+
+    async def set_priority(self, video_id, priority):
+        await self.engine.set_priority(video_id, priority)
+
+    async def _set_policy(self,e):
+        await self.engine.set_scheduling_policy(e.control.value)
+
+    async def set_bandwidth_limit(self,e):
+        value = (e.control.value or "").strip().replace(",", ".")
+        try:
+            mb_per_sec = float(value)
+        except ValueError:
+            mb_per_sec = None
+        if mb_per_sec is not None and mb_per_sec >= 0:
+            await self.downloader.set_bandwidth_limit(mb_per_sec * 1024 * 1024)
+            self.bandwidth_limit.hint_text = f"{mb_per_sec:g} MB/s" if mb_per_sec > 0 else "∞ MB/s"
+            self.bandwidth_limit.value = None
+        self.update()
+
+    def _toggle_auto_concurrent(self,e):
+        if self.auto_concurrent.value:
+            self.tuner.start()
+            self.max_concurrent.read_only = True
+        else:
+            self.tuner.stop()
+            self.max_concurrent.read_only = False
+        self.update()
+
+    def _on_tuner_change(self,new_limit:int):
+        self.max_concurrent.hint_text = f"{new_limit}/20"
+        self.max_concurrent.update()
+
     def _set_defult_path(self,e):
         value = e.control.value
         if value != "":
             self.save_path = value
+            self.engine.save_path = value
             self.defult_vid_path.hint_text = value[:32] + "..." if len(value) > 32 else value
             self.defult_vid_path.value = None
         self.defult_vid_path.update()
 class VideoTask(ft.Container):
-    def __init__(self, video_id, downloader, video_info, save_path:str, resolution:str, queue_ref, file_picker:ft.FilePicker):
+    """Kuyruktaki bir DownloadJob'un satır görünümü
+
+    Durumun tamamı job'da; satır sadece görünür penceredeyken vardır, mount
+    olunca job'a abone olur ve kontrollerini job'un o anki durumundan kurar.
+    Butonlar job'un metotlarını çağırır.
+    """
+    def __init__(self, job:DownloadJob, queue_ref, file_picker:ft.FilePicker):
         super().__init__(
             bgcolor="#1A1D24",
             border_radius=12,
@@ -472,30 +812,18 @@ class VideoTask(ft.Container):
             height=75,
         )
 
-        self.downloader = downloader
-        self.video_info = video_info
-        self.video_id = video_id   
-        self.save_path = save_path
-        self.resolutions = resolution
+        self.job = job
         self.queue_ref = queue_ref
         self.file_picker = file_picker
-        self.file_picker.on_result = self._file_picker
-        self.status = "waiting"
-        
-        # ✅ İptal kontrolü için lock ve flag
-        self._is_cancelled = False
-        self._cancel_lock = asyncio.Lock()
-        self._download_task = None
+        self._unsubscribe = None
         
         # UI Components
         self.video_title = ft.Text(
-            value=f"({self.resolutions}p) {self.video_info.short_title}", 
             size=11, 
             weight=ft.FontWeight.BOLD, 
             color="white",
             max_lines=1,
             overflow=ft.TextOverflow.ELLIPSIS,
-            tooltip=self.video_info.title,
             expand=True
         )
         self.pb_percent = ft.Text("0%", size=11, weight=ft.FontWeight.BOLD, color="#FF6A00")
@@ -532,8 +860,41 @@ class VideoTask(ft.Container):
             on_click=self.remove_from_queue
         )
         
+        # Uzaktaki tam boy görsel yerine thumbnail servisinin küçük kopyası (did_mount'ta yüklenir)
+        self.thumbnail = ft.Image(src_base64=PLACEHOLDER_BASE64, fit=ft.ImageFit.COVER)
+        
+        # Menü, hover paneli ve satır yerleşimi build'de kurulur
+        self.priority_menu = None
+        self.down_content_path = None
+        self.down_content = None
+        self.content = None
+
+    @property
+    def video_id(self):
+        return self.job.video_id
+
+    def build(self):
+        """Satır sayfaya eklenirken yerleşimi job'un güncel durumundan kur"""
+        if self.content is not None:
+            self.render_state()
+            return
+        job = self.job
+        
+        self.priority_menu = ft.PopupMenuButton(
+            icon=ft.Icons.MORE_VERT,
+            icon_color="white70",
+            icon_size=18,
+            tooltip="Queue order",
+            items=[
+                ft.PopupMenuItem(text="Move to front", icon=ft.Icons.VERTICAL_ALIGN_TOP, on_click=self._move_to_front),
+                ft.PopupMenuItem(),
+                ft.PopupMenuItem(text="High priority", on_click=partial(self._set_priority, Priority.HIGH)),
+                ft.PopupMenuItem(text="Normal priority", on_click=partial(self._set_priority, Priority.NORMAL)),
+                ft.PopupMenuItem(text="Low priority", on_click=partial(self._set_priority, Priority.LOW)),
+            ]
+        )
+        
         self.down_content_path = ft.Text(
-            value=self.save_path,
             size=10,
             overflow=ft.TextOverflow.ELLIPSIS,
             max_lines=1
@@ -569,14 +930,14 @@ class VideoTask(ft.Container):
                                         ft.Row(
                                             controls=[
                                                 ft.Radio(
-                                                    label=x,
+                                                    label=job.video_info.quality_label(x),
                                                     value=x[:-1],
                                                     scale=0.9,
                                                     label_style=ft.TextStyle(size=13)
                                                 ) for x in (
-                                                    self.video_info.available_qualities[:5] 
-                                                    if len(self.video_info.available_qualities) > 5 
-                                                    else self.video_info.available_qualities
+                                                    job.video_info.available_qualities[:5] 
+                                                    if len(job.video_info.available_qualities) > 5 
+                                                    else job.video_info.available_qualities
                                                 )
                                             ],
                                             wrap=True,
@@ -587,16 +948,16 @@ class VideoTask(ft.Container):
                                         ft.Row(
                                             controls=[
                                                 ft.Radio(
-                                                    label=x,
+                                                    label=job.video_info.quality_label(x),
                                                     scale=0.9,
                                                     label_style=ft.TextStyle(size=13),
                                                     value=x[:-1]
-                                                ) for x in self.video_info.available_qualities[5:]
-                                            ] if len(self.video_info.available_qualities) > 5 else [],
+                                                ) for x in job.video_info.available_qualities[5:]
+                                            ] if len(job.video_info.available_qualities) > 5 else [],
                                         )
                                     ]
                                 ),
-                                value=self.resolutions,
+                                value=job.resolution,
                                 on_change=self._update_resolutions
                             )               
                         ]
@@ -619,10 +980,7 @@ class VideoTask(ft.Container):
                             border_radius=8,
                             bgcolor="#000000",
                             border=ft.border.all(1, "white10"),
-                            content=ft.Image(
-                                src=self.video_info.thumbnail_url,
-                                fit=ft.ImageFit.COVER
-                            )
+                            content=self.thumbnail
                         ),
                         ft.Column(
                             controls=[
@@ -641,213 +999,178 @@ class VideoTask(ft.Container):
                         ),
                         self.button,
                         self.button_cancel,
-                        self.button_rm
+                        self.button_rm,
+                        self.priority_menu
                     ],
                     spacing=12
                 ),
                 self.down_content
             ]
         )
+        self.render_state()
 
-    async def start_download(self, e):
-        """✅ Geliştirilmiş download başlatma"""
-        async with self._cancel_lock:
-            if self.status == "downloading":
-                return
-            
-            print(f"🎬 Download başlatılıyor: {self.video_info.title}")
-            
-            # ✅ Flag'i sıfırla - RESTART için kritik
-            self._is_cancelled = False
-            
-            # UI'ı indirme moduna geçir
-            self.status = "downloading"
-            self.button.visible = False
-            self.button_cancel.visible = True
-            self.button.icon = ft.Icons.PLAY_ARROW
-            self.pb.value = 0
-            self.pb.color = "#FF6A00"
-            self.pb_percent.value = "0%"
-            self.pb_percent.color = "#FF6A00"
-            self.video_title.value = f"({self.resolutions}p) {self.video_info.short_title}"
-            self.video_title.color = "white"
-            self.download_speed.value = "0.0 MB/s"
-            self.left_time.value = "-- mins left"
-            self.height = 75
-            self.down_content.visible = False
-            self.down_content.opacity = 0
-            self.update()
+    def did_mount(self):
+        self._unsubscribe = self.job.subscribe(self._on_job_event)
+        if self.page:
+            self.page.run_task(self._load_thumbnail)
 
-        try:
-            result = await self.downloader.download(
-                video_id=self.video_id,
-                url=self.video_info.url,
-                save_path=self.save_path,
-                resolution=self.resolutions,
-                progress_callback=self.progress_callback
-            )
+    def will_unmount(self):
+        # Pencereden çıkan satır job'dan ayrılır; job kendi başına ilerlemeye devam eder
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
 
-            # ✅ İptal durumunu kontrol et
-            async with self._cancel_lock:
-                if self._is_cancelled:
-                    print(f"⚠️ Download tamamlandı ama iptal edilmişti: {self.video_info.title}")
-                    return
-
-            # ✅ Sonuçları işle
-            if result == "Success":
-                async with self._cancel_lock:
-                    self.status = "completed"
-                    self.video_title.value = f"✓ {self.video_title.value}"
-                    self.video_title.color = "#10B981"
-                    self.pb.value = 1
-                    self.pb.color = "#10B981"
-                    self.pb_percent.value = "100%"
-                    self.pb_percent.color = "#10B981"
-                    self.download_speed.value = "Completed"
-                    self.left_time.value = "Done!"
-                    self.left_time.color = "#10B981"
-                    self.button_cancel.visible = False
-                    self.button.visible = False
-                    self.button_rm.visible = True
-                print(f"✅ Download tamamlandı: {self.video_info.title}")
-            
-            elif result == "Cancelled":
-                print(f"⚠️ Downloader 'Cancelled' döndü: {self.video_info.title}")
-                # UI zaten cancel_download tarafından güncellendi
-            
-            else:
-                async with self._cancel_lock:
-                    self.status = "error"
-                    self.video_title.value = f"✗ {self.video_title.value}"
-                    self.video_title.color = "#EF4444"
-                    self.download_speed.value = f"Error: {result[:20]}"
-                    self.left_time.value = ""
-                    self.button.visible = True
-                    self.button_cancel.visible = False
-                    self.button_rm.visible = True
-                print(f"❌ Download hatası: {self.video_info.title}: {result}")
+    def update(self):
+        # Görünür pencerenin dışındaysa çizilecek bir şey yok; değerler bir sonraki build'de görünür
+        if self.page is not None:
+            super().update()
 
-        except Exception as ex:
-            async with self._cancel_lock:
-                if not self._is_cancelled:
-                    self.status = "error"
-                    self.video_title.value = f"✗ ({self.resolutions}p) {self.video_info.short_title}"
-                    self.video_title.color = "#EF4444"
-                    self.download_speed.value = f"Exception: {str(ex)[:20]}"
-                    self.button.visible = True
-                    self.button_cancel.visible = False
-                    print(f"❌ Exception: {self.video_info.title}: {str(ex)}")
+    def _on_job_event(self, job, event):
+        if event == "progress":
+            # Sayfayı burada güncelleme: renderer bir sonraki karede toplu çizer
+            self.queue_ref.renderer.mark_dirty(self)
+        else:
+            self.render_state()
+            self.update()
 
-        finally:
-            async with self._cancel_lock:
-                if not self._is_cancelled:
-                    self.update()
+    # ============== JOB -> KONTROLLER ==============
 
-    async def cancel_download(self, e):
-        """✅ Tamamen yeniden yazılmış cancel fonksiyonu"""
-        async with self._cancel_lock:
-            # 1. Durum kontrolü
-            if self._is_cancelled:
-                print(f"⚠️ Zaten iptal ediliyor: {self.video_info.title}")
-                return
-            
-            if self.status not in ["downloading", "waiting"]:
-                print(f"⚠️ İptal edilemez durum: {self.status}")
-                return
-            
-            print(f"🛑 İptal başlatılıyor: {self.video_info.title}")
-            
-            # 2. Flag'i set et (progress_callback'i durdurur)
-            self._is_cancelled = True
-            
-            # 3. UI'ı "cancelling" durumuna çek
-            self.status = "cancelling"
-            self.video_title.value = f"⏸ ({self.resolutions}p) {self.video_info.short_title}"
+    def render_state(self):
+        """Job'un durumunu (başlık, renkler, butonlar, progress) kontrollere uygula"""
+        job = self.job
+        title = f"({job.resolution}p) {job.video_info.short_title}"
+        self.video_title.tooltip = job.video_info.title
+        self.pb.value = round(min(job.percentage / 100.0, 1.0), 3)
+        self.pb_percent.value = f"{int(job.percentage)}%"
+        self.pb.color = self.pb_percent.color = "#FF6A00"
+        self.left_time.color = "#FF6A00CC"
+        self.button.icon = ft.Icons.PLAY_ARROW
+        self.button.visible = True
+        self.button_cancel.visible = False
+        self.button_cancel.disabled = False
+
+        if job.status == "downloading":
+            self.video_title.value = title
+            self.video_title.color = "white"
+            self.download_speed.value = "0.0 MB/s"
+            self.left_time.value = "-- mins left"
+            self.button.visible = False
+            self.button_cancel.visible = True
+            self.render_progress()
+        elif job.status == "completed":
+            self.video_title.value = f"✓ {title}"
+            self.video_title.color = "#10B981"
+            self.pb.color = self.pb_percent.color = self.left_time.color = "#10B981"
+            self.download_speed.value = "Completed"
+            self.left_time.value = "Done!"
+            self.button.visible = False
+        elif job.status == "error":
+            self.video_title.value = f"✗ {title}"
+            self.video_title.color = "#EF4444"
+            self.download_speed.value = f"Error: {job.error[:20]}"
+            self.left_time.value = ""
+        elif job.status == "cancelling":
+            self.video_title.value = f"⏸ {title}"
             self.video_title.color = "#F59E0B"
             self.download_speed.value = "Cancelling..."
+            self.button.visible = False
+            self.button_cancel.visible = True
             self.button_cancel.disabled = True
-            self.update()
-        
-        # 4. Downloader'ı iptal et (lock dışında, çünkü await var)
-        try:
-            await self.downloader.cancel(self.video_id)
-            print(f"✅ Downloader.cancel() tamamlandı: {self.video_info.title}")
-        except Exception as ex:
-            print(f"❌ Cancel error: {ex}")
-        
-        # 5. Callback'lerin durması için extra bekleme
-        await asyncio.sleep(0.8)
-        
-        # 6. Final UI güncellemesi
-        async with self._cancel_lock:
-            self.status = "cancelled"
-            self.video_title.value = f"✗ ({self.resolutions}p) {self.video_info.short_title}"
+        elif job.status == "cancelled":
+            self.video_title.value = f"✗ {title}"
             self.video_title.color = "#F59E0B"
             self.download_speed.value = "Cancelled"
             self.left_time.value = ""
-            
-            # Button state
-            self.button_cancel.visible = False
-            self.button_cancel.disabled = False
-            self.button.visible = True
             self.button.icon = ft.Icons.REFRESH
-            self.button_rm.visible = True
-            
-            self.update()
-        
-        print(f"✅ İptal UI güncellemesi tamamlandı: {self.video_info.title}")
+        else:
+            self.video_title.value = title
+            self.video_title.color = "white"
+            self.download_speed.value = "Interrupted" if job.interrupted else "0.0 MB/s"
+            self.left_time.value = "-- mins left"
+            if job.interrupted:
+                self.button.icon = ft.Icons.REFRESH
 
-    async def remove_from_queue(self, e):
-        """✅ Queue'dan kaldırma"""
-        print(f"🗑️ Queue'dan kaldırılıyor: {self.video_info.title}")
-        
-        async with self._cancel_lock:
-            if self.status == "downloading":
-                self._is_cancelled = True
-        
-        # Downloading ise önce iptal et
-        if self.status == "downloading":
-            try:
-                await self.downloader.cancel(self.video_id)
-                await asyncio.sleep(0.5)
-            except Exception as ex:
-                print(f"Remove cancel error: {ex}")
+        if self.priority_menu is not None:
+            for item, value in zip(self.priority_menu.items[2:], (Priority.HIGH, Priority.NORMAL, Priority.LOW)):  # type: ignore
+                item.checked = value == job.priority
+        if self.down_content_path is not None:
+            self.down_content_path.value = job.save_path
+        if self.down_content is not None and job.status != "waiting":
+            self.height = 75
+            self.down_content.visible = False
+            self.down_content.opacity = 0
+
+    def render_progress(self):
+        """Job'un son progress'ini kontrollere uygula; sadece değişen kontrolleri döndür"""
+        job = self.job
+        if job.is_cancelled or job.status != "downloading":
+            return []
+
+        speed = job.speed / 1024 / 1024
+        changed = []
+
+        pb_value = round(min(job.percentage / 100.0, 1.0), 3)
+        if self.pb.value != pb_value:
+            self.pb.value = pb_value
+            changed.append(self.pb)
+
+        percent_text = f"{int(job.percentage)}%"
+        if self.pb_percent.value != percent_text:
+            self.pb_percent.value = percent_text
+            changed.append(self.pb_percent)
+
+        if speed > 0:
+            speed_text = f"{speed:.2f} MB/s"
+            if self.download_speed.value != speed_text:
+                self.download_speed.value = speed_text
+                changed.append(self.download_speed)
         
-        await self.queue_ref.remove_task(self.video_id)
-        print(f"✅ Queue'dan kaldırıldı: {self.video_info.title}")
+        if job.eta > 0:
+            minutes, seconds = divmod(int(job.eta), 60)
+            eta_text = f"{minutes}m {seconds}s left" if minutes > 0 else f"{seconds}s left"
+            if self.left_time.value != eta_text:
+                self.left_time.value = eta_text
+                changed.append(self.left_time)
 
-    def progress_callback(self, data):
-        """✅ Progress callback - iptal kontrolü eklenmiş"""
-        try:
-            # ✅ İptal edildiyse callback'i atla
-            if self._is_cancelled or self.status not in ["downloading"]:
-                return
-            
-            percentage = data.get('percentage', 0)
-            speed = data.get('speed', 0) / 1024 / 1024
-            eta = data.get('eta', 0)
+        return changed
 
-            self.pb.value = min(percentage / 100.0, 1.0)
-            self.pb_percent.value = f"{int(percentage)}%"
+    # ============== OLAYLAR ==============
 
-            if speed > 0:
-                self.download_speed.value = f"{speed:.2f} MB/s"
-            
-            if eta > 0:
-                minutes, seconds = divmod(int(eta), 60)
-                if minutes > 0:
-                    self.left_time.value = f"{minutes}m {seconds}s left"
-                else:
-                    self.left_time.value = f"{seconds}s left"
-
-            if self.page:
-                self.page.update()
-            
-        except Exception as e:
-            pass
+    async def start_download(self, e):
+        await self.job.start()
+
+    async def cancel_download(self, e):
+        await self.job.cancel()
+
+    async def remove_from_queue(self, e):
+        print(f"🗑️ Queue'dan kaldırılıyor: {self.job.video_info.title}")
+        await self.queue_ref.remove_task(self.job.video_id)
+        print(f"✅ Queue'dan kaldırıldı: {self.job.video_info.title}")
+
+    async def _move_to_front(self, e):
+        await self.queue_ref.move_to_front(self.job.video_id)
+
+    async def _set_priority(self, priority, e=None):
+        await self.queue_ref.set_priority(self.job.video_id, priority)
+    
+    async def _load_thumbnail(self):
+        info = self.job.video_info
+        data = await get_thumbnail_cache().get(self.job.canonical_id, info.thumbnail_url, 'row')
+        if data:
+            self.thumbnail.src_base64 = data
+        elif info.thumbnail_url:
+            # Servis alamadıysa eskisi gibi uzak URL
+            self.thumbnail.src_base64 = None
+            self.thumbnail.src = info.thumbnail_url
+        else:
+            return
+        if self.thumbnail.page:
+            self.thumbnail.update()
     
     def _on_hover(self, e):
-        if e.data == "true" and self.status == "waiting":
+        if self.down_content is None:
+            return
+        if e.data == "true" and self.job.status == "waiting":
             self.height = 200
             self.down_content.opacity = 1
             self.down_content.visible = True
@@ -859,14 +1182,12 @@ class VideoTask(ft.Container):
         
     def _file_picker(self, e):
         if e.path:
-            self.save_path = e.path
-            self.down_content_path.value = e.path
-        self.update()
+            self.job.set_save_path(e.path)
     
     def _select_folder(self, e):
+        # FilePicker bütün satırlarda ortak: sonucu klasörü soran satıra yönlendir
+        self.file_picker.on_result = self._file_picker
         self.file_picker.get_directory_path()
 
     def _update_resolutions(self, e):
-        self.resolutions = e.control.value
-        self.video_title.value = f"({self.resolutions}p) {self.video_info.short_title}"
-        self.update()
\ No newline at end of file
+        self.job.set_resolution(e.control.value)
@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+
+class ProgressRenderer:
+    """Kirli (dirty) görevleri toplayıp tek bir toplu update ile çizen render döngüsü
+
+    Görevler her progress'te sayfayı güncellemek yerine mark_dirty() çağırır.
+    Renderer en fazla max_fps kez/saniye flush eder; her görev sadece değeri
+    gerçekten değişen kontrollerini döndürür ve hepsi tek page.update(*controls)
+    çağrısıyla Flet'e gönderilir.
+    """
+
+    def __init__(self, max_fps: float = 5):
+        self.max_fps = max_fps
+        self._dirty = {}
+        self._handle = None
+        self._last_flush = 0.0
+        self._page = None
+
+    def set_max_fps(self, max_fps: float):
+        self.max_fps = max(0.5, max_fps)
+
+    def mark_dirty(self, task):
+        """Görevi bir sonraki karede çizilmek üzere işaretle (event loop thread'inden)"""
+        if task.page is None:
+            return
+        self._page = task.page
+        self._dirty[task.video_id] = task
+        if self._handle is None:
+            delay = max(0.0, self._last_flush + 1.0 / self.max_fps - time.monotonic())
+            self._handle = asyncio.get_running_loop().call_later(delay, self.flush)
+
+    def discard(self, task):
+        self._dirty.pop(task.video_id, None)
+
+    def flush(self):
+        self._handle = None
+        self._last_flush = time.monotonic()
+        dirty, self._dirty = self._dirty, {}
+
+        controls = []
+        for task in dirty.values():
+            if task.page is not None:
+                controls.extend(task.render_progress())
+
+        if controls and self._page is not None:
+            try:
+                self._page.update(*controls)
+            except Exception as e:
+                print(f"❌ Render hatası: {e}")
@@ -0,0 +1,163 @@
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterator, List, Optional
+
+import flet as ft
+
+
+class QueueView(ft.Column):
+    """Kuyruğun sayfalı (sanal) görünümü
+
+    Görevlerin tamamı sıralı `items` listesinde model kaydı olarak durur;
+    satır kontrolleri `make_row(item)` ile sadece görünür penceredeki
+    `page_size` kayıt için oluşturulur, pencereden çıkanlar bırakılır. Pencere
+    dışındaki bir ekleme/çıkarma sadece sayaç metnini günceller, pencere
+    içindekiler ise en fazla `page_size` satırlık bir diff'e yol açar; yani
+    Flet'e giden iş kuyruğun uzunluğundan bağımsızdır.
+
+    Kaydın konumu `list.index` taraması yerine sıra numarası haritasından
+    bulunur: silinen kayıtların numaraları sıralı `_removed` listesinde tutulur
+    ve konum = numara - kendinden önce silinen sayısı (bisect). Silinenler
+    `RENUMBER_AFTER`'ı geçince harita bir kez baştan numaralandırılır.
+    """
+
+    RENUMBER_AFTER = 64
+
+    def __init__(self, page_size: int = 50, make_row: Optional[Callable[[object], ft.Control]] = None):
+        self.items: List = []
+        self.page_size = page_size
+        self.window_start = 0
+        self.make_row = make_row
+        self._views: Dict[object, ft.Control] = {}  # Sadece görünür kayıtların satırları
+        self._order: Dict[object, int] = {}         # Kayıt -> sıra numarası (silinenler düşülmeden)
+        self._removed: List[int] = []               # Son numaralandırmadan beri silinenlerin numaraları
+
+        self.rows = ft.Column(expand=True, spacing=10, scroll=ft.ScrollMode.ALWAYS, controls=[])
+        self.page_text = ft.Text("", size=10, weight=ft.FontWeight.BOLD, color="white40")
+        self.prev_button = ft.IconButton(
+            icon=ft.Icons.CHEVRON_LEFT, icon_color="white70", icon_size=18, on_click=self._prev_page
+        )
+        self.next_button = ft.IconButton(
+            icon=ft.Icons.CHEVRON_RIGHT, icon_color="white70", icon_size=18, on_click=self._next_page
+        )
+        self.pager = ft.Row(
+            controls=[self.prev_button, self.page_text, self.next_button],
+            alignment=ft.MainAxisAlignment.CENTER,
+            visible=False,
+        )
+        super().__init__(expand=True, spacing=4, controls=[self.rows, self.pager])
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.items)
+
+    # ============== MODEL ==============
+
+    def append(self, item):
+        self._push(item)
+        self._changed(len(self.items) - 1)
+
+    def extend(self, items):
+        start = len(self.items)
+        for item in items:
+            self._push(item)
+        self._changed(start)
+
+    def remove(self, item):
+        index = self.index(item)
+        del self.items[index]
+        insort(self._removed, self._order.pop(item))
+        if len(self._removed) > self.RENUMBER_AFTER:
+            self._renumber()
+        self._changed(index)
+
+    def move_to_front(self, item):
+        del self.items[self.index(item)]
+        self.items.insert(0, item)
+        self._renumber()
+        self.window_start = 0
+        self._changed(0)
+
+    def show(self, item):
+        """Görevin bulunduğu sayfaya git"""
+        index = self.index(item)
+        self.window_start = index - index % self.page_size
+        self._render()
+
+    def index(self, item) -> int:
+        """Kaydın listedeki konumu; yoksa ValueError (list.index gibi)"""
+        number = self._order.get(item)
+        if number is None:
+            raise ValueError(f"{item!r} kuyrukta değil")
+        return number - bisect_left(self._removed, number)
+
+    def _push(self, item):
+        # Yeni numara silinenlerin hepsinden büyük: konumu tam olarak sona düşer
+        self._order[item] = len(self.items) + len(self._removed)
+        self.items.append(item)
+
+    def _renumber(self):
+        self._order = {item: i for i, item in enumerate(self.items)}
+        self._removed = []
+
+    # ============== GÖRÜNÜM ==============
+
+    def _changed(self, index: int):
+        if index >= self.window_start + self.page_size:
+            # Pencerenin arkasında: görünen satırlar aynı, sadece sayaç değişir
+            self._render_pager()
+        else:
+            self._render()
+
+    def _render(self):
+        if self.window_start >= len(self.items):
+            self.window_start = max(0, (len(self.items) - 1) // self.page_size * self.page_size)
+        visible = self.items[self.window_start:self.window_start + self.page_size]
+        if self.make_row is not None:
+            views = {}
+            for item in visible:
+                view = self._views.get(item)
+                views[item] = view if view is not None else self.make_row(item)
+            self._views = views
+            visible = list(views.values())
+        changed = []
+        if visible != self.rows.controls:
+            self.rows.controls = visible
+            changed.append(self.rows)
+        changed.extend(self._pager_changes())
+        self._update(*changed)
+
+    def _render_pager(self):
+        self._update(*self._pager_changes())
+
+    def _pager_changes(self) -> list:
+        total = len(self.items)
+        visible = total > self.page_size
+        first = self.window_start + 1 if total else 0
+        last = min(self.window_start + self.page_size, total)
+        text = f"{first}–{last} / {total}"
+        prev_disabled = self.window_start == 0
+        next_disabled = last >= total
+
+        if (self.pager.visible, self.page_text.value, self.prev_button.disabled, self.next_button.disabled) == \
+                (visible, text, prev_disabled, next_disabled):
+            return []
+        self.pager.visible = visible
+        self.page_text.value = text
+        self.prev_button.disabled = prev_disabled
+        self.next_button.disabled = next_disabled
+        return [self.pager]
+
+    def _update(self, *controls):
+        if controls and self.page is not None:
+            self.page.update(*controls)
+
+    def _prev_page(self, e):
+        self.window_start = max(0, self.window_start - self.page_size)
+        self._render()
+
+    def _next_page(self, e):
+        if self.window_start + self.page_size < len(self.items):
+            self.window_start += self.page_size
+            self._render()
@@ -0,0 +1,131 @@
+"""Fragment fan-out benchmark'ı: bağlantı başına hız sınırlı, Range destekli yerel sunucuya karşı
+
+Çalıştırma: python tests/benchmarks/bench_fanout.py
+
+Sunucu tek bir dosyayı ve onu EXT-X-BYTERANGE parçalarına bölen bir HLS listesini
+sunar (YouTube'un 'dashy' ile range'li parçalara çevrilen HTTPS formatlarına
+benzer). Her bağlantı ayrı ayrı yavaşlatılır; böylece tek bağlantılı indirme
+sunucunun bağlantı başına sınırına takılır, fan-out ise boştaki slotları ek
+bağlantı olarak kullanır. Sunucu aynı anda açık bağlantı sayısının tepesini de
+ölçer: bu, downloader'ın max_concurrent bütçesini hiç aşmamalıdır.
+"""
+import asyncio
+import contextlib
+import http.server
+import io
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "src"))
+
+from models.downloader import RobustDownloader  # noqa: E402
+
+MB = 1024 * 1024
+SIZE = 4 * MB
+FRAGMENT = 256 * 1024
+PER_CONNECTION_RATE = 1 * MB  # bytes/sn
+LIMIT = 4
+
+
+class ThrottledRangeHandler(http.server.BaseHTTPRequestHandler):
+    """Range isteklerini destekleyen, her bağlantıyı PER_CONNECTION_RATE ile sınırlayan handler"""
+
+    protocol_version = "HTTP/1.1"
+    payload = b""
+    playlist = b""
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.endswith(".m3u8"):
+            return self._send(200, self.playlist, "application/vnd.apple.mpegurl")
+
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            start, end = 0, len(self.payload) - 1
+            match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+            if match:
+                start = int(match.group(1))
+                end = int(match.group(2)) if match.group(2) else end
+            body = self.payload[start:end + 1]
+            self.send_response(206 if match else 200)
+            self.send_header("Content-Type", "video/mp2t")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Accept-Ranges", "bytes")
+            if match:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(self.payload)}")
+            self.end_headers()
+            chunk = 64 * 1024
+            for offset in range(0, len(body), chunk):
+                # Önce bekle: son parça yazılınca istemci bağlantıyı hemen bırakabilsin
+                time.sleep(chunk / PER_CONNECTION_RATE)
+                self.wfile.write(body[offset:offset + chunk])
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _playlist(size, fragment):
+    lines = ["#EXTM3U", "#EXT-X-VERSION:4", "#EXT-X-TARGETDURATION:1", "#EXT-X-MEDIA-SEQUENCE:0"]
+    for offset in range(0, size, fragment):
+        lines += ["#EXTINF:1.0,", f"#EXT-X-BYTERANGE:{min(fragment, size - offset)}@{offset}", "video.ts"]
+    lines.append("#EXT-X-ENDLIST")
+    return ("\n".join(lines) + "\n").encode()
+
+
+def serve():
+    ThrottledRangeHandler.payload = os.urandom(SIZE)
+    ThrottledRangeHandler.playlist = _playlist(SIZE, FRAGMENT)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ThrottledRangeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/video.m3u8"
+
+
+async def _download(url, fanout, out):
+    downloader = RobustDownloader(LIMIT, max_fragment_fanout=fanout)
+    ThrottledRangeHandler.peak = 0
+    start = time.monotonic()
+    result = await downloader.download(f"fanout_{fanout}", url, out)
+    return result, time.monotonic() - start, ThrottledRangeHandler.peak
+
+
+def run(fanouts=(1, 2, 4)):
+    """{fanout: (sonuç, süre, sunucudaki tepe bağlantı)}"""
+    server, url = serve()
+    try:
+        with tempfile.TemporaryDirectory() as out:
+            return {fanout: asyncio.run(_download(url, fanout, os.path.join(out, str(fanout)))) for fanout in fanouts}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    print(f"{SIZE // MB} MB, bağlantı başına {PER_CONNECTION_RATE / MB:.0f} MB/s, max_concurrent={LIMIT}")
+    print(f"{'fan-out':>8} {'sonuç':>8} {'süre sn':>8} {'MB/s':>6} {'tepe bağlantı':>14}")
+    with contextlib.redirect_stdout(io.StringIO()):  # yt-dlp'nin progress satırları
+        results = run()
+    for fanout, (result, elapsed, peak) in results.items():
+        print(f"{fanout:>8} {result:>8} {elapsed:>8.2f} {SIZE / MB / elapsed:>6.2f} {peak:>14}")
+
+
+if __name__ == "__main__":
+    main()
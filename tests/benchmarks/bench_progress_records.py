@@ -0,0 +1,74 @@
+"""Progress kaydı bellek benchmark'ı (tracemalloc): tick başına dict vs ProgressTable kayıtları
+
+Çalıştırma: python tests/benchmarks/bench_progress_records.py
+
+50 eşzamanlı indirme, her biri 2000 progress tick'i; tick'ler sırayla (round-robin)
+gelir ve her tick'te en son progress UI'ın okuyacağı yere yazılır. Eski yol
+baseline'daki progress_hook gibi her tick'te yeni bir dict kurar; yeni yol
+ProgressTable'daki kaydı yerinde günceller.
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "src"))
+
+from models.progress_table import ProgressTable  # noqa: E402
+
+DOWNLOADS = 50
+TICKS = 2000
+TOTAL = 50 * 1024 * 1024
+
+
+def _ticks():
+    for tick in range(1, TICKS + 1):
+        downloaded = TOTAL * tick // TICKS
+        for i in range(DOWNLOADS):
+            yield f"video_{i}", downloaded, 1.5 * 1024 * 1024 + i, (TOTAL - downloaded) / 1.5e6
+
+
+def per_tick_dicts():
+    latest = {}
+    for video_id, downloaded, speed, eta in _ticks():
+        latest[video_id] = {
+            'status': 'downloading',
+            'downloaded': downloaded,
+            'total': TOTAL,
+            'percentage': (downloaded / TOTAL * 100) if TOTAL > 0 else 0,
+            'speed': speed,
+            'eta': eta,
+        }
+    return latest
+
+
+def in_place_records():
+    table = ProgressTable()
+    for i in range(DOWNLOADS):
+        table.open(f"video_{i}")
+    for video_id, downloaded, speed, eta in _ticks():
+        table.get(video_id).update(downloaded, TOTAL, speed, eta)
+    return table
+
+
+def _measure(run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, peak, elapsed
+
+
+def main():
+    print(f"{DOWNLOADS} indirme x {TICKS} tick")
+    print(f"{'':>10} {'kalan KB':>10} {'tepe KB':>10} {'süre ms':>10}")
+    for name, run in (("dict", per_tick_dicts), ("kayıt", in_place_records)):
+        current, peak, elapsed = _measure(run)
+        print(f"{name:>10} {current / 1024:>10.1f} {peak / 1024:>10.1f} {elapsed * 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""DynamicSemaphore acquire/release mikro benchmark'ı: eski (lock + liste) sürümle karşılaştırma
+
+Çalıştırma: python tests/benchmarks/bench_semaphore.py
+
+Senaryo: tek slotlu semaphore'da N görev sırada bekler; her biri slotu alıp
+hemen bırakır, slot zincir halinde sıradakine geçer. Ölçülen, ilk release'ten
+son görevin bitmesine kadar geçen süre (işlem başına µs).
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "src"))
+
+from models.downloader import DynamicSemaphore  # noqa: E402
+
+SIZES = (10, 1_000, 10_000)
+
+
+class LegacySemaphore:
+    """Baseline'daki DynamicSemaphore (asyncio.Lock + liste, release başına task)"""
+
+    def __init__(self, value=1):
+        self._value = value
+        self._waiters = []
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            if self._value > 0:
+                self._value -= 1
+                return
+
+            fut = asyncio.get_event_loop().create_future()
+            self._waiters.append(fut)
+
+        try:
+            await fut
+        except asyncio.CancelledError:
+            async with self._lock:
+                if not fut.done():
+                    self._waiters.remove(fut)
+                else:
+                    self._value += 1
+            raise
+
+    def release(self):
+        async def _release():
+            async with self._lock:
+                self._value += 1
+                while self._waiters and self._value > 0:
+                    fut = self._waiters.pop(0)
+                    if not fut.done():
+                        self._value -= 1
+                        fut.set_result(None)
+                        break
+
+        asyncio.create_task(_release())
+
+    def get_waiting_count(self):
+        return len(self._waiters)
+
+
+async def _chain(sem, waiters):
+    await sem.acquire()
+    done = asyncio.get_running_loop().create_future()
+    remaining = waiters
+
+    async def worker():
+        nonlocal remaining
+        await sem.acquire()
+        sem.release()
+        remaining -= 1
+        if remaining == 0:
+            done.set_result(None)
+
+    tasks = [asyncio.create_task(worker()) for _ in range(waiters)]
+    while sem.get_waiting_count() < waiters:
+        await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    sem.release()
+    await done
+    elapsed = time.perf_counter() - start
+    await asyncio.gather(*tasks)
+    return elapsed
+
+
+def main():
+    print(f"{'bekleyen':>10} {'eski µs/işlem':>15} {'yeni µs/işlem':>15} {'hızlanma':>10}")
+    for waiters in SIZES:
+        legacy = asyncio.run(_chain(LegacySemaphore(1), waiters))
+        current = asyncio.run(_chain(DynamicSemaphore(1), waiters))
+        print(f"{waiters:>10} {legacy / waiters * 1e6:>15.1f} {current / waiters * 1e6:>15.1f} {legacy / current:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
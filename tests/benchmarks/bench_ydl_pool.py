@@ -0,0 +1,60 @@
+"""İndirme başına YoutubeDL kurulum maliyeti: her seferinde yeni instance vs YoutubeDLPool
+
+Çalıştırma: python tests/benchmarks/bench_ydl_pool.py
+
+Her "indirme" downloader'ın kurduğu seçeneklerin aynısını kullanır: video başına
+sabitlenmiş format ID'si ve indirme başına staging klasörü. Ağa çıkılmaz; ölçülen,
+instance'ı hazırlayıp bırakmanın (hook'lar ve format seçicisi dahil) maliyeti.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "src"))
+
+import yt_dlp  # noqa: E402
+
+from models.ydl_pool import YoutubeDLPool  # noqa: E402
+
+ITEMS = 50
+
+
+def _opts(i):
+    resolution = "1080"
+    return {
+        'format': f"{137 + i % 7}+140/bestvideo[height<={resolution}][ext=mp4]+bestaudio[ext=m4a]/best",
+        'outtmpl': f'%(title)s_{resolution}p.%(ext)s',
+        'paths': {'home': "downloads", 'temp': f"downloads/.staging/video_{i}"},
+        'quiet': True,
+        'merge_output_format': 'mp4',
+        'continuedl': True,
+    }
+
+
+def fresh(items):
+    for i in range(items):
+        opts = dict(_opts(i), progress_hooks=[lambda d: None])
+        with yt_dlp.YoutubeDL(opts):  # type: ignore
+            pass
+
+
+def pooled(items):
+    pool = YoutubeDLPool()
+    try:
+        for i in range(items):
+            with pool.acquire(_opts(i), progress_hooks=[lambda d: None]):
+                pass
+    finally:
+        pool.close_all()
+
+
+def main():
+    print(f"{'':>8} {'ms/indirme':>12}")
+    for name, run in (("yeni", fresh), ("havuz", pooled)):
+        start = time.perf_counter()
+        run(ITEMS)
+        print(f"{name:>8} {(time.perf_counter() - start) / ITEMS * 1000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import functools
+import http.server
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Uygulama src/ içinden çalışır (main.py "models.*" olarak import eder); testler de aynı kökü kullanır
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from models.downloader import RobustDownloader  # noqa: E402
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def file_server(tmp_path):
+    """tmp_path/www'yi sunan yerel HTTP sunucusu: (kök klasör, base URL)"""
+    root = tmp_path / "www"
+    root.mkdir()
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_QuietHandler, directory=str(root)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield root, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class FakeRuns:
+    """RobustDownloader._run_download yerine: indirme yerine bekler, eşzamanlılığı ve seçenekleri kaydeder"""
+
+    def __init__(self, duration=0.15):
+        self.duration = duration
+        self.lock = threading.Lock()
+        self.running = 0
+        self.started = []          # Başlangıçta (video_id, o anki eşzamanlı sayı)
+        self.opts = []
+        self.infos = []
+
+    def __call__(self, url, video_id, opts, info=None):
+        with self.lock:
+            self.running += 1
+            self.started.append((video_id, self.running))
+            self.opts.append(opts)
+            self.infos.append(info)
+        try:
+            time.sleep(self.duration)
+            return "Success"
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+@pytest.fixture
+def fake_downloader():
+    """fake_downloader(limit, duration=0.15, **kwargs): yt-dlp çalıştırmayan RobustDownloader
+
+    Sahte indirmeler `downloader._run_download` (FakeRuns) üzerinden incelenir;
+    fan-out varsayılan olarak kapalıdır.
+    """
+    def make(limit, duration=0.15, **kwargs):
+        kwargs.setdefault('max_fragment_fanout', 1)
+        downloader = RobustDownloader(limit, **kwargs)
+        downloader._run_download = FakeRuns(duration)
+        return downloader
+    return make
@@ -0,0 +1,70 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from models.bandwidth import BandwidthLimiter
+from models.downloader import RobustDownloader
+
+MB = 1024 * 1024
+
+
+def test_share_rate_splits_budget_by_weight():
+    limiter = BandwidthLimiter(4 * MB)
+    limiter.register("heavy", 3.0)
+    limiter.register("light", 1.0)
+    assert limiter.share_rate("heavy") == pytest.approx(3 * MB)
+    assert limiter.share_rate("light") == pytest.approx(1 * MB)
+
+    limiter.unregister("heavy")
+    assert limiter.share_rate("light") == pytest.approx(4 * MB)
+    limiter.set_rate(0)
+    assert limiter.share_rate("light") == 0.0
+
+
+def test_consume_delay_keeps_share_within_rate():
+    limiter = BandwidthLimiter(1 * MB, burst_seconds=0.1)
+    limiter.register("a")
+    # Kova boşken 1 MB: payı 1 MB/s olan indirme ~1 sn beklemeli
+    assert limiter.consume("a", 1 * MB) == pytest.approx(1.0, abs=0.05)
+    # Stream değişince (byte sayacı geri sarınca) yeni stream'in byte'ları sayılır
+    assert limiter.consume("a", 0.5 * MB) > 1.0
+
+
+def test_aggregate_throughput_and_weighted_shares_against_local_server(file_server, tmp_path):
+    root, base_url = file_server
+    size = 3 * MB
+    for name in ("heavy", "light"):
+        (root / f"{name}.mp4").write_bytes(os.urandom(size))
+    budget = 2 * MB
+
+    async def main():
+        downloader = RobustDownloader(2, bandwidth_limit=budget, max_fragment_fanout=1)
+        samples = {"heavy": [], "light": []}
+
+        def on_progress(name):
+            return lambda record: samples[name].append((time.monotonic(), record.downloaded))
+
+        start = time.monotonic()
+        results = await asyncio.gather(*(
+            downloader.download(name, f"{base_url}/{name}.mp4", str(tmp_path / "out"), progress_callback=on_progress(name),
+                                expected_bytes=size, weight=weight)
+            for name, weight in (("heavy", 3.0), ("light", 1.0))
+        ))
+        return results, time.monotonic() - start, samples
+
+    results, elapsed, samples = asyncio.run(main())
+    assert results == ["Success", "Success"]
+    for name in ("heavy", "light"):
+        assert (tmp_path / "out" / f"{name}_1080p.mp4").stat().st_size == size
+
+    # Toplam: 6 MB, 2 MB/s bütçe -> en az ~3 sn (yarım saniyelik burst payı ile)
+    assert 2 * size / elapsed <= budget * 1.25
+
+    # İkisi birlikte inerken heavy ~3 kat hızlı: heavy'nin yarıya geldiği anda light ~1/3'ünde
+    half_at = next(t for t, downloaded in samples["heavy"] if downloaded >= size / 2)
+    light_then = max((d for t, d in samples["light"] if t <= half_at), default=0)
+    assert light_then > 0
+    ratio = (size / 2) / light_then
+    assert 2.0 <= ratio <= 4.5, ratio
@@ -0,0 +1,76 @@
+import asyncio
+
+from models.concurrency_tuner import ConcurrencyTuner
+
+
+class FakeStats:
+    def __init__(self):
+        self.rate = 0.0
+        self.results = {'success': 0, 'error': 0}
+        self.stalled = []
+
+    def window_rate(self):
+        return self.rate
+
+    def stalled_downloads(self, seconds):
+        return list(self.stalled)
+
+
+class FakeDownloader:
+    """Tuner'ın kullandığı kadarı: limit, aktif/bekleyen sayısı ve stats"""
+
+    def __init__(self, limit=3, waiting=5):
+        self.stats = FakeStats()
+        self.max_concurrent = limit
+        self.waiting = waiting
+
+    def get_active_downloads(self):
+        return self.max_concurrent  # Tüm slotlar dolu
+
+    def get_waiting_count(self):
+        return self.waiting
+
+    async def set_max_concurrent(self, limit):
+        self.max_concurrent = limit
+
+
+def _steps(tuner, rates):
+    async def main():
+        limits = []
+        for rate in rates:
+            tuner.downloader.stats.rate = rate
+            limits.append(await tuner.step())
+        return limits
+    return asyncio.run(main())
+
+
+def test_increases_while_saturated_and_throughput_grows():
+    tuner = ConcurrencyTuner(FakeDownloader(limit=3))
+    assert _steps(tuner, [10, 20, 30, 40]) == [4, 5, 6, 7]
+
+
+def test_no_increase_without_waiting_work():
+    tuner = ConcurrencyTuner(FakeDownloader(limit=3, waiting=0))
+    assert _steps(tuner, [10, 20, 30]) == [3, 3, 3]
+
+
+def test_useless_increase_is_reverted_and_held():
+    changes = []
+    tuner = ConcurrencyTuner(FakeDownloader(limit=3), hold_steps=3, on_change=changes.append)
+    # Hız sabit: artış işe yaramaz, geri alınır; sonra hold_steps adım denenmez
+    assert _steps(tuner, [10] * 7) == [4, 3, 3, 3, 3, 4, 3]
+    assert changes == [4, 3, 4, 3]
+
+
+def test_errors_and_new_stalls_back_off_once():
+    downloader = FakeDownloader(limit=10)
+    tuner = ConcurrencyTuner(downloader, backoff=0.5, min_limit=2)
+    downloader.stats.results = {'success': 1, 'error': 3}
+    assert _steps(tuner, [10]) == [5]
+
+    # Aynı takılma tekrar sayılmaz; yeni bir takılma limiti yine düşürür
+    downloader.waiting = 0
+    downloader.stats.stalled = ["a"]
+    assert _steps(tuner, [10, 10]) == [2, 2]
+    downloader.stats.stalled = ["a", "b"]
+    assert _steps(tuner, [10]) == [2]  # min_limit altına inmez
@@ -0,0 +1,96 @@
+import asyncio
+
+from models.download_engine import DownloadEngine
+from models.journal import DownloadJournal
+from models.scheduler import Priority
+from models.video_info import VideoInfo
+
+
+def _info(name, size=0, channel=""):
+    return VideoInfo(url=f"https://example.invalid/{name}", title=name, filesize_approx=size, channel=channel)
+
+
+def _titles(engine):
+    order = []
+    while (job := engine.next_waiting(set())) is not None:
+        order.append(job.video_info.title)
+    return order
+
+
+def test_next_waiting_follows_scheduling_policy(fake_downloader, tmp_path):
+    async def main():
+        engine = DownloadEngine(fake_downloader(1), save_path=str(tmp_path))
+        for name, size in (("big", 300), ("small", 100), ("medium", 200)):
+            await engine.add(_info(name, size, channel=name), "720")
+        await engine.set_scheduling_policy("shortest")
+        assert _titles(engine) == ["small", "medium", "big"]
+    asyncio.run(main())
+
+
+def test_next_waiting_is_fair_across_channels(fake_downloader, tmp_path):
+    async def main():
+        engine = DownloadEngine(fake_downloader(1), save_path=str(tmp_path))
+        for name, channel in (("a1", "A"), ("a2", "A"), ("a3", "A"), ("b1", "B")):
+            await engine.add(_info(name, channel=channel), "720")
+        assert _titles(engine) == ["a1", "b1", "a2", "a3"]
+    asyncio.run(main())
+
+
+def test_priority_and_move_to_front_reorder_waiting_jobs(fake_downloader, tmp_path):
+    async def main():
+        engine = DownloadEngine(fake_downloader(1), save_path=str(tmp_path))
+        jobs = [await engine.add(_info(f"v{i}"), "720") for i in range(4)]
+        await engine.set_priority(jobs[2].video_id, Priority.HIGH)
+        await engine.set_priority(jobs[0].video_id, Priority.LOW)
+        await engine.move_to_front(jobs[3].video_id)
+        assert _titles(engine) == ["v3", "v2", "v1", "v0"]
+        assert engine.waiting_demand() == 0
+    asyncio.run(main())
+
+
+def test_cancel_and_remove_while_waiting_for_slot(fake_downloader, tmp_path):
+    async def main():
+        downloader = fake_downloader(1, duration=2.0)
+        runs = downloader._run_download
+        engine = DownloadEngine(downloader, save_path=str(tmp_path), lookahead=2)
+        running, cancelled, removed = [await engine.add(_info(name), "720")
+                                       for name in ("running", "cancelled", "removed")]
+        engine.start()
+        while not (downloader.is_waiting(cancelled.video_id) and downloader.is_waiting(removed.video_id)):
+            await asyncio.sleep(0.01)
+
+        await asyncio.gather(cancelled.cancel(), engine.remove(removed.video_id))
+        assert cancelled.status == "cancelled"
+        assert removed.video_id not in engine.jobs
+        assert downloader.get_waiting_count() == 0
+
+        while engine.runner.inflight_count:
+            await asyncio.sleep(0.05)
+        assert running.status == "completed"
+        assert [video_id for video_id, _ in runs.started] == [running.video_id]
+        assert downloader.semaphore.get_held_count() == 0
+        await engine.shutdown()
+    asyncio.run(main())
+
+
+def test_job_ids_are_never_reused(fake_downloader, tmp_path):
+    async def main():
+        journal = DownloadJournal(str(tmp_path / "journal.db"), flush_interval=0.05)
+        engine = DownloadEngine(fake_downloader(1), journal=journal, save_path=str(tmp_path))
+        first, second = [await engine.add(_info(name), "720") for name in ("first", "second")]
+        await engine.remove(first.video_id)
+        third = await engine.add(_info("third"), "720")
+        assert third.video_id != second.video_id
+        assert engine.jobs[second.video_id] is second
+        journal.close()
+
+        # Geri yüklenen görevlerin ID'leri de yeni görevlere verilmez
+        journal = DownloadJournal(str(tmp_path / "journal.db"), flush_interval=0.05)
+        restored = DownloadEngine(fake_downloader(1), journal=journal, save_path=str(tmp_path))
+        assert await restored.restore() == 2
+        restored.janitor.stop()
+        fourth = await restored.add(_info("fourth"), "720")
+        assert fourth.video_id not in (second.video_id, third.video_id)
+        assert {job.video_info.title for job in restored.jobs.values()} == {"second", "third", "fourth"}
+        journal.close()
+    asyncio.run(main())
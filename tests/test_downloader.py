@@ -0,0 +1,138 @@
+import asyncio
+import time
+
+
+def test_lowering_max_concurrent_caps_running_downloads(fake_downloader, tmp_path):
+    async def main():
+        downloader = fake_downloader(5)
+        runs = downloader._run_download
+        jobs = [asyncio.create_task(downloader.download(f"v{i}", "https://example.invalid", str(tmp_path)))
+                for i in range(15)]
+        while runs.running < 5:
+            await asyncio.sleep(0.01)
+
+        await downloader.set_max_concurrent(2)
+        lowered_at = len(runs.started)
+        assert set(await asyncio.gather(*jobs)) == {"Success"}
+
+        after = [running for _, running in runs.started[lowered_at:]]
+        assert after, "limit düşürüldükten sonra da indirme başlamalı"
+        assert max(after) <= 2
+        assert downloader.semaphore.get_held_count() == 0
+        assert await downloader.semaphore.get_value() == 2
+    asyncio.run(main())
+
+
+def test_buffer_is_pinned_only_under_bandwidth_limit(fake_downloader, tmp_path):
+    async def main():
+        downloader = fake_downloader(2, duration=0)
+        runs = downloader._run_download
+        await downloader.download("free", "https://example.invalid", str(tmp_path))
+        await downloader.set_bandwidth_limit(1024 * 1024)
+        await downloader.download("limited", "https://example.invalid", str(tmp_path))
+
+        free, limited = runs.opts
+        assert 'buffersize' not in free and 'noresizebuffer' not in free
+        assert limited['noresizebuffer'] is True and limited['buffersize'] == 256 * 1024
+    asyncio.run(main())
+
+
+def test_cancel_while_waiting_for_slot_never_downloads(fake_downloader, tmp_path):
+    async def main():
+        downloader = fake_downloader(1, duration=0.3)
+        runs = downloader._run_download
+        first = asyncio.create_task(downloader.download("first", "https://example.invalid", str(tmp_path)))
+        second = asyncio.create_task(downloader.download("second", "https://example.invalid", str(tmp_path)))
+        while not downloader.is_waiting("second"):
+            await asyncio.sleep(0.01)
+
+        await downloader.cancel("second")
+        assert await asyncio.gather(first, second) == ["Success", "Cancelled"]
+        assert [video_id for video_id, _ in runs.started] == ["first"]
+
+        # Aynı görev tekrar başlatılınca eski iptal bayrağı onu durdurmamalı
+        assert await downloader.download("second", "https://example.invalid", str(tmp_path)) == "Success"
+    asyncio.run(main())
+
+
+def test_borrowed_slots_return_only_as_connections_close(fake_downloader, tmp_path):
+    async def main():
+        downloader = fake_downloader(3, duration=0.3, max_fragment_fanout=3)
+        runs = downloader._run_download
+        open_connections = {}
+        peaks = []
+
+        def run(url, video_id, opts, info=None):
+            # Büyük indirme: iki stream gibi, biri erken bitip bağlantısını kapatır
+            budget = opts.get('concurrent_fragment_downloads') or 1
+            with runs.lock:
+                open_connections[video_id] = budget
+                peaks.append(sum(open_connections.values()))
+            if video_id == "big":
+                time.sleep(0.3)
+                with runs.lock:
+                    open_connections[video_id] = 1
+                downloader._loan_returns[video_id](2)
+            try:
+                return runs(url, video_id, opts, info)
+            finally:
+                with runs.lock:
+                    open_connections.pop(video_id)
+        downloader._run_download = run
+
+        big = asyncio.create_task(downloader.download("big", "https://example.invalid", str(tmp_path)))
+        while "big" not in open_connections:
+            await asyncio.sleep(0.01)
+        assert downloader.semaphore.get_held_count() == 3
+
+        others = [asyncio.create_task(downloader.download(f"v{i}", "https://example.invalid", str(tmp_path)))
+                  for i in range(2)]
+        await asyncio.sleep(0.15)
+        assert len(open_connections) == 1, "bağlantılar açıkken ödünç slot devredildi"
+        while len(open_connections) < 3 and not big.done():
+            await asyncio.sleep(0.01)
+        assert not big.done(), "bağlantıları kapanan slotlar indirme bitene kadar tutuldu"
+
+        assert set(await asyncio.gather(big, *others)) == {"Success"}
+        assert max(peaks) <= 3
+        assert downloader._borrowed == 0 and downloader.semaphore.get_held_count() == 0
+    asyncio.run(main())
+
+
+def test_fanout_reuses_extracted_youtube_info(fake_downloader, tmp_path):
+    async def main():
+        downloader = fake_downloader(3, duration=0, max_fragment_fanout=3)
+        runs = downloader._run_download
+        raw = {'id': 'abc', 'extractor_key': 'Youtube'}
+        await downloader.download("fanout", "https://example.invalid", str(tmp_path), load_info=lambda: raw)
+        await downloader.set_fragment_fanout(1)
+        await downloader.download("single", "https://example.invalid", str(tmp_path), load_info=lambda: raw)
+
+        fanout, single = runs.opts
+        assert fanout['extractor_args'] == {'youtube': {'formats': ['dashy']}}
+        # get_video_info ham info'yu zaten 'dashy' ile çıkarır; ikinci extraction yok
+        assert runs.infos[0] is raw
+        assert 'extractor_args' not in single and runs.infos[1] is raw
+    asyncio.run(main())
+
+
+def test_video_info_is_extracted_ready_for_fanout(monkeypatch):
+    from contextlib import contextmanager
+    from models import validators
+    from models.ydl_pool import ydl_pool
+
+    seen = []
+
+    class FakeYDL:
+        def extract_info(self, url, download=False):
+            return {'id': 'abc', 'title': 'Clip', 'formats': []}
+
+    @contextmanager
+    def acquire(opts, *hooks):
+        seen.append(opts)
+        yield FakeYDL()
+
+    monkeypatch.setattr(ydl_pool, "acquire", acquire)
+    info = asyncio.run(validators.get_video_info("https://www.youtube.com/watch?v=abcdefghijk", use_cache=False))
+    assert info.title == 'Clip'
+    assert seen[0]['extractor_args'] == {'youtube': {'formats': ['dashy']}}
@@ -0,0 +1,71 @@
+import pytest
+import yt_dlp
+
+from models.format_table import FormatTable
+
+
+def _fmt(format_id, ext, height, vcodec, acodec, filesize=1000):
+    return {'format_id': format_id, 'ext': ext, 'height': height, 'vcodec': vcodec, 'acodec': acodec,
+            'url': f"https://example.invalid/{format_id}", 'protocol': 'https', 'filesize': filesize}
+
+
+# YouTube'un tipik format listesi: muxed mp4'ler, mp4/webm video-only ve m4a/webm ses
+YOUTUBE = [
+    _fmt('139', 'm4a', None, 'none', 'mp4a.40.5'),
+    _fmt('251', 'webm', None, 'none', 'opus'),
+    _fmt('140', 'm4a', None, 'none', 'mp4a.40.2'),
+    _fmt('18', 'mp4', 360, 'avc1.42001E', 'mp4a.40.2'),
+    _fmt('22', 'mp4', 720, 'avc1.64001F', 'mp4a.40.2'),
+    _fmt('160', 'mp4', 144, 'avc1.4d400c', 'none'),
+    _fmt('134', 'mp4', 360, 'avc1.4d401e', 'none'),
+    _fmt('243', 'webm', 360, 'vp9', 'none'),
+    _fmt('136', 'mp4', 720, 'avc1.4d401f', 'none'),
+    _fmt('247', 'webm', 720, 'vp9', 'none'),
+    _fmt('137', 'mp4', 1080, 'avc1.640028', 'none'),
+    _fmt('248', 'webm', 1080, 'vp9', 'none'),
+    _fmt('sb0', 'mhtml', 90, 'none', 'none'),
+]
+NO_M4A = [f for f in YOUTUBE if f['ext'] != 'm4a']
+WEBM_ONLY = [f for f in YOUTUBE if f['ext'] in ('webm', 'mhtml')]
+UNKNOWN_CODECS = [
+    {'format_id': 'direct', 'ext': 'mp4', 'url': 'https://example.invalid/direct', 'protocol': 'https'},
+    {'format_id': 'hls-480', 'ext': 'mp4', 'height': 480, 'url': 'https://example.invalid/480', 'protocol': 'm3u8'},
+]
+
+
+def _yt_dlp_pick(formats, resolution):
+    """Downloader'ın format dizgesiyle yt-dlp'nin kendi seçtiği format ID'si"""
+    spec = f"bestvideo[height<={resolution}][ext=mp4]+bestaudio[ext=m4a]/best[height<={resolution}][ext=mp4]/best"
+    ydl = yt_dlp.YoutubeDL({'quiet': True})  # type: ignore
+    info = {'formats': [dict(f) for f in formats]}
+    ydl.sort_formats(info)  # Extraction sonrası sıra; FormatTable bu sırayı korur
+    picked = list(ydl.build_format_selector(spec)({
+        'formats': info['formats'], 'has_merged_format': False, 'incomplete_formats': False,
+    }))
+    return (picked[0]['format_id'] if picked else None), info['formats']
+
+
+@pytest.mark.parametrize("formats", [YOUTUBE, NO_M4A, WEBM_ONLY, UNKNOWN_CODECS],
+                         ids=["youtube", "no-m4a", "webm-only", "unknown-codecs"])
+@pytest.mark.parametrize("resolution", [144, 360, 480, 720, 1080, 2160])
+def test_select_matches_yt_dlp(formats, resolution):
+    expected, ordered = _yt_dlp_pick(formats, resolution)
+    choice = FormatTable.from_formats(ordered).select(resolution)
+    assert (choice.format_id if choice else None) == expected
+
+
+def test_select_sums_sizes_only_when_all_known():
+    formats = [_fmt('140', 'm4a', None, 'none', 'mp4a', filesize=300),
+               _fmt('137', 'mp4', 1080, 'avc1', 'none', filesize=5000)]
+    assert FormatTable.from_formats(formats).select(1080) == ('137+140', 5300, 1080)
+
+    formats[0]['filesize'] = None
+    assert FormatTable.from_formats(formats).filesize_for(1080) == 0
+
+
+def test_table_round_trips_through_dict():
+    table = FormatTable.from_formats(YOUTUBE)
+    assert 'sb0' not in table.format_ids  # Storyboard'lar tabloya girmez
+    assert FormatTable.from_dict(table.to_dict()) == table
+    assert len(FormatTable.from_dict(None)) == 0
+    assert FormatTable().select(720) is None
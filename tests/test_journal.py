@@ -0,0 +1,74 @@
+import threading
+
+from models.journal import DownloadJournal
+from models.resume import ResumeState
+from models.video_info import VideoInfo
+
+
+class TracingJournal(DownloadJournal):
+    """Yazıcı thread'in çalıştırdığı SQL'leri sayan journal"""
+
+    def __init__(self, *args, **kwargs):
+        self.statements = []
+        self._trace_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def _connect(self):
+        conn = super()._connect()
+        if threading.current_thread().name == "journal-writer":
+            conn.set_trace_callback(self._trace)
+        return conn
+
+    def _trace(self, sql):
+        with self._trace_lock:
+            self.statements.append(sql)
+
+    def progress_writes(self):
+        return [s for s in self.statements if s.startswith("UPDATE tasks SET downloaded")]
+
+
+def _info(i):
+    return VideoInfo(url=f"https://youtu.be/{i:011d}", title=f"Video {i}", video_id=f"{i:011d}")
+
+
+def test_progress_is_coalesced_per_video_in_a_batch(tmp_path):
+    # Uzun flush aralığı: tüm olaylar tek batch'te yazılır
+    journal = TracingJournal(str(tmp_path / "j.db"), flush_interval=0.3)
+    for vid in ("a", "b"):
+        journal.record_add(vid, _info(1), "720", "/tmp")
+        journal.record_start(vid)
+    for i in range(1, 1001):
+        journal.record_progress("a", i * 10, 10_000)
+        journal.record_progress("b", i, 1_000)
+    journal.close()
+
+    assert len(journal.progress_writes()) == 2
+    entries = {e.video_id: e for e in journal.load()}
+    assert (entries["a"].downloaded, entries["a"].total) == (10_000, 10_000)
+    assert (entries["b"].downloaded, entries["b"].total) == (1_000, 1_000)
+    assert entries["a"].status == "downloading"
+
+
+def test_events_keep_order_and_survive_reopen(tmp_path):
+    path = str(tmp_path / "j.db")
+    journal = DownloadJournal(path, flush_interval=0.01)
+    for i, vid in enumerate(("first", "second", "third")):
+        journal.record_add(vid, _info(i), "1080", "/tmp")
+    journal.record_complete("first")
+    journal.record_error("second", "HTTP Error 403")
+    journal.record_settings("third", "480", "/data")
+    state = ResumeState("480", "/data")
+    state.format_id = "135+140"
+    journal.record_resume("third", state)
+    journal.record_remove("first")
+    journal.close()
+
+    reopened = DownloadJournal(path)
+    entries = reopened.load()
+    reopened.close()
+    assert [e.video_id for e in entries] == ["second", "third"]
+    second, third = entries
+    assert (second.status, second.error) == ("error", "HTTP Error 403")
+    assert (third.status, third.resolution, third.save_path) == ("waiting", "480", "/data")
+    assert third.resume is not None and third.resume.format_id == "135+140"
+    assert third.info.title == "Video 2"
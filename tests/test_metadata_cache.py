@@ -0,0 +1,45 @@
+import asyncio
+import os
+
+import pytest
+
+from models.metadata_cache import MetadataCache
+from models.video_info import VideoInfo
+
+
+def _open_fds():
+    return len(os.listdir("/proc/self/fd"))
+
+
+def _info(i):
+    return VideoInfo(url=f"https://youtu.be/{i:011d}", title=f"Video {i}", video_id=f"{i:011d}")
+
+
+def test_disk_store_survives_new_instance(tmp_path):
+    async def main():
+        path = str(tmp_path / "meta.db")
+        cache = MetadataCache(disk_path=path)
+        await cache.aput("a", _info(1))
+        cache.close()
+
+        fresh = MetadataCache(disk_path=path)
+        info = await fresh.aget("a")
+        assert info is not None and info.title == "Video 1"
+        assert fresh.disk_hits == 1
+        fresh.close()
+    asyncio.run(main())
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="/proc gerekli")
+def test_disk_operations_reuse_one_connection(tmp_path):
+    async def main():
+        cache = MetadataCache(disk_path=str(tmp_path / "meta.db"), max_entries=1)
+        await cache.aput("warm", _info(0))
+        before = _open_fds()
+        for i in range(200):
+            await cache.aput(f"v{i}", _info(i))
+            await cache.aget(f"v{i - 1}" if i else "warm")
+            cache.invalidate(f"v{i}")
+        assert _open_fds() <= before
+        cache.close()
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from models.output_index import OutputIndex
+
+
+def _open_fds():
+    return len(os.listdir("/proc/self/fd"))
+
+
+def test_lookup_drops_entries_whose_file_changed(tmp_path):
+    index = OutputIndex(str(tmp_path / "index.db"))
+    output = tmp_path / "video_720p.mp4"
+    output.write_bytes(b"x" * 100)
+    index.record("abc", "720p.mp4", str(output))
+    assert index.lookup("abc", "720p.mp4") == str(output)
+
+    output.write_bytes(b"x" * 50)
+    assert index.lookup("abc", "720p.mp4") is None
+    output.write_bytes(b"x" * 100)
+    assert index.lookup("abc", "720p.mp4") is None  # Kayıt silindi, geri gelmez
+    index.close()
+
+
+def test_records_survive_new_instance(tmp_path):
+    path = str(tmp_path / "index.db")
+    output = tmp_path / "video_720p.mp4"
+    output.write_bytes(b"data")
+    index = OutputIndex(path)
+    index.record("abc", "720p.mp4", str(output))
+    index.close()
+
+    fresh = OutputIndex(path)
+    assert fresh.lookup("abc", "720p.mp4") == str(output)
+    fresh.close()
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="/proc gerekli")
+def test_operations_reuse_one_connection(tmp_path):
+    index = OutputIndex(str(tmp_path / "index.db"))
+    output = tmp_path / "video_720p.mp4"
+    output.write_bytes(b"data")
+    index.lookup("warm", "720p.mp4")
+    before = _open_fds()
+    for i in range(200):
+        index.record(f"v{i}", "720p.mp4", str(output))
+        index.lookup(f"v{i}", "720p.mp4")
+        index.forget(f"v{i}", "720p.mp4")
+    assert _open_fds() <= before
+    index.close()
@@ -0,0 +1,151 @@
+import threading
+import time
+
+import pytest
+
+from models import parallel_streams
+from models.parallel_streams import (download_url, is_info_fresh, split_connections, stream_jobs,
+                                     stream_urls_expire_at)
+
+
+@pytest.mark.parametrize("budget, streams, expected", [
+    (1, 2, (1, 1)),   # Tek slot: stream'ler sırayla
+    (2, 2, (2, 1)),
+    (3, 2, (2, 1)),   # Artan bağlantı kullanılmaz (iade edilir)
+    (4, 2, (2, 2)),
+    (4, 1, (1, 4)),
+    (0, 2, (1, 1)),
+])
+def test_split_connections_never_exceeds_budget(budget, streams, expected):
+    assert split_connections(budget, streams) == expected
+
+
+class FakeYDL:
+    """dl() çağrılarının eşzamanlı açtığı bağlantıları sayan sahte YoutubeDL"""
+
+    def __init__(self, budget, held):
+        self.params = {'concurrent_fragment_downloads': budget}
+        self.held = held  # İndirmenin tuttuğu slotlar; on_connections_closed ile azalır
+        self.lock = threading.Lock()
+        self.open = 0
+        self.violations = []
+        self.downloaded = []
+
+    def close_connections(self, count):
+        with self.lock:
+            self.held = max(1, self.held - count)
+
+    def dl(self, filename, info):
+        connections = self.params['concurrent_fragment_downloads']
+        with self.lock:
+            self.open += connections
+            if self.open > self.held:
+                self.violations.append((filename, self.open, self.held))
+        time.sleep(0.05 if filename.endswith("m4a") else 0.15)
+        with self.lock:
+            self.open -= connections
+            self.downloaded.append(filename)
+
+    def process_ie_result(self, info, download=True):
+        return info
+
+
+@pytest.mark.parametrize("budget, streams", [(1, 2), (3, 2), (4, 2), (2, 3)])
+def test_stream_connections_stay_within_held_slots(monkeypatch, budget, streams):
+    names = [f"v.f{i}.mp4" for i in range(streams - 1)] + ["v.f140.m4a"]
+    monkeypatch.setattr(parallel_streams, "stream_jobs", lambda ydl, info: [(n, {}) for n in names])
+    ydl = FakeYDL(budget, held=budget)
+    formats = []
+    info = {'id': 'x', 'requested_formats': [{'format_id': n} for n in names]}
+
+    download_url(ydl, "https://example.invalid", on_formats=formats.append, info=info,
+                 on_connections_closed=ydl.close_connections)
+    assert ydl.violations == []
+    assert sorted(ydl.downloaded) == sorted(names)
+    assert ydl.held == 1  # Sonunda sadece indirmenin kendi slotu
+    assert ydl.params['concurrent_fragment_downloads'] == budget
+    assert formats == [info['requested_formats']]
+
+
+def test_stale_stream_urls_are_not_fresh():
+    soon = int(time.time()) + 60
+    info = {'formats': [{'url': f"https://r.example/videoplayback?expire={soon}&x=1"},
+                        {'url': "https://r.example/no-expiry"}]}
+    assert stream_urls_expire_at(info) == soon
+    assert not is_info_fresh(info)
+    assert is_info_fresh(info, margin=0)
+    assert is_info_fresh({'formats': [{'url': "https://r.example/plain"}]})
+
+
+def _merged_info():
+    return {'id': 'abc', 'title': 'Clip', 'ext': 'mp4', '_type': 'video', 'protocol': 'https+https', 'requested_formats': [
+        {'format_id': '137', 'ext': 'mp4', 'url': 'https://r.example/v', 'protocol': 'https', 'vcodec': 'avc1', 'acodec': 'none'},
+        {'format_id': '140', 'ext': 'm4a', 'url': 'https://r.example/a', 'protocol': 'https', 'vcodec': 'none', 'acodec': 'mp4a'},
+    ]}
+
+
+@pytest.fixture
+def ydl(tmp_path):
+    import yt_dlp
+    # ffmpeg olmayan ortamda da merge yolunu seçsin diye ignoreerrors
+    opts = {'ignoreerrors': True, 'quiet': True, 'outtmpl': '%(title)s_720p.%(ext)s',
+            'paths': {'home': str(tmp_path), 'temp': str(tmp_path / ".staging" / "video_1")}}
+    with yt_dlp.YoutubeDL(opts) as ydl:  # type: ignore
+        yield ydl
+
+
+def test_stream_jobs_use_yt_dlp_stream_filenames_in_staging(ydl, tmp_path):
+    staging = tmp_path / ".staging" / "video_1"
+    jobs = stream_jobs(ydl, _merged_info())
+    assert [(filename, info['format_id']) for filename, info in jobs] == [
+        (str(staging / "Clip_720p.f137.mp4"), '137'),
+        (str(staging / "Clip_720p.f140.m4a"), '140'),
+    ]
+    assert all('requested_formats' not in info for _, info in jobs)
+
+
+def test_stream_jobs_skip_single_file_and_finished_output(ydl, tmp_path):
+    single = dict(_merged_info(), requested_formats=[_merged_info()['requested_formats'][0]])
+    assert stream_jobs(ydl, single) == []
+    (tmp_path / "Clip_720p.mp4").write_bytes(b"done")
+    assert stream_jobs(ydl, _merged_info()) == []
+
+
+class ReplayYDL:
+    """Önceden çıkarılmış info'yu işleyen/yeniden çıkaran çağrıları kaydeden sahte YoutubeDL"""
+
+    def __init__(self, fail_with=None):
+        self.params = {}
+        self.calls = []
+        self.fail_with = fail_with
+
+    def process_ie_result(self, info, download=True):
+        self.calls.append(("process", download))
+        if not download and self.fail_with and len(self.calls) == 1:
+            raise self.fail_with
+        return info
+
+    def extract_info(self, url, download=False):
+        self.calls.append(("extract", download))
+        return {'id': 'fresh', '_type': 'video'}
+
+
+def test_reused_info_skips_extraction():
+    ydl = ReplayYDL()
+    download_url(ydl, "https://example.invalid", info={'id': 'cached', '_type': 'video'})
+    assert ydl.calls == [("process", False), ("process", True)]
+
+
+def test_forbidden_or_stale_info_is_extracted_again():
+    ydl = ReplayYDL(fail_with=Exception("HTTP Error 403: Forbidden"))
+    download_url(ydl, "https://example.invalid", info={'id': 'cached', '_type': 'video'})
+    assert ("extract", False) in ydl.calls
+
+    ydl = ReplayYDL()
+    stale = {'id': 'cached', '_type': 'video', 'formats': [{'url': f"https://r.example/x?expire={int(time.time())}"}]}
+    download_url(ydl, "https://example.invalid", info=stale)
+    assert ydl.calls[0] == ("extract", False)
+
+    ydl = ReplayYDL(fail_with=ValueError("boom"))
+    with pytest.raises(ValueError):
+        download_url(ydl, "https://example.invalid", info={'id': 'cached', '_type': 'video'})
@@ -0,0 +1,100 @@
+import pytest
+
+from models.progress_table import ProgressTable, StreamProgress
+
+
+def test_record_is_a_view_onto_its_row():
+    table = ProgressTable(capacity=4)
+    record = table.open("a")
+    record.update(250, 1000, 50, 15)
+    assert (record.downloaded, record.total, record.speed, record.eta) == (250, 1000, 50, 15)
+    assert record.percentage == 25
+    assert record.get('speed') == 50 and record.get('missing', "yok") == "yok"
+    assert record.as_dict() == {'status': 'downloading', 'downloaded': 250, 'total': 1000,
+                                'percentage': 25, 'speed': 50, 'eta': 15}
+    # Aynı video için tekrar open() aynı kaydı verir
+    assert table.open("a") is record and table.get("a") is record and len(table) == 1
+
+
+def test_none_values_are_stored_as_zero():
+    record = ProgressTable().open("a")
+    record.update(None, None, None, None)
+    assert (record.downloaded, record.total, record.speed, record.eta, record.percentage) == (0, 0, 0, 0, 0)
+
+
+def test_closed_slots_are_reused_and_reset():
+    table = ProgressTable(capacity=2)
+    table.open("a").update(10, 100, 5, 18)
+    first_index = table.get("a")._index
+    table.close("a")
+    assert table.get("a") is None and len(table) == 0
+    assert table.total_speed() == 0 and table.remaining_bytes() == 0
+
+    reused = table.open("b")
+    assert reused._index == first_index
+    assert (reused.downloaded, reused.total) == (0, 0)
+    table.close("missing")  # Açılmamış video sorun değil
+
+
+def test_growing_keeps_existing_rows():
+    table = ProgressTable(capacity=2)
+    records = [table.open(f"v{i}") for i in range(5)]
+    for i, record in enumerate(records):
+        record.update(i, 10, 1, 0)
+    assert len(table.downloaded) >= 5
+    assert [r.downloaded for r in records] == [0, 1, 2, 3, 4]
+    assert len({r._index for r in records}) == 5
+
+
+def test_aggregates_come_from_the_columns():
+    table = ProgressTable()
+    table.open("a").update(200, 1000, 100, 8)
+    table.open("b").update(100, 300, 50, 4)
+    table.open("unknown").update(500, 0, 50, 0)  # Toplamı bilinmeyen kalan byte'a katılmaz
+    assert table.total_speed() == 200
+    assert table.remaining_bytes() == 1000
+    assert table.overall_eta() == pytest.approx(5.0)
+
+    for video_id in ("a", "b", "unknown"):
+        table.close(video_id)
+    assert table.overall_eta() == 0
+
+
+def _hook(filename, downloaded, total, status='downloading', speed=100.0, **extra):
+    return {'status': status, 'filename': filename, 'downloaded_bytes': downloaded, 'total_bytes': total,
+            'speed': speed, 'eta': 9, **extra}
+
+
+def test_stream_at_zero_bytes_is_not_finished():
+    assert StreamProgress(1000).update(_hook("v", 0, 600, speed=0)) == (0, 1000, 0, 9)
+    downloaded, total, _, _ = StreamProgress(0).update(_hook("v", 0, 600))
+    assert (downloaded, total) == (0, 600)
+
+
+def test_finished_without_byte_count_counts_whole_stream():
+    progress = StreamProgress(0)
+    hook = _hook("v", None, 600, status='finished')
+    assert progress.update(hook)[:3] == (600, 600, 0.0)
+    assert progress.active_count() == 0
+
+
+def test_streams_add_up_to_one_percentage_that_never_goes_back():
+    formats = [{'format_id': '137', 'filesize': 800}, {'format_id': '140', 'filesize': 200}]
+    progress = StreamProgress(0)
+    info = {'info_dict': {'requested_formats': formats}}
+    percentages = []
+    for name, downloaded, total in [("v", 0, 800), ("a", 0, 200), ("v", 300, 800), ("a", 100, 200),
+                                    ("a", 200, 200), ("v", 800, 800)]:
+        done, whole, _, _ = progress.update(_hook(name, downloaded, total, **info))
+        percentages.append(done / whole * 100)
+    assert percentages == sorted(percentages)
+    assert percentages[0] == 0 and percentages[-1] == 100
+
+
+def test_concurrent_streams_share_speed_and_eta():
+    progress = StreamProgress(1000)
+    progress.update(_hook("v", 200, 800, speed=100))
+    downloaded, total, speed, eta = progress.update(_hook("a", 100, 200, speed=100))
+    assert (downloaded, total, speed) == (300, 1000, 200)
+    assert eta == pytest.approx(3.5)
+    assert progress.active_count() == 2
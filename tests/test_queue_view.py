@@ -0,0 +1,108 @@
+import random
+
+import flet as ft
+import pytest
+
+from ui.queue_view import QueueView
+
+
+class Item:
+    def __init__(self, n):
+        self.n = n
+
+    def __repr__(self):
+        return f"Item({self.n})"
+
+
+def _view(count, page_size=10):
+    made = []
+
+    def make_row(item):
+        made.append(item)
+        return ft.Text(str(item.n))
+
+    view = QueueView(page_size=page_size, make_row=make_row)
+    items = [Item(i) for i in range(count)]
+    view.extend(items)
+    return view, items, made
+
+
+def _shown(view):
+    return [int(row.value) for row in view.rows.controls]
+
+
+def test_only_the_visible_page_gets_rows():
+    view, items, made = _view(35)
+    assert _shown(view) == list(range(10)) and len(made) == 10
+    assert view.pager.visible and view.page_text.value == "1–10 / 35"
+    assert view.prev_button.disabled and not view.next_button.disabled
+
+    view._next_page(None)
+    view._next_page(None)
+    view._next_page(None)
+    assert _shown(view) == list(range(30, 35)) and view.page_text.value == "31–35 / 35"
+    assert view.next_button.disabled
+    view._next_page(None)  # Son sayfada kalır
+    assert view.window_start == 30
+
+
+def test_changes_behind_the_window_only_touch_the_counter():
+    view, items, made = _view(25)
+    rows = view.rows.controls
+    view.append(Item(99))
+    view.remove(items[20])
+    assert view.rows.controls is rows and len(made) == 10
+    assert view.page_text.value == "1–10 / 25"
+
+
+def test_removal_inside_the_window_reuses_rows():
+    view, items, made = _view(25)
+    view.remove(items[3])
+    assert _shown(view) == [0, 1, 2, 4, 5, 6, 7, 8, 9, 10]
+    assert made[10:] == [items[10]]  # Sadece pencereye yeni giren satır oluşturulur
+
+
+def test_emptying_the_last_page_steps_back():
+    view, items, _ = _view(11)
+    view._next_page(None)
+    view.remove(items[10])
+    assert view.window_start == 0 and _shown(view) == list(range(10))
+    assert not view.pager.visible
+
+
+def test_move_to_front_and_show():
+    view, items, _ = _view(30)
+    view.show(items[25])
+    assert view.window_start == 20
+
+    view.move_to_front(items[25])
+    assert view.window_start == 0 and _shown(view)[:2] == [25, 0]
+    assert view.index(items[25]) == 0 and view.index(items[0]) == 1 and view.index(items[29]) == 29
+
+
+def test_index_tracks_a_plain_list_through_random_edits():
+    rng = random.Random(7)
+    view, items, _ = _view(200)
+    expected = list(items)
+    counter = len(items)
+    for _ in range(500):
+        op = rng.random()
+        if op < 0.5 and expected:
+            item = rng.choice(expected)
+            expected.remove(item)
+            view.remove(item)
+        elif op < 0.9:
+            item = Item(counter)
+            counter += 1
+            expected.append(item)
+            view.append(item)
+        elif expected:
+            item = rng.choice(expected)
+            expected.remove(item)
+            expected.insert(0, item)
+            view.move_to_front(item)
+    assert view.items == expected
+    assert all(view.index(item) == i for i, item in enumerate(expected))
+
+    with pytest.raises(ValueError):
+        view.index(Item(-1))
@@ -0,0 +1,51 @@
+from models.resume import ResumeState
+
+
+def _state(tmp_path, streams):
+    return ResumeState("720", str(tmp_path), "137+140", {str(tmp_path / name): size for name, size in streams.items()})
+
+
+def test_verify_accepts_matching_settings_and_partial_files(tmp_path):
+    state = _state(tmp_path, {"v.f137.mp4": 1000, "v.f140.m4a": 0})
+    (tmp_path / "v.f137.mp4.part").write_bytes(b"x" * 400)
+    (tmp_path / "v.f140.m4a.part").write_bytes(b"x" * 5000)  # Boyutu bilinmiyor: kontrol edilmez
+    assert state.verify("720", str(tmp_path))
+    assert state.verify("720", str(tmp_path / "." / ""))  # Aynı klasörün farklı yazımı
+    assert state.partial_bytes() == 5400
+
+
+def test_verify_rejects_changed_settings(tmp_path):
+    state = _state(tmp_path, {"v.mp4": 1000})
+    assert not state.verify("1080", str(tmp_path))
+    assert not state.verify("720", str(tmp_path / "other"))
+    assert not ResumeState("720", str(tmp_path)).verify("720", str(tmp_path))  # Format bilinmiyor
+
+
+def test_verify_rejects_part_larger_than_expected(tmp_path):
+    state = _state(tmp_path, {"v.mp4": 1000})
+    (tmp_path / "v.mp4.part").write_bytes(b"x" * 1001)
+    assert not state.verify("720", str(tmp_path))
+
+
+def test_verify_ignores_missing_partial_files(tmp_path):
+    assert _state(tmp_path, {"v.mp4": 1000}).verify("720", str(tmp_path))
+
+
+def test_observe_learns_format_and_streams_once(tmp_path):
+    state = ResumeState("720", str(tmp_path))
+    hook = {'info_dict': {'requested_formats': [{'format_id': '137'}, {'format_id': '140'}]},
+            'filename': "v.f137.mp4", 'total_bytes': 1000}
+    assert state.observe(hook)
+    assert not state.observe(hook)
+    assert state.format_id == "137+140" and state.streams == {"v.f137.mp4": 1000}
+
+
+def test_round_trip_and_discard(tmp_path):
+    state = _state(tmp_path, {"v.mp4": 1000})
+    for suffix in (".part", ".ytdl"):
+        (tmp_path / f"v.mp4{suffix}").write_bytes(b"x")
+    assert ResumeState.from_dict(state.to_dict()) == state
+    assert ResumeState.from_dict({'resolution': "720"}) is None
+
+    state.discard()
+    assert list(state.partial_files()) == []
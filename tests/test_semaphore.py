@@ -0,0 +1,191 @@
+import asyncio
+
+from models.downloader import DynamicSemaphore
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def _drain(n=5):
+    # Uyandırılan waiter'ların devam etmesi için loop'a birkaç tur ver
+    for _ in range(n):
+        await asyncio.sleep(0)
+
+
+def test_acquire_without_contention_is_immediate():
+    async def main():
+        sem = DynamicSemaphore(2)
+        await sem.acquire()
+        await sem.acquire()
+        assert await sem.get_value() == 0
+        sem.release()
+        assert await sem.get_value() == 1
+    run(main())
+
+
+def test_waiters_are_admitted_by_key_then_arrival():
+    async def main():
+        sem = DynamicSemaphore(0)
+        order = []
+
+        async def waiter(name, key):
+            await sem.acquire(key)
+            order.append(name)
+
+        tasks = [asyncio.create_task(waiter(name, key)) for name, key in
+                 [("low", (2,)), ("normal-1", (1,)), ("high", (0,)), ("normal-2", (1,))]]
+        await _drain()
+        assert sem.get_waiting_count() == 4
+
+        for expected in range(1, 5):
+            sem.release()
+            await _drain()
+            assert len(order) == expected
+        assert order == ["high", "normal-1", "normal-2", "low"]
+        await asyncio.gather(*tasks)
+    run(main())
+
+
+def test_reprioritize_moves_waiter_ahead():
+    async def main():
+        sem = DynamicSemaphore(0)
+        order = []
+
+        async def waiter(name, key):
+            await sem.acquire(key, ticket=name)
+            order.append(name)
+
+        tasks = [asyncio.create_task(waiter(n, (1,))) for n in ("a", "b", "c")]
+        await _drain()
+        assert sem.reprioritize("c", (0,))
+        assert sem.is_waiting("c")
+        sem.release(3)
+        await _drain()
+        assert order == ["c", "a", "b"]
+        assert not sem.reprioritize("c", (0,))
+        await asyncio.gather(*tasks)
+    run(main())
+
+
+def test_cancelled_waiter_does_not_leak_slot():
+    async def main():
+        sem = DynamicSemaphore(0)
+        cancelled = asyncio.create_task(sem.acquire((0,)))
+        other = asyncio.create_task(sem.acquire((1,)))
+        await _drain()
+
+        cancelled.cancel()
+        await _drain()
+        assert sem.get_waiting_count() == 1
+
+        sem.release()
+        await _drain()
+        assert other.done()
+        assert await sem.get_value() == 0
+    run(main())
+
+
+def test_slot_granted_to_cancelled_waiter_is_handed_to_next():
+    async def main():
+        sem = DynamicSemaphore(0)
+        first = asyncio.create_task(sem.acquire((0,)))
+        second = asyncio.create_task(sem.acquire((1,)))
+        await _drain()
+
+        # Slot first'e verildi ama task devam etmeden iptal edildi
+        sem.release()
+        first.cancel()
+        await _drain()
+
+        assert first.cancelled()
+        assert second.done()
+        assert sem.get_waiting_count() == 0
+        assert await sem.get_value() == 0
+    run(main())
+
+
+def test_try_acquire_never_jumps_waiters():
+    async def main():
+        sem = DynamicSemaphore(3)
+        assert sem.try_acquire(2) == 2
+        assert sem.try_acquire(5) == 1
+        waiter = asyncio.create_task(sem.acquire())
+        await _drain()
+        sem.release(2)
+        # Bir slot waiter'a gitti; kalan slot var ama bekleyen yok
+        await _drain()
+        assert waiter.done()
+        assert sem.try_acquire(5) == 1
+
+        # Slot yokken sıraya giren varsa, sonradan açılan slot önce ona gider
+        blocked = asyncio.create_task(sem.acquire())
+        await _drain()
+        sem.release()
+        assert sem.try_acquire(1) == 0
+        await _drain()
+        assert blocked.done()
+    run(main())
+
+
+def test_many_waiters_release_in_order():
+    async def main():
+        sem = DynamicSemaphore(0)
+        order = []
+
+        async def waiter(i):
+            await sem.acquire((i % 7, i))
+            order.append(i)
+            sem.release()
+
+        tasks = [asyncio.create_task(waiter(i)) for i in range(2000)]
+        await _drain()
+        sem.release()
+        await asyncio.gather(*tasks)
+        assert order == sorted(range(2000), key=lambda i: (i % 7, i))
+        assert await sem.get_value() == 1
+        assert sem.get_waiting_count() == 0
+    run(main())
+
+
+def test_lowering_limit_below_holders_absorbs_releases():
+    async def main():
+        sem = DynamicSemaphore(5)
+        for _ in range(5):
+            await sem.acquire()
+        admitted = []
+        waiters = [asyncio.create_task(sem.acquire()) for _ in range(3)]
+        for w in waiters:
+            w.add_done_callback(admitted.append)
+        await _drain()
+
+        await sem.set_limit(2)
+        # 5 dolu, limit 2: ilk üç release borcu öder, kimse içeri girmez
+        for _ in range(3):
+            sem.release()
+            await _drain()
+            assert admitted == []
+            assert sem.get_held_count() <= 4
+        assert sem.get_held_count() == 2
+
+        sem.release()
+        await _drain()
+        assert len(admitted) == 1
+        assert sem.get_held_count() == 2
+        for w in waiters[1:]:
+            w.cancel()
+    run(main())
+
+
+def test_raising_limit_after_decrease_cancels_debt():
+    async def main():
+        sem = DynamicSemaphore(4)
+        for _ in range(4):
+            await sem.acquire()
+        await sem.set_limit(1)
+        await sem.set_limit(6)
+        assert await sem.get_value() == 2
+        sem.release(4)
+        assert await sem.get_value() == 6
+        assert sem.get_held_count() == 0
+    run(main())
@@ -0,0 +1,60 @@
+import asyncio
+import os
+import time
+
+from models.staging import StagingJanitor, remove_staging, staging_dir
+
+
+def _make(save_path, video_id, size=100, age=0.0):
+    """save_path altında video_id'ye ait, age saniye önce değişmiş bir staging klasörü"""
+    path = staging_dir(str(save_path), video_id)
+    os.makedirs(path)
+    part = os.path.join(path, "video.f137.mp4.part")
+    with open(part, "wb") as f:
+        f.write(b"x" * size)
+    stamp = time.time() - age
+    for p in (part, path):
+        os.utime(p, (stamp, stamp))
+    return path
+
+
+def _sweep(tmp_path, owned=(), **kwargs):
+    janitor = StagingJanitor(lambda: [str(tmp_path), None], lambda: set(owned), **kwargs)
+    return asyncio.run(janitor.sweep())
+
+
+def test_old_orphans_are_removed_owned_and_fresh_are_kept(tmp_path):
+    old_orphan = _make(tmp_path, "gone", age=3600)
+    owned = _make(tmp_path, "queued", age=3600)
+    fresh = _make(tmp_path, "just_crashed", age=10)
+    stray_file = tmp_path / ".staging" / "note.txt"
+    stray_file.write_text("x")
+
+    assert _sweep(tmp_path, owned={"queued"}, max_age=600) == 1
+    assert not os.path.exists(old_orphan)
+    assert os.path.exists(owned) and os.path.exists(fresh) and stray_file.exists()
+
+
+def test_orphans_over_budget_are_removed_oldest_first(tmp_path):
+    oldest = _make(tmp_path, "a", size=400, age=30)
+    middle = _make(tmp_path, "b", size=400, age=20)
+    newest = _make(tmp_path, "c", size=400, age=10)
+    owned = _make(tmp_path, "d", size=5000, age=40)  # Kuyruktakiler bütçeye sayılmaz
+
+    assert _sweep(tmp_path, owned={"d"}, max_age=3600, max_bytes=900) == 1
+    assert not os.path.exists(oldest)
+    assert all(os.path.exists(p) for p in (middle, newest, owned))
+
+
+def test_sweep_without_staging_folder_is_a_no_op(tmp_path):
+    assert _sweep(tmp_path, max_age=0) == 0
+
+
+def test_remove_staging_only_touches_its_own_folder(tmp_path):
+    mine = _make(tmp_path, "mine")
+    other = _make(tmp_path, "other")
+    remove_staging(str(tmp_path), "mine")
+    assert not os.path.exists(mine) and os.path.exists(other)
+
+    remove_staging(str(tmp_path), "other")
+    assert not (tmp_path / ".staging").exists()  # Boş kalan .staging da kaldırılır
@@ -0,0 +1,78 @@
+import asyncio
+import base64
+import os
+
+from models.thumbnails import ThumbnailCache
+
+
+def _publish(root, video_id, size=1000):
+    """Sunucuda ytimg düzeninde (vi/<id>/default.jpg) bir 'row' thumbnail'ı yayınla"""
+    folder = root / "vi" / video_id
+    folder.mkdir(parents=True)
+    data = os.urandom(size)  # İçerik önemsiz: olduğu gibi saklanır
+    (folder / "default.jpg").write_bytes(data)
+    return data
+
+
+def test_memory_then_disk_hits(file_server, tmp_path):
+    root, base_url = file_server
+    data = _publish(root, "aaaaaaaaaa1")
+
+    async def main():
+        cache = ThumbnailCache(str(tmp_path / "thumbs"), base_url=base_url)
+        first = await cache.get("aaaaaaaaaa1")
+        again = await cache.get("aaaaaaaaaa1")
+        assert base64.b64decode(first) == data and again == first
+        assert (cache.fetches, cache.memory_hits, cache.disk_hits) == (1, 1, 0)
+
+        # Yeni süreç gibi: bellek boş, disk dolu
+        fresh = ThumbnailCache(str(tmp_path / "thumbs"), base_url=base_url)
+        assert await fresh.get("aaaaaaaaaa1") == first
+        assert (fresh.fetches, fresh.disk_hits) == (0, 1)
+    asyncio.run(main())
+
+
+def test_concurrent_requests_share_one_fetch(file_server, tmp_path):
+    root, base_url = file_server
+    _publish(root, "aaaaaaaaaa1")
+
+    async def main():
+        cache = ThumbnailCache(str(tmp_path / "thumbs"), base_url=base_url)
+        results = await asyncio.gather(*(cache.get("aaaaaaaaaa1") for _ in range(5)))
+        assert len(set(results)) == 1 and results[0] is not None
+        assert cache.fetches == 1
+    asyncio.run(main())
+
+
+def test_disk_is_evicted_oldest_first(file_server, tmp_path):
+    root, base_url = file_server
+    ids = [f"aaaaaaaaaa{i}" for i in range(4)]
+    for video_id in ids:
+        _publish(root, video_id, size=1000)
+
+    async def main():
+        cache = ThumbnailCache(str(tmp_path / "thumbs"), max_bytes=2500, base_url=base_url)
+        for video_id in ids[:3]:
+            await cache.get(video_id)
+        await cache.get(ids[1])         # Bellekten: disk sırası değişmez
+        assert sorted(os.listdir(tmp_path / "thumbs")) == [f"{i}_row.jpg" for i in ids[1:3]]
+
+        fresh = ThumbnailCache(str(tmp_path / "thumbs"), max_bytes=2500, base_url=base_url)
+        await fresh.get(ids[1])          # Disk okuması erişim sırasını günceller
+        await fresh.get(ids[3])
+        assert sorted(os.listdir(tmp_path / "thumbs")) == [f"{i}_row.jpg" for i in (ids[1], ids[3])]
+        stats = fresh.get_stats()
+        assert stats['disk_entries'] == 2 and stats['disk_bytes'] == 2000
+    asyncio.run(main())
+
+
+def test_oversized_or_missing_source_gives_none(file_server, tmp_path):
+    root, base_url = file_server
+    _publish(root, "aaaaaaaaaa1", size=5000)
+
+    async def main():
+        cache = ThumbnailCache(str(tmp_path / "thumbs"), max_source_bytes=4000, base_url=base_url)
+        assert await cache.get("aaaaaaaaaa1") is None
+        assert await cache.get("bbbbbbbbbb1") is None  # Sunucuda yok (404)
+        assert cache.get_stats()['disk_entries'] == 0
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from models.ydl_pool import YoutubeDLPool
+
+OPTS = {'quiet': True, 'format': 'best', 'outtmpl': '%(title)s.%(ext)s'}
+
+
+@pytest.fixture
+def pool():
+    pool = YoutubeDLPool(max_per_thread=2)
+    yield pool
+    pool.close_all()
+
+
+def test_fingerprint_ignores_hooks_and_per_call_keys():
+    base = YoutubeDLPool.fingerprint(OPTS)
+    with_hooks = dict(OPTS, progress_hooks=[print], postprocessor_hooks=[print], paths={'temp': '/tmp/x'},
+                      format='137+140/best')
+    assert YoutubeDLPool.fingerprint(with_hooks) == base
+    # Anahtar sırası önemli değil
+    assert YoutubeDLPool.fingerprint(dict(reversed(list(OPTS.items())))) == base
+    assert YoutubeDLPool.fingerprint(dict(OPTS, outtmpl='%(id)s.%(ext)s')) != base
+
+
+def test_same_options_reuse_instance_on_same_thread(pool):
+    with pool.acquire(OPTS) as first:
+        pass
+    with pool.acquire(dict(OPTS, paths={'temp': '/tmp/a'})) as second:
+        assert second.params['paths'] == {'temp': '/tmp/a'}
+    with pool.acquire(OPTS) as third:
+        assert 'paths' not in third.params
+    assert first is second is third
+
+
+def test_pinned_formats_share_one_instance(pool):
+    formats = {'137+140/best': None, '22/best': None}
+    for spec in formats:
+        with pool.acquire(dict(OPTS, format=spec)) as ydl:
+            assert ydl.params['format'] == spec
+            formats[spec] = (ydl, ydl.format_selector)
+    (first, first_selector), (second, second_selector) = formats.values()
+    assert first is second
+    # Seçici format'tan yeniden derlendi: eskisi kullanılmıyor
+    assert second_selector is not first_selector
+    formats_list = [{'format_id': '22', 'ext': 'mp4', 'url': 'u', 'vcodec': 'avc1', 'acodec': 'mp4a'}]
+    assert [f['format_id'] for f in second_selector({'formats': formats_list, 'incomplete_formats': False})] == ['22']
+
+
+def test_hooks_are_swapped_per_acquire(pool):
+    hook_a, hook_b = (lambda d: None), (lambda d: None)
+    with pool.acquire(OPTS, progress_hooks=[hook_a]) as ydl:
+        assert ydl._progress_hooks == [hook_a]
+    assert ydl._progress_hooks == []
+    with pool.acquire(OPTS, progress_hooks=[hook_b], postprocessor_hooks=[hook_a]) as again:
+        assert again is ydl
+        assert again._progress_hooks == [hook_b]
+        assert again._postprocessor_hooks == [hook_a]
+
+
+def test_threads_get_their_own_instances(pool):
+    with pool.acquire(OPTS) as main_ydl:
+        pass
+    seen = []
+
+    def worker():
+        with pool.acquire(OPTS) as ydl:
+            seen.append(ydl)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert seen and seen[0] is not main_ydl
+
+
+def test_failed_use_is_not_returned_to_pool(pool):
+    with pytest.raises(RuntimeError):
+        with pool.acquire(OPTS) as broken:
+            raise RuntimeError("boom")
+    with pool.acquire(OPTS) as fresh:
+        assert fresh is not broken
+
+
+def test_per_thread_limit_evicts_least_recently_used(pool):
+    variants = [dict(OPTS, outtmpl=f"{f}.%(ext)s") for f in ('a', 'b', 'c')]
+    instances = []
+    for opts in variants:
+        with pool.acquire(opts) as ydl:
+            instances.append(ydl)
+    # max_per_thread=2: en eski ('a') kapatılıp atıldı
+    with pool.acquire(variants[0]) as ydl:
+        assert ydl is not instances[0]
+    with pool.acquire(variants[2]) as ydl:
+        assert ydl is instances[2]